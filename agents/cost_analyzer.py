@@ -11,6 +11,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from tools.k8s_client import k8s_client
 from agents.incident_tracker import incident_tracker
+from agents.incident_store import action_type, record_time
 from mcp_server.config import K8S_NAMESPACE
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,9 @@ class CostAnalyzer:
     COST_PER_CPU_HOUR = 0.0416  # ~$30/month per vCPU
     COST_PER_GB_HOUR = 0.0052   # ~$4/month per GB RAM
     
+    # Only these actions change the pod count; history queries filter on them
+    SCALING_ACTIONS = ["scale_up", "scale_down"]
+    
     def __init__(self, namespace: str = K8S_NAMESPACE):
         self.namespace = namespace
         self.baseline_cost = None
@@ -82,22 +86,21 @@ class CostAnalyzer:
         Calculate savings from auto-scaling actions over specified time period
         """
         try:
-            incidents = incident_tracker.get_timeline(hours=hours)
+            incidents = incident_tracker.get_actions(hours, self.SCALING_ACTIONS)
             
             total_saved = 0.0
             scale_downs = []
             scale_ups = []
             
             for incident in incidents:
-                action_type = incident.get('action', {}).get('type', '')
+                kind = action_type(incident)
                 
-                if action_type == 'scale_down':
+                if kind == 'scale_down':
                     # Calculate savings from scaling down
-                    params = incident.get('action', {}).get('parameters', {})
-                    pods_removed = abs(params.get('delta', 0))
+                    pods_removed = self._delta(incident)
                     
                     # Estimate duration until next scaling action
-                    duration_hours = self._estimate_duration(incident, incidents)
+                    duration_hours = self._estimate_duration(incident)
                     
                     # Assume average pod cost (0.5 CPU, 0.25 GB RAM)
                     pod_cost_per_hour = (0.5 * self.COST_PER_CPU_HOUR) + (0.25 * self.COST_PER_GB_HOUR)
@@ -111,11 +114,10 @@ class CostAnalyzer:
                         'saved': round(saved, 2)
                     })
                 
-                elif action_type == 'scale_up':
-                    params = incident.get('action', {}).get('parameters', {})
+                elif kind == 'scale_up':
                     scale_ups.append({
                         'timestamp': incident.get('timestamp'),
-                        'pods_added': params.get('delta', 0)
+                        'pods_added': self._delta(incident)
                     })
             
             # Calculate average utilization efficiency
@@ -155,12 +157,12 @@ class CostAnalyzer:
             pods = k8s_client.get_pods(self.namespace)
             deployments = k8s_client.get_deployments(self.namespace)
             
-            # Get recent incidents to understand patterns
-            incidents = incident_tracker.get_timeline(hours=24)
+            # Get recent scaling activity to understand patterns
+            counts = incident_tracker.count_actions(24, self.SCALING_ACTIONS)
             
             # Check for over-provisioning
-            scale_down_frequency = len([i for i in incidents if i.get('action', {}).get('type') == 'scale_down'])
-            scale_up_frequency = len([i for i in incidents if i.get('action', {}).get('type') == 'scale_up'])
+            scale_down_frequency = counts.get('scale_down', 0)
+            scale_up_frequency = counts.get('scale_up', 0)
             
             if scale_down_frequency > scale_up_frequency * 2:
                 recommendations.append({
@@ -187,7 +189,7 @@ class CostAnalyzer:
                     })
             
             # Check incident patterns for optimization
-            if len(incidents) == 0:
+            if not scale_down_frequency and not scale_up_frequency:
                 recommendations.append({
                     'type': 'no_activity',
                     'severity': 'info',
@@ -234,7 +236,7 @@ class CostAnalyzer:
             recommendations = self.get_optimization_recommendations()
             
             # Calculate baseline (what it would cost without auto-scaling)
-            incidents = incident_tracker.get_timeline(hours=hours)
+            incidents = incident_tracker.get_actions(hours, self.SCALING_ACTIONS)
             avg_pods = self._calculate_average_pods(incidents, hours)
             
             baseline_hourly = avg_pods * 0.5 * self.COST_PER_CPU_HOUR
@@ -293,25 +295,27 @@ class CostAnalyzer:
         # Assume bytes
         return float(mem_str) / (1024 ** 3)
     
-    def _estimate_duration(self, incident: Dict, all_incidents: List[Dict]) -> float:
+    @staticmethod
+    def _delta(incident: Dict) -> int:
+        """Pods added or removed by a scaling action"""
+        action = incident.get('action') or {}
+        params = action.get('details') or action.get('parameters') or {}
+        return abs(params.get('delta') or 0)
+    
+    def _estimate_duration(self, incident: Dict) -> float:
         """Estimate how long a scaling action's effect lasted"""
         try:
-            incident_time = datetime.fromisoformat(incident['timestamp'])
+            incident_time = record_time(incident)
             
-            # Find next incident after this one
-            future_incidents = [
-                i for i in all_incidents 
-                if datetime.fromisoformat(i['timestamp']) > incident_time
-            ]
+            # Find next incident after this one (an index seek, not a scan)
+            next_time = incident_tracker.next_incident_time(incident_time)
             
-            if future_incidents:
-                next_incident = min(future_incidents, key=lambda x: x['timestamp'])
-                next_time = datetime.fromisoformat(next_incident['timestamp'])
-                duration = (next_time - incident_time).total_seconds() / 3600
+            if next_time is not None:
+                duration = (next_time - incident_time) / 3600
                 return min(duration, 24)  # Cap at 24 hours
             else:
                 # Assume effect lasted until now
-                duration = (datetime.now() - incident_time).total_seconds() / 3600
+                duration = (datetime.now().timestamp() - incident_time) / 3600
                 return min(duration, 24)
         except Exception:
             return 1.0  # Default 1 hour
@@ -319,18 +323,16 @@ class CostAnalyzer:
     def _calculate_efficiency_score(self, hours: int) -> float:
         """Calculate overall efficiency score (0-100)"""
         try:
-            incidents = incident_tracker.get_timeline(hours=hours)
+            outcomes = incident_tracker.count_outcomes(hours)
+            total = outcomes['total']
             
-            if not incidents:
+            if not total:
                 return 75.0  # Neutral score if no activity
             
-            successful = len([i for i in incidents if i.get('result', {}).get('success', False)])
-            total = len(incidents)
-            
-            success_rate = (successful / total * 100) if total > 0 else 0
+            success_rate = outcomes['successful'] / total * 100
             
             # Factor in activity level (more activity = more optimization)
-            activity_bonus = min(len(incidents) * 2, 15)
+            activity_bonus = min(total * 2, 15)
             
             score = min(success_rate + activity_bonus, 100)
             return round(score, 1)
@@ -349,9 +351,9 @@ class CostAnalyzer:
             total_pod_hours = current_pods * hours
             
             for incident in incidents:
-                if incident.get('action', {}).get('type') in ['scale_up', 'scale_down']:
-                    delta = incident.get('action', {}).get('parameters', {}).get('delta', 0)
-                    duration = self._estimate_duration(incident, incidents)
+                if action_type(incident) in self.SCALING_ACTIONS:
+                    delta = self._delta(incident)
+                    duration = self._estimate_duration(incident)
                     total_pod_hours += delta * duration
             
             return max(total_pod_hours / hours, 1.0)
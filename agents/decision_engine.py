@@ -6,20 +6,40 @@ import sys
 import time
 import signal
 import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from agents.monitor_agent import monitor_agent
-from agents.scaler_agent import scaler_agent
-from agents.healer_agent import healer_agent
+from agents.monitor_agent import MonitorAgent, monitor_agent
+from agents.scaler_agent import ScalerAgent, scaler_agent
+from agents.healer_agent import HealerAgent, healer_agent
 from agents.incident_tracker import incident_tracker
-from mcp_server.config import DECISION_LOOP_INTERVAL, K8S_NAMESPACE
+from agents.remediation_queue import RemediationQueue, SEVERITY_PRIORITY
+from agents.rollout_tracker import rollout_tracker
+from agents.event_watcher import EventWatcher
+from agents.replay import TraceRecorder
+from tools.k8s_client import K8sClient
+from tools.telemetry import (
+    metrics_registry, cycle_phase_seconds, cycle_seconds, cycles_total, action_seconds, percentile
+)
+from mcp_server.config import (
+    DECISION_LOOP_INTERVAL, K8S_NAMESPACE, K8S_NAMESPACES, K8S_NAMESPACE_SELECTOR,
+    SHARDING_ENABLED, DECISION_TRACE_FILE, SCALING_MODE, EVENT_WATCH_ENABLED, ENGINE_METRICS_PORT
+)
 
 logger = logging.getLogger(__name__)
 
+# Issues answered by a target-based scale_to in proportional scaling mode
+PROPORTIONAL_ISSUES = ("cpu_overload", "cpu_underutilized", "memory_pressure")
+
+# Pod issues healed per owning deployment (issue type -> pod state)
+POD_ISSUES = {"pod_crashloop": "crashloop", "pod_pending": "pending", "pod_failed": "failed"}
+
 
 class DecisionEngine:
     """
@@ -31,18 +51,47 @@ class DecisionEngine:
     5. Tracks outcomes
     """
     
-    def __init__(self, namespace: str = K8S_NAMESPACE, interval: int = DECISION_LOOP_INTERVAL):
+    def __init__(
+        self,
+        namespace: str = K8S_NAMESPACE,
+        interval: int = DECISION_LOOP_INTERVAL,
+        k8s: Optional[K8sClient] = None,
+        recorder: Optional[TraceRecorder] = None
+    ):
         self.namespace = namespace
         self.interval = interval
         self.running = False
         self.cycle_count = 0
         
-        # Agents
-        self.monitor = monitor_agent
-        self.scaler = scaler_agent
-        self.healer = healer_agent
+        # Cycle telemetry (outcome counters + recent durations for percentiles)
+        self.cycle_outcomes = {"healthy": 0, "no_action": 0, "acted": 0, "error": 0}
+        self.cycle_durations_ms = deque(maxlen=500)
+        self.last_cycle = {}
+        
+        # Agents (the module singletons are bound to K8S_NAMESPACE and the real
+        # cluster, so any other namespace or client gets its own instances)
+        if namespace == K8S_NAMESPACE and k8s is None:
+            self.monitor = monitor_agent
+            self.scaler = scaler_agent
+            self.healer = healer_agent
+        else:
+            self.monitor = MonitorAgent(namespace, k8s)
+            self.scaler = ScalerAgent(namespace, k8s)
+            self.healer = HealerAgent(namespace, k8s)
         self.tracker = incident_tracker
         
+        # Planned actions run highest severity first, within per-severity deadlines
+        self.queue = RemediationQueue()
+        
+        # Optional cycle trace for offline replay
+        if recorder is None and DECISION_TRACE_FILE:
+            recorder = TraceRecorder.shared(DECISION_TRACE_FILE)
+        self.recorder = recorder
+        
+        # Events watch (started by the loop that runs this engine) can cut the sleep short
+        self.events: Optional[EventWatcher] = None
+        self._wake = threading.Event()
+        
         logger.info(f"Decision Engine initialized (interval: {interval}s, namespace: {namespace})")
     
     def start(self):
@@ -62,6 +111,9 @@ class DecisionEngine:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
+        if EVENT_WATCH_ENABLED:
+            self.watch_events()
+        
         try:
             while self.running:
                 self.cycle_count += 1
@@ -73,11 +125,14 @@ class DecisionEngine:
                 
                 if self.running:
                     logger.info(f"\n[SLEEP] Sleeping for {self.interval} seconds...")
-                    time.sleep(self.interval)
+                    if self._wake.wait(self.interval) and self.running:
+                        logger.info("[EVENT] Woken early by a cluster event")
+                    self._wake.clear()
                     
         except Exception as e:
             logger.error(f"Fatal error in decision loop: {e}", exc_info=True)
         finally:
+            self.stop_events()
             logger.info("\n" + "=" * 70)
             logger.info("SENTINELOPS DECISION ENGINE STOPPED")
             logger.info("=" * 70)
@@ -86,27 +141,54 @@ class DecisionEngine:
         """Handle shutdown signals"""
         logger.info("\n\nShutdown signal received...")
         self.running = False
+        self._wake.set()
+    
+    def watch_events(self, on_event: Optional[Callable[[], None]] = None):
+        """
+        Start streaming this namespace's Events into the monitor; urgent events
+        call on_event (default: end the current sleep and run a cycle now)
+        """
+        if self.events is None:
+            self.events = EventWatcher(self.namespace)
+            self.events.subscribe(on_event or self._wake.set)
+            self.monitor.events = self.events
+        self.events.start()
+    
+    def stop_events(self):
+        """Stop the Events watch, if running"""
+        if self.events is not None:
+            self.events.stop()
     
     def run_cycle(self):
         """
         Execute one complete decision cycle
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        phases = {}
+        outcome = "error"
+        
+        # Anything still queued from the previous cycle is replaced by this cycle's plan
+        self.queue.supersede(self.cycle_count)
         
         try:
             # STEP 1: Monitor
             logger.info("\n[STEP 1] Collecting metrics...")
-            metrics = self.monitor.collect_metrics()
+            with self._phase("collect", phases):
+                metrics = self.monitor.collect_metrics()
+            self.healer.prune_backoff(self.monitor.last_pods)
             logger.info(f"   CPU: {metrics.get('cpu_usage', 0):.1f}% | "
                        f"Memory: {metrics.get('memory_usage', 0):.1f}% | "
                        f"Pods: {metrics.get('pod_count', 0)}")
             
             # STEP 2: Analyze
             logger.info("\n[STEP 2] Analyzing for issues...")
-            issues = self.monitor.analyze_metrics(metrics)
+            with self._phase("analyze", phases):
+                issues = self.monitor.analyze_metrics(metrics)
             
             if not issues:
                 logger.info("   [OK] No issues detected - system healthy")
+                self._record_trace(metrics, [])
+                outcome = "healthy"
                 return
             
             logger.info(f"   [WARN] Found {len(issues)} issue(s):")
@@ -115,13 +197,17 @@ class DecisionEngine:
             
             # STEP 3: Decide
             logger.info("\n[STEP 3] Deciding on actions...")
-            actions = self.decide_actions(issues, metrics)
+            with self._phase("decide", phases):
+                actions = self.decide_actions(issues, metrics)
+            self._record_trace(metrics, actions)
             
             if not actions:
                 logger.info("   [INFO] No actions needed")
                 # Still log incidents even if no action taken
-                for issue in issues:
-                    self.tracker.log_incident(issue)
+                with self._phase("log", phases):
+                    for issue in issues:
+                        self.tracker.log_incident(issue)
+                outcome = "no_action"
                 return
             
             logger.info(f"   [PLAN] Planned {len(actions)} action(s):")
@@ -130,25 +216,82 @@ class DecisionEngine:
             
             # STEP 4: Act
             logger.info("\n[STEP 4] Executing actions...")
-            results = self.execute_actions(actions, issues)
+            with self._phase("execute", phases):
+                results = self.execute_actions(actions, issues)
             
-            # STEP 5: Log
+            # STEP 5: Log (each action carries the issue it was planned for)
             logger.info("\n[STEP 5] Logging incidents...")
-            for i, issue in enumerate(issues):
-                if i < len(results):
-                    action = actions[i]
-                    result = results[i]
-                    self.tracker.log_incident(issue, action, result)
+            with self._phase("log", phases):
+                handled = set()
+                for action, result in zip(actions, results):
+                    issue = action.get("issue", {})
+                    covered = action.get("issues") or [issue]
+                    handled.update(id(i) for i in covered)
+                    incident = self.tracker.log_incident(issue, action, result)
+                    self._track_rollout(result, incident)
                     
                     status = "[SUCCESS]" if result.get("success") else "[FAILED]"
-                    logger.info(f"   {status}: {action['type']} for {issue['type']}")
-            
-            # STEP 6: Summary
-            duration_ms = (time.time() - start_time) * 1000
-            logger.info(f"\n[TIMING] Cycle completed in {duration_ms:.0f}ms")
+                    suffix = f" (+{len(covered) - 1} more)" if len(covered) > 1 else ""
+                    logger.info(f"   {status}: {action['type']} for {issue.get('type', 'unknown')}{suffix}")
+                for issue in issues:
+                    if id(issue) not in handled:
+                        self.tracker.log_incident(issue)
+            outcome = "acted"
             
         except Exception as e:
             logger.error(f"Error in decision cycle: {e}", exc_info=True)
+        finally:
+            # STEP 6: Summary (recorded for every outcome, including early returns)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._record_cycle(outcome, duration_ms, phases)
+            logger.info(f"\n[TIMING] Cycle completed in {duration_ms:.0f}ms ({outcome}) - " +
+                        ", ".join(f"{name}={ms:.0f}ms" for name, ms in phases.items()))
+    
+    def _track_rollout(self, result: Dict, incident: Dict):
+        """Follow a successful scale in the background until the new replicas are Ready"""
+        if not result.get("success") or result.get("action") not in ("scale_up", "scale_down"):
+            return
+        rollout_tracker.track(
+            self.namespace,
+            result["deployment"],
+            result["to"],
+            result["from"],
+            incident_id=incident.get("id"),
+            k8s=self.scaler.k8s
+        )
+    
+    def _record_trace(self, metrics: Dict, actions: List[Dict]):
+        """Append this cycle's inputs and decisions to the replay trace"""
+        if self.recorder is None:
+            return
+        try:
+            self.recorder.record(self.namespace, metrics, self.monitor.last_pods, actions)
+        except Exception as e:
+            logger.error(f"Error recording cycle trace: {e}")
+    
+    @contextmanager
+    def _phase(self, name: str, phases: Dict):
+        """Time one cycle phase into the phase histogram and the per-cycle breakdown"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            cycle_phase_seconds.observe(elapsed, namespace=self.namespace, phase=name)
+            phases[name] = phases.get(name, 0.0) + elapsed * 1000
+    
+    def _record_cycle(self, outcome: str, duration_ms: float, phases: Dict):
+        """Update cycle counters, the duration window, and exported metrics"""
+        self.cycle_outcomes[outcome] = self.cycle_outcomes.get(outcome, 0) + 1
+        self.cycle_durations_ms.append(duration_ms)
+        self.last_cycle = {
+            "outcome": outcome,
+            "duration_ms": round(duration_ms, 1),
+            "phases_ms": {name: round(ms, 1) for name, ms in phases.items()},
+            "finished_at": datetime.now().isoformat()
+        }
+        cycles_total.inc(namespace=self.namespace, outcome=outcome)
+        cycle_seconds.observe(duration_ms / 1000, namespace=self.namespace, outcome=outcome)
     
     def decide_actions(self, issues: List[Dict], metrics: Dict) -> List[Dict]:
         """
@@ -156,13 +299,55 @@ class DecisionEngine:
         """
         actions = []
         deployments = metrics.get("deployments", [])
+        sized = set()  # deployments already given an exact replica target this cycle
+        pod_groups: Dict[str, List[Dict]] = {}  # deployment -> its unhealthy pod issues
+        oom_groups: Dict[tuple, List[Dict]] = {}  # (deployment, container) -> OOMKilled pod issues
+        oom_pods = {i.get("resource") for i in issues if i["type"] == "pod_oom_killed"}
         
         for issue in issues:
+            planned = len(actions)
             issue_type = issue["type"]
             resource = issue.get("resource", "")
             
+            # An OOMKilled pod also crashloops (a BackOff event); restarting it
+            # would only hit the limit again, so it is left to right-sizing
+            if issue_type == "pod_crashloop" and resource in oom_pods:
+                continue
+            
+            # Pods owned by a deployment are healed together, one action per deployment
+            if issue_type in POD_ISSUES and issue.get("deployment"):
+                pod_groups.setdefault(issue["deployment"], []).append(issue)
+                continue
+            
+            # OOMKilled containers get a bigger memory limit instead of restarts
+            # (event-sourced OOM kills name the node, so they have no deployment)
+            if issue_type == "pod_oom_killed":
+                if issue.get("deployment") and issue.get("container"):
+                    oom_groups.setdefault((issue["deployment"], issue["container"]), []).append(issue)
+                continue
+            
+            # Proportional mode: one scale_to per deployment, sized from its utilization
+            if SCALING_MODE == "proportional" and issue_type in PROPORTIONAL_ISSUES:
+                action = self._plan_scale_to(issue, metrics, sized)
+                if action:
+                    actions.append(action)
+            
+            # Outside a scheduled floor/ceiling → Scale to it
+            elif issue_type in ("below_scheduled_floor", "above_scheduled_ceiling"):
+                deployment = resource
+                if deployment not in sized:
+                    sized.add(deployment)
+                    actions.append({
+                        "type": "scale_to",
+                        "deployment": deployment,
+                        "replicas": issue["threshold"],
+                        "from": issue.get("value"),
+                        "reason": issue["message"],
+                        "description": f"Scheduled scale of {deployment} to {issue['threshold']} replicas"
+                    })
+            
             # CPU Overload → Scale Up
-            if issue_type == "cpu_overload":
+            elif issue_type == "cpu_overload":
                 # Find the deployment to scale
                 deployment = deployments[0]["name"] if deployments else "nginx-demo"
                 
@@ -218,6 +403,7 @@ class DecisionEngine:
                 actions.append({
                     "type": "heal_pending",
                     "pod": pod_name,
+                    "pending_seconds": issue.get("value"),
                     "reason": issue["message"],
                     "description": f"Restart pending pod {pod_name}"
                 })
@@ -231,82 +417,256 @@ class DecisionEngine:
                     "reason": issue["message"],
                     "description": f"Restart failed pod {pod_name}"
                 })
+            
+            # Link the action back to its issue and give it a priority and deadline
+            for action in actions[planned:]:
+                action["issue"] = issue
+                self.queue.stamp(action, issue.get("severity", "low"), self._detected_at(issue))
+        
+        for deployment, group in pod_groups.items():
+            actions.append(self._plan_group_heal(deployment, group, deployments))
+        for (deployment, container), group in oom_groups.items():
+            actions.append(self._plan_right_size(deployment, container, group))
         
         return actions
     
+    def _plan_right_size(self, deployment: str, container: str, group: List[Dict]) -> Dict:
+        """One right_size_memory action per OOMKilled container of a deployment"""
+        pods = [issue["resource"] for issue in group]
+        action = {
+            "type": "right_size_memory",
+            "deployment": deployment,
+            "container": container,
+            "pods": pods,
+            "reason": f"{container} OOMKilled in {len(pods)} pod(s) of {deployment}",
+            "description": f"Raise memory limit of {deployment}/{container}",
+            "issue": group[0],
+            "issues": group
+        }
+        detected = [t for t in (self._detected_at(issue) for issue in group) if t is not None]
+        self.queue.stamp(action, group[0].get("severity", "high"), min(detected) if detected else None)
+        return action
+    
+    def _plan_group_heal(self, deployment: str, group: List[Dict], deployments: List[Dict]) -> Dict:
+        """
+        One heal_deployment action covering every unhealthy pod of deployment;
+        it takes the priority of the most severe pod issue
+        """
+        primary = min(group, key=lambda i: SEVERITY_PRIORITY.get(i.get("severity"), SEVERITY_PRIORITY["low"]))
+        replicas = next((d.get("replicas", 0) for d in deployments if d["name"] == deployment), len(group))
+        pods = [issue["resource"] for issue in group]
+        
+        action = {
+            "type": "heal_deployment",
+            "deployment": deployment,
+            "pods": pods,
+            "pod_states": [self._pod_state(issue) for issue in group],
+            "deployment_replicas": replicas,
+            "reason": primary["message"] if len(group) == 1 else f"{len(group)} unhealthy pods in {deployment}",
+            "description": f"Heal {len(group)} unhealthy pod(s) of {deployment}",
+            "issue": primary,
+            "issues": group
+        }
+        detected = [t for t in (self._detected_at(issue) for issue in group) if t is not None]
+        self.queue.stamp(action, primary.get("severity", "low"), min(detected) if detected else None)
+        return action
+    
+    @staticmethod
+    def _pod_state(issue: Dict) -> Dict:
+        """
+        Pod entry for plan_group. Only polled crashloops carry the pod's
+        restart count; an event-sourced one's value is the BackOff Event's
+        count, which must not trip the restart threshold
+        """
+        polled_crashloop = issue["type"] == "pod_crashloop" and issue.get("source") != "event"
+        return {
+            "name": issue["resource"],
+            "issue": POD_ISSUES[issue["type"]],
+            "restarts": issue.get("value", 0) if polled_crashloop else 0
+        }
+    
+    def _plan_scale_to(self, issue: Dict, metrics: Dict, sized: set) -> Optional[Dict]:
+        """
+        Target-based scaling: size the issue's deployment in one step
+        """
+        deployment = issue.get("resource", "")
+        if deployment in sized:
+            return None
+        
+        current = next(
+            (d.get("replicas", 0) for d in metrics.get("deployments", []) if d["name"] == deployment),
+            None
+        )
+        usage = metrics.get("deployment_utilization", {}).get(deployment)
+        if current is None or not usage:
+            return None
+        
+        desired = self.scaler.recommend_replicas(current, usage, deployment)
+        if desired == current:
+            return None
+        
+        sized.add(deployment)
+        return {
+            "type": "scale_to",
+            "deployment": deployment,
+            "replicas": desired,
+            "from": current,
+            "utilization": usage,
+            "reason": issue["message"],
+            "description": f"Scale {deployment} from {current} to {desired} replicas (target-based)"
+        }
+    
+    @staticmethod
+    def _detected_at(issue: Dict) -> Optional[float]:
+        """Epoch seconds of the issue's detection timestamp (None if missing)"""
+        try:
+            return datetime.fromisoformat(issue["timestamp"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+    
     def execute_actions(self, actions: List[Dict], issues: List[Dict]) -> List[Dict]:
         """
-        Execute all planned actions
+        Execute planned actions in priority order (severity, then age).
+        Actions past their deadline expire without running; actions still
+        queued when the next cycle is due are deferred and superseded by
+        that cycle's plan. Results are returned in the order of `actions`.
         """
-        results = []
+        for action in actions:
+            self.queue.push(action, self.cycle_count)
+        
+        results_by_action = {}
+        next_cycle_at = time.time() + self.interval
+        
+        while len(self.queue):
+            if time.time() >= next_cycle_at:
+                logger.warning(f"   [QUEUE] Next cycle due; deferring {len(self.queue)} action(s)")
+                break
+            action = self.queue.pop()
+            results_by_action[id(action)] = self._execute_action(action)
         
+        results = []
         for action in actions:
-            action_type = action["type"]
-            start_time = time.time()
+            result = results_by_action.get(id(action))
+            if result is None:
+                result = {"success": False, "reason": "deferred", "duration_ms": 0.0}
+            results.append(result)
+        return results
+    
+    def _execute_action(self, action: Dict) -> Dict:
+        """
+        Run one action unless it missed its deadline
+        """
+        action_type = action["type"]
+        start_time = time.time()
+        
+        if self.queue.is_expired(action, start_time):
+            late_s = start_time - action["deadline"]
+            logger.warning(f"   [QUEUE] {action_type} ({action.get('severity')}) expired {late_s:.1f}s past its deadline")
+            return {"success": False, "reason": "expired", "duration_ms": 0.0}
+        
+        try:
+            # Scaling actions
+            if action_type == "scale_up":
+                result = self.scaler.scale_up(
+                    action["deployment"],
+                    action.get("delta", 2),
+                    action.get("reason", "")
+                )
             
-            try:
-                # Scaling actions
-                if action_type == "scale_up":
-                    result = self.scaler.scale_up(
-                        action["deployment"],
-                        action.get("delta", 2),
-                        action.get("reason", "")
-                    )
-                
-                elif action_type == "scale_down":
-                    result = self.scaler.scale_down(
-                        action["deployment"],
-                        action.get("delta", 1),
-                        action.get("reason", "")
-                    )
-                
-                # Healing actions
-                elif action_type == "heal_crashloop":
-                    pod_info = {
-                        "name": action["pod"],
-                        "restarts": action.get("restarts", 0)
-                    }
-                    result = self.healer.heal_crashloop(pod_info)
-                
-                elif action_type == "heal_pending":
-                    pod_info = {"name": action["pod"]}
-                    result = self.healer.heal_pending(pod_info)
-                
-                elif action_type == "heal_failed":
-                    pod_info = {"name": action["pod"]}
-                    result = self.healer.heal_failed(pod_info)
-                
-                else:
-                    result = {
-                        "success": False,
-                        "reason": f"Unknown action type: {action_type}"
-                    }
-                
-                # Add timing information
-                duration_ms = (time.time() - start_time) * 1000
-                result["duration_ms"] = duration_ms
-                
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Error executing action {action_type}: {e}")
-                results.append({
+            elif action_type == "scale_down":
+                result = self.scaler.scale_down(
+                    action["deployment"],
+                    action.get("delta", 1),
+                    action.get("reason", "")
+                )
+            
+            elif action_type == "scale_to":
+                result = self.scaler.scale_to(
+                    action["deployment"],
+                    action["replicas"],
+                    action.get("reason", "")
+                )
+            
+            # Healing actions
+            elif action_type == "heal_deployment":
+                result = self.healer.heal_group(
+                    action["deployment"],
+                    action["pod_states"],
+                    action.get("deployment_replicas", 0)
+                )
+            
+            elif action_type == "right_size_memory":
+                result = self.healer.right_size_memory(
+                    action["deployment"],
+                    action["container"],
+                    action.get("pods", [])
+                )
+            
+            elif action_type == "heal_crashloop":
+                pod_info = {
+                    "name": action["pod"],
+                    "restarts": action.get("restarts", 0)
+                }
+                result = self.healer.heal_crashloop(pod_info)
+            
+            elif action_type == "heal_pending":
+                pod_info = {"name": action["pod"], "pending_seconds": action.get("pending_seconds")}
+                result = self.healer.heal_pending(pod_info)
+            
+            elif action_type == "heal_failed":
+                pod_info = {"name": action["pod"]}
+                result = self.healer.heal_failed(pod_info)
+            
+            else:
+                result = {
                     "success": False,
-                    "reason": str(e),
-                    "duration_ms": (time.time() - start_time) * 1000
-                })
-        
-        return results
+                    "reason": f"Unknown action type: {action_type}"
+                }
+            
+            # Add timing information
+            duration_ms = (time.time() - start_time) * 1000
+            result["duration_ms"] = duration_ms
+            action_seconds.observe(
+                duration_ms / 1000,
+                action=action_type,
+                success=str(bool(result.get("success"))).lower()
+            )
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error executing action {action_type}: {e}")
+            duration_ms = (time.time() - start_time) * 1000
+            action_seconds.observe(duration_ms / 1000, action=action_type, success="false")
+            return {
+                "success": False,
+                "reason": str(e),
+                "duration_ms": duration_ms
+            }
     
     def get_status(self) -> Dict:
         """
         Get current status of the decision engine
         """
+        durations = list(self.cycle_durations_ms)
         return {
             "running": self.running,
             "cycle_count": self.cycle_count,
             "interval": self.interval,
             "namespace": self.namespace,
+            "cycles": dict(self.cycle_outcomes),
+            "cycle_latency_ms": {
+                "samples": len(durations),
+                "p50": round(percentile(durations, 50), 1),
+                "p90": round(percentile(durations, 90), 1),
+                "p99": round(percentile(durations, 99), 1),
+                "max": round(max(durations), 1) if durations else 0.0
+            },
+            "last_cycle": self.last_cycle,
+            "queue": self.queue.get_status(),
+            "rollouts": rollout_tracker.get_status(),
+            "scaling": self.scaler.stabilizer.get_status(),
+            "heal_backoff": self.healer.backoff.get_status(),
+            "events": self.events.get_status() if self.events else None,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -325,8 +685,20 @@ def main():
         ]
     )
     
-    # Create and start engine
-    engine = DecisionEngine()
+    # The API process cannot see this process's metrics, so export them here
+    if ENGINE_METRICS_PORT:
+        metrics_registry.serve(ENGINE_METRICS_PORT)
+    
+    # Create and start engine (multi-namespace mode when configured)
+    if K8S_NAMESPACES or K8S_NAMESPACE_SELECTOR:
+        from agents.namespace_pool import NamespacePool
+        shard = None
+        if SHARDING_ENABLED:
+            from agents.sharding import ShardCoordinator, KubectlLeaseBackend
+            shard = ShardCoordinator(KubectlLeaseBackend())
+        engine = NamespacePool(shard=shard)
+    else:
+        engine = DecisionEngine()
     engine.start()
 
 
@@ -0,0 +1,140 @@
+"""
+Engine Service - Runs the decision engine as an asyncio background task
+Lets the API process host the engine and share its latest cluster snapshot
+"""
+import sys
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.decision_engine import DecisionEngine
+from mcp_server.config import EVENT_WATCH_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class EngineService:
+    """
+    Cancellable asyncio wrapper around DecisionEngine.run_cycle.
+    Cycles run in a worker thread (they shell out to kubectl), so the
+    event loop keeps serving requests while a cycle is in progress.
+    """
+    
+    def __init__(self, engine: Optional[DecisionEngine] = None):
+        self._engine = engine
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.paused = False
+        self.in_cycle = False
+        self.started_at: Optional[str] = None
+    
+    @property
+    def engine(self) -> DecisionEngine:
+        """Engine is created on first use so importing the API stays cheap"""
+        if self._engine is None:
+            self._engine = DecisionEngine()
+        return self._engine
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def start(self):
+        """
+        Start the background loop on the current event loop
+        """
+        if self.running:
+            return
+        self._wake = asyncio.Event()
+        self.engine.running = True
+        self.started_at = datetime.now().isoformat()
+        self._task = asyncio.create_task(self._run(), name="sentinelops-engine")
+        if EVENT_WATCH_ENABLED:
+            # Events arrive on the watch thread; hop onto the loop to wake it
+            loop = asyncio.get_running_loop()
+            self.engine.watch_events(lambda: loop.call_soon_threadsafe(self._wake.set))
+        logger.info(f"Decision engine running in-process (namespace: {self.engine.namespace}, "
+                    f"interval: {self.engine.interval}s)")
+    
+    async def stop(self):
+        """
+        Cancel the loop; a cycle already running in its thread is left to finish
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.engine.running = False
+        self.engine.stop_events()
+        logger.info("In-process decision engine stopped")
+    
+    def pause(self):
+        """Skip cycles until resumed (the current cycle completes)"""
+        self.paused = True
+        logger.info("In-process decision engine paused")
+    
+    def resume(self):
+        """Resume cycles immediately"""
+        self.paused = False
+        if self._wake is not None:
+            self._wake.set()
+        logger.info("In-process decision engine resumed")
+    
+    async def _run(self):
+        """Cycle, then sleep for the interval (or until resumed)"""
+        while True:
+            self._wake.clear()
+            if not self.paused:
+                self.engine.cycle_count += 1
+                self.in_cycle = True
+                try:
+                    await asyncio.to_thread(self.engine.run_cycle)
+                finally:
+                    self.in_cycle = False
+            
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.engine.interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    def snapshot(self, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Latest metrics, pods and deployments collected by the engine, or
+        None when the engine is not running here or the data is stale
+        """
+        if not self.running or self._engine is None:
+            return None
+        monitor = self.engine.monitor
+        age = time.time() - monitor.last_collected_at
+        if not monitor.last_metrics or age > (max_age if max_age is not None else self.engine.interval * 2):
+            return None
+        return {
+            "metrics": monitor.last_metrics,
+            "pods": monitor.last_pods,
+            "deployments": monitor.last_metrics.get("deployments", []),
+            "age_seconds": round(age, 1)
+        }
+    
+    def get_status(self) -> Dict:
+        """Live engine state for the API"""
+        status = self.engine.get_status() if self._engine is not None else {}
+        status.update({
+            "in_process": self.running,
+            "paused": self.paused,
+            "in_cycle": self.in_cycle,
+            "started_at": self.started_at
+        })
+        return status
+
+
+# Create singleton instance (started by the API when ENGINE_IN_PROCESS=true)
+engine_service = EngineService()
@@ -0,0 +1,230 @@
+"""
+Event Watcher - Streams namespace Events into typed issues
+Failures such as BackOff, FailedScheduling or image pull errors are picked up
+as they happen instead of on the next poll, and can wake the engine early
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.owner_index import owner_index
+from tools.telemetry import metrics_registry
+from mcp_server.config import EVENT_DEDUPE_WINDOW, EVENT_WAKE_MIN_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Event reason -> (issue type, severity); only Warning events are considered
+EVENT_ISSUES = {
+    "BackOff": ("pod_crashloop", "high"),
+    "FailedScheduling": ("pod_unschedulable", "medium"),
+    "Failed": ("pod_image_pull", "high"),  # only image errors, see _issue_type
+    "ErrImagePull": ("pod_image_pull", "high"),
+    "ImagePullBackOff": ("pod_image_pull", "high"),
+    "Evicted": ("pod_evicted", "medium"),
+    "OOMKilling": ("pod_oom_killed", "high"),
+    "FailedMount": ("pod_failed_mount", "medium"),
+    "FailedCreatePodSandBox": ("pod_sandbox_failed", "medium"),
+}
+
+# Seconds to wait before restarting kubectl after the watch ends
+RESTART_DELAY = 5
+
+events_total = metrics_registry.counter(
+    "sentinelops_k8s_events_total",
+    "Warning events received from the Events watch",
+    ["reason", "outcome"]
+)
+
+
+def decode_stream(buffer: str, decoder: json.JSONDecoder = json.JSONDecoder()) -> Tuple[List[Dict], str]:
+    """
+    Split concatenated JSON documents (as printed by kubectl --watch -o json)
+    into objects; returns the parsed objects and the incomplete remainder
+    """
+    objects = []
+    position = 0
+    length = len(buffer)
+    while True:
+        while position < length and buffer[position].isspace():
+            position += 1
+        if position >= length:
+            return objects, ""
+        try:
+            obj, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            return objects, buffer[position:]
+        objects.append(obj)
+
+
+class EventWatcher:
+    """
+    Runs `kubectl get events --watch-only -o json` in a daemon thread and turns
+    Warning events into issues in the monitor's format. Repeats of the same
+    (object kind, object name, reason) within the dedupe window only update the
+    pending issue's count. Subscribers are called for new high/medium issues,
+    at most once per wake interval.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        dedupe_window: float = EVENT_DEDUPE_WINDOW,
+        wake_interval: float = EVENT_WAKE_MIN_INTERVAL
+    ):
+        self.namespace = namespace
+        self.dedupe_window = dedupe_window
+        self.wake_interval = wake_interval
+        self._pending: Dict[Tuple[str, str, str], Dict] = {}
+        self._seen: Dict[Tuple[str, str, str], float] = {}
+        self._subscribers: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._last_wake = 0.0
+        self.received = 0
+    
+    def subscribe(self, callback: Callable[[], None]):
+        """Call `callback` (from the watch thread) when an urgent issue arrives"""
+        self._subscribers.append(callback)
+    
+    def start(self):
+        """Start the watch thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"sentinelops-events-{self.namespace}", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching events in namespace {self.namespace}")
+    
+    def stop(self):
+        """Stop watching and terminate kubectl"""
+        self._stop.set()
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+    
+    def _run(self):
+        """Keep a kubectl watch running (watches end server-side periodically)"""
+        cmd = ["kubectl", "get", "events", "-n", self.namespace, "--watch-only", "-o", "json"]
+        while not self._stop.is_set():
+            try:
+                self._process = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+                )
+                self._consume(self._process.stdout)
+            except Exception as e:
+                logger.error(f"Event watch in {self.namespace} failed: {e}")
+            finally:
+                if self._process is not None and self._process.poll() is None:
+                    self._process.terminate()
+            self._stop.wait(RESTART_DELAY)
+    
+    def _consume(self, stream):
+        buffer = ""
+        fd = stream.fileno()
+        while not self._stop.is_set():
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return
+            objects, buffer = decode_stream(buffer + chunk.decode("utf-8", errors="replace"))
+            for obj in objects:
+                self.handle(obj)
+    
+    def handle(self, event: Dict) -> Optional[Dict]:
+        """Turn one Event object into a pending issue (None if ignored or a duplicate)"""
+        if event.get("kind") == "List":
+            for item in event.get("items", []):
+                self.handle(item)
+            return None
+        
+        reason = event.get("reason", "")
+        if event.get("type") != "Warning":
+            return None
+        self.received += 1
+        issue_type = self._issue_type(reason, event.get("message", ""))
+        if issue_type is None:
+            events_total.inc(reason=reason if reason in EVENT_ISSUES else "other", outcome="ignored")
+            return None
+        
+        involved = event.get("involvedObject", {})
+        kind, name = involved.get("kind", ""), involved.get("name", "")
+        key = (kind, name, reason)
+        now = time.time()
+        count = event.get("count") or (event.get("series") or {}).get("count") or 1
+        
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None or now - self._seen.get(key, 0.0) < self.dedupe_window:
+                if pending is not None:
+                    pending["value"] = max(pending.get("value") or 0, count)
+                events_total.inc(reason=reason, outcome="duplicate")
+                return None
+            
+            severity = EVENT_ISSUES[reason][1]
+            issue = {
+                "type": issue_type,
+                "severity": severity,
+                "value": count,
+                "message": f"{kind} {name}: {reason} - {event.get('message', '').strip()[:200]}",
+                "resource": name,
+                "deployment": owner_index.deployment_for_pod(self.namespace, name) if kind == "Pod" else None,
+                "source": "event",
+                "timestamp": datetime.now().isoformat()
+            }
+            self._pending[key] = issue
+            self._seen[key] = now
+            if len(self._seen) > 10000:
+                self._seen = {k: t for k, t in self._seen.items() if now - t < self.dedupe_window}
+        
+        events_total.inc(reason=reason, outcome="issue")
+        logger.info(f"[EVENT] {issue['message']}")
+        if severity in ("high", "medium"):
+            self._wake(now)
+        return issue
+    
+    @staticmethod
+    def _issue_type(reason: str, message: str) -> Optional[str]:
+        if reason not in EVENT_ISSUES:
+            return None
+        if reason == "BackOff" and "restarting failed container" not in message:
+            return None  # image pull back-offs are reported by Failed/ImagePullBackOff
+        if reason == "Failed" and "image" not in message.lower():
+            return None
+        return EVENT_ISSUES[reason][0]
+    
+    def _wake(self, now: float):
+        if now - self._last_wake < self.wake_interval:
+            return
+        self._last_wake = now
+        for callback in self._subscribers:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error waking event subscriber: {e}")
+    
+    def drain(self) -> List[Dict]:
+        """Issues received since the last drain"""
+        with self._lock:
+            issues = list(self._pending.values())
+            self._pending.clear()
+        return issues
+    
+    def get_status(self) -> Dict:
+        """Watch state and counters"""
+        return {
+            "namespace": self.namespace,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "received": self.received,
+            "pending": len(self._pending)
+        }
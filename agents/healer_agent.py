@@ -2,36 +2,301 @@
 Healer Agent - Handles auto-healing of failed pods and deployments
 """
 import sys
+import time
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from tools.k8s_client import k8s_client
-from mcp_server.config import K8S_NAMESPACE
+from tools.k8s_client import K8sClient, k8s_client, parse_memory, format_memory
+from tools.prometheus import prometheus_client
+from tools.owner_index import owner_index
+from tools.telemetry import metrics_registry
+from tools.failure_signatures import UNRECOVERABLE, classify, dominant_cause
+from agents.rate_limiter import remediation_limiter
+from mcp_server.config import (
+    K8S_NAMESPACE,
+    HEAL_RESTART_FRACTION,
+    HEAL_MAX_POD_DELETES,
+    HEAL_BACKOFF_BASE,
+    HEAL_BACKOFF_MAX,
+    HEAL_GIVE_UP_ATTEMPTS,
+    HEAL_BACKOFF_MAX_PODS,
+    LOG_FETCH_WORKERS,
+    LOG_FETCH_DEADLINE,
+    LOG_LIMIT_BYTES,
+    LOG_TAIL_LINES,
+    PENDING_AGE_THRESHOLD,
+    OOM_REMEDIATION_MODE,
+    OOM_MEMORY_STEP,
+    OOM_PEAK_HEADROOM,
+    OOM_MAX_INCREASE,
+    OOM_MEMORY_CEILING,
+    OOM_PEAK_WINDOW,
+    OOM_RESIZE_COOLDOWN
+)
 
 logger = logging.getLogger(__name__)
 
+crash_root_cause_total = metrics_registry.counter(
+    "sentinelops_crash_root_cause_total",
+    "Crashlooping pods by root cause classified from their logs",
+    ["root_cause"]
+)
+
+# Owners that replace a deleted pod under a new name; their pods share one history
+REPLACING_OWNERS = ("ReplicaSet", "Job")
+
+
+class HealBackoff:
+    """
+    Remediation history per pod: after each delete the next one is allowed
+    only once a doubling delay (base..max seconds) has passed, and after
+    give_up attempts the pod is escalated instead of deleted again.
+    
+    Entries are keyed "namespace/key" -> [attempts, last_attempt, next_allowed, escalated]
+    and kept in LRU order, bounded by max_entries. A history older than twice
+    the maximum delay starts over, unless the pod was given up on: those stay
+    escalated until prune() sees the pod (or owner) gone, and are evicted for
+    space only when nothing else is left.
+    """
+    
+    def __init__(
+        self,
+        base: float = HEAL_BACKOFF_BASE,
+        max_delay: float = HEAL_BACKOFF_MAX,
+        give_up: int = HEAL_GIVE_UP_ATTEMPTS,
+        max_entries: int = HEAL_BACKOFF_MAX_PODS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.base = base
+        self.max_delay = max_delay
+        self.give_up = give_up
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _entry(self, key: str, now: float) -> Optional[List]:
+        """Live entry for key (caller holds the lock); stale histories are dropped"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < self.give_up and now - entry[1] > 2 * self.max_delay:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def check(self, namespace: str, key: str) -> Optional[Dict]:
+        """
+        None if key may be remediated now, otherwise a failed result with
+        reason "backoff" (retry_in_s) or "gave_up" (escalated)
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entry(f"{namespace}/{key}", now)
+            if entry is None:
+                return None
+            attempts, _, next_allowed, escalated = entry
+            if attempts >= self.give_up:
+                entry[3] = True
+        
+        if attempts >= self.give_up:
+            message = (f"{key} was deleted {attempts} times without recovering; "
+                       f"not deleting again, escalating")
+            (logger.debug if escalated else logger.error)(message)
+            return {
+                "success": False,
+                "reason": "gave_up",
+                "escalated": True,
+                "attempts": attempts,
+                "message": message
+            }
+        if now < next_allowed:
+            return {
+                "success": False,
+                "reason": "backoff",
+                "attempts": attempts,
+                "retry_in_s": round(next_allowed - now, 1)
+            }
+        return None
+    
+    def record(self, namespace: str, key: str):
+        """Count one remediation of key and schedule the next allowed one"""
+        now = self.clock()
+        full_key = f"{namespace}/{key}"
+        with self._lock:
+            entry = self._entry(full_key, now)
+            attempts = (entry[0] if entry else 0) + 1
+            delay = min(self.max_delay, self.base * 2 ** (attempts - 1))
+            self._entries[full_key] = [attempts, now, now + delay, False]
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._evict_one()
+        logger.debug(f"Heal backoff for {full_key}: attempt {attempts}, next in {delay:.0f}s")
+    
+    def _evict_one(self):
+        """Drop the least recently used entry, sparing escalated ones if possible (caller holds the lock)"""
+        for key, entry in self._entries.items():
+            if entry[0] < self.give_up:
+                del self._entries[key]
+                return
+        self._entries.popitem(last=False)
+    
+    def prune(self, namespace: str, live_keys: Iterable[str]):
+        """Forget entries of namespace whose pod (or owner) no longer exists"""
+        prefix = f"{namespace}/"
+        live = {prefix + key for key in live_keys}
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix) and k not in live]:
+                del self._entries[key]
+    
+    def get_status(self) -> Dict:
+        """Tracked pods and the backoff settings"""
+        now = self.clock()
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            "tracked": len(entries),
+            "gave_up": [key for key, entry in entries if entry[0] >= self.give_up],
+            "backing_off": {
+                key: round(entry[2] - now, 1)
+                for key, entry in entries
+                if entry[0] < self.give_up and entry[2] > now
+            },
+            "base_seconds": self.base,
+            "max_seconds": self.max_delay,
+            "give_up_attempts": self.give_up
+        }
+
 
 class HealerAgent:
     """
     Automatically heals failed or problematic pods
     """
     
-    def __init__(self, namespace: str = K8S_NAMESPACE):
+    def __init__(self, namespace: str = K8S_NAMESPACE, k8s: Optional[K8sClient] = None):
         self.namespace = namespace
+        self.k8s = k8s or k8s_client
         self.restart_threshold = 5  # Restart deployment if pod restarts exceed this
+        self.restart_fraction = HEAL_RESTART_FRACTION
+        self.max_pod_deletes = HEAL_MAX_POD_DELETES
+        self.backoff = heal_backoff
+        self.log_deadline = LOG_FETCH_DEADLINE
+        self.pending_age_threshold = PENDING_AGE_THRESHOLD
+        self.oom_mode = OOM_REMEDIATION_MODE
+        self._resized: Dict[str, float] = {}  # "deployment/container" -> epoch of last right-size
     
-    def restart_pod(self, pod_name: str, reason: str = "") -> Dict:
+    def diagnose(self, pod_names: List[str]) -> Dict[str, Dict]:
         """
-        Delete a pod (Kubernetes will recreate it)
+        Classify why pods crashed from their previous container's logs.
+        Logs are fetched concurrently with a byte budget per pod; pods whose
+        logs are not back by the deadline are reported as "unknown".
         """
+        if not pod_names:
+            return {}
+        start = time.perf_counter()
+        
+        def fetch(pod_name: str) -> Dict:
+            log = self.k8s.get_pod_logs(
+                pod_name,
+                self.namespace,
+                tail=LOG_TAIL_LINES,
+                previous=True,
+                limit_bytes=LOG_LIMIT_BYTES,
+                timeout=self.log_deadline + 1
+            )
+            return classify(log)
+        
+        executor = ThreadPoolExecutor(max_workers=min(LOG_FETCH_WORKERS, len(pod_names)))
         try:
-            success = k8s_client.delete_pod(pod_name, self.namespace)
+            futures = {executor.submit(fetch, name): name for name in pod_names}
+            wait(futures, timeout=self.log_deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        diagnosis = {}
+        for future, name in futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                diagnosis[name] = future.result()
+            else:
+                diagnosis[name] = {"root_cause": "unknown", "matches": {}, "evidence": None, "timed_out": True}
+            crash_root_cause_total.inc(root_cause=diagnosis[name]["root_cause"])
+        
+        logger.info(f"Diagnosed {len(pod_names)} pod(s) in {(time.perf_counter() - start) * 1000:.0f}ms: " +
+                    ", ".join(f"{name}={d['root_cause']}" for name, d in diagnosis.items()))
+        return diagnosis
+    
+    @staticmethod
+    def _diagnosis_summary(diagnosis: Dict[str, Dict]) -> Optional[Dict]:
+        """Compact form attached to results and incidents"""
+        if not diagnosis:
+            return None
+        causes = {name: d["root_cause"] for name, d in diagnosis.items()}
+        root_cause = dominant_cause(list(causes.values())) or "unknown"
+        evidence = next(
+            (d["evidence"] for d in diagnosis.values() if d["root_cause"] == root_cause and d["evidence"]),
+            None
+        )
+        return {"root_cause": root_cause, "pods": causes, "evidence": evidence}
+    
+    def _deployment_for_pod(self, pod_name: str) -> Optional[str]:
+        """Owning deployment from the owner index (None for other workloads or unknown pods)"""
+        return owner_index.deployment_for_pod(self.namespace, pod_name)
+    
+    def _backoff_key(self, pod_name: str) -> str:
+        """
+        History key for a pod: the owning ReplicaSet/Job for pods that get
+        replaced under a new name (so a replacement that fails the same way
+        keeps backing off), otherwise the pod name itself
+        """
+        kind, name = owner_index.owner_of(self.namespace, pod_name)
+        if kind in REPLACING_OWNERS:
+            return f"{kind}/{name}"
+        return pod_name
+    
+    def prune_backoff(self, pods: List[Dict]):
+        """Drop backoff history of pods (and owners) missing from a full pod listing"""
+        if not pods:
+            return  # an empty listing is more likely a failed kubectl call than an empty namespace
+        self.backoff.prune(self.namespace, {self._backoff_key(p["name"]) for p in pods if p.get("name")})
+    
+    def restart_pod(
+        self,
+        pod_name: str,
+        reason: str = "",
+        deployment: Optional[str] = None,
+        use_backoff: bool = True
+    ) -> Dict:
+        """
+        Delete a pod (Kubernetes will recreate it); pods deleted repeatedly
+        are backed off and eventually escalated instead
+        """
+        try:
+            key = self._backoff_key(pod_name)
+            if use_backoff:
+                held = self.backoff.check(self.namespace, key)
+                if held:
+                    held["pod"] = pod_name
+                    return held
+            
+            limited = remediation_limiter.check(
+                "delete_pod", self.namespace, deployment or self._deployment_for_pod(pod_name)
+            )
+            if limited:
+                return limited
+            
+            success = self.k8s.delete_pod(pod_name, self.namespace)
             
             if success:
+                if use_backoff:
+                    self.backoff.record(self.namespace, key)
                 logger.info(f"Restarted pod {pod_name}. Reason: {reason}")
                 return {
                     "success": True,
@@ -42,7 +307,7 @@ class HealerAgent:
                 }
             else:
                 return {"success": False, "reason": "k8s_error"}
-                
+        
         except Exception as e:
             logger.error(f"Error restarting pod {pod_name}: {e}")
             return {"success": False, "reason": str(e)}
@@ -52,7 +317,11 @@ class HealerAgent:
         Perform rolling restart of deployment
         """
         try:
-            success = k8s_client.restart_deployment(deployment, self.namespace)
+            limited = remediation_limiter.check("restart_deployment", self.namespace, deployment)
+            if limited:
+                return limited
+            
+            success = self.k8s.restart_deployment(deployment, self.namespace)
             
             if success:
                 logger.info(f"Restarted deployment {deployment}. Reason: {reason}")
@@ -65,7 +334,7 @@ class HealerAgent:
                 }
             else:
                 return {"success": False, "reason": "k8s_error"}
-                
+        
         except Exception as e:
             logger.error(f"Error restarting deployment {deployment}: {e}")
             return {"success": False, "reason": str(e)}
@@ -79,26 +348,304 @@ class HealerAgent:
         
         logger.warning(f"Healing CrashLoopBackOff pod: {pod_name} (restarts: {restarts})")
         
-        if restarts > self.restart_threshold:
+        diagnosis = self._diagnosis_summary(self.diagnose([pod_name]))
+        deployment = self._deployment_for_pod(pod_name)
+        if diagnosis["root_cause"] in UNRECOVERABLE:
+            # A restart would crash the same way; leave the pod for a human
+            message = f"Pod {pod_name} crashes with {diagnosis['root_cause']}; not restarting, escalating"
+            logger.error(message)
+            result = {
+                "success": False,
+                "reason": "escalated",
+                "escalated": True,
+                "action": "escalate",
+                "pod": pod_name,
+                "message": message,
+                "timestamp": datetime.now().isoformat()
+            }
+        elif restarts > self.restart_threshold and deployment:
             # If many restarts, restart entire deployment
-            deployment = pod_name.rsplit('-', 2)[0]  # Extract deployment name
             logger.info(f"High restart count ({restarts}), restarting deployment {deployment}")
-            return self.restart_deployment(
+            result = self.restart_deployment(
                 deployment, 
                 reason=f"Pod {pod_name} has {restarts} restarts"
             )
         else:
-            # Just restart the pod
-            return self.restart_pod(
+            # Just restart the pod (also when it is not owned by a Deployment)
+            result = self.restart_pod(
                 pod_name,
-                reason="CrashLoopBackOff detected"
+                reason="CrashLoopBackOff detected",
+                deployment=deployment
+            )
+        result["diagnosis"] = diagnosis
+        return result
+    
+    def plan_group(self, pods: List[Dict], replicas: int) -> str:
+        """
+        Choose one remediation for a deployment's unhealthy pods
+        ({"name", "issue": crashloop|pending|failed, "restarts"}):
+          escalate           - every replica is crashlooping (likely a bad release;
+                               new pods would crash the same way), or the logs
+                               show a root cause a restart cannot fix
+          restart_deployment - a pod crashed more than restart_threshold times, or
+                               at least restart_fraction of the replicas are unhealthy
+          delete_pods        - otherwise, delete the unhealthy pods
+        """
+        crashlooping = [p for p in pods if p.get("issue") == "crashloop"]
+        if replicas > 0 and len(crashlooping) >= replicas:
+            return "escalate"
+        if any(p.get("root_cause") in UNRECOVERABLE for p in crashlooping):
+            return "escalate"
+        if any(p.get("restarts", 0) > self.restart_threshold for p in crashlooping):
+            return "restart_deployment"
+        if replicas > 0 and len(pods) / replicas >= self.restart_fraction and len(pods) > 1:
+            return "restart_deployment"
+        return "delete_pods"
+    
+    def heal_group(self, deployment: str, pods: List[Dict], replicas: int) -> Dict:
+        """
+        Heal all unhealthy pods of one deployment with a single decision
+        and report which pods it covered
+        """
+        names = [p["name"] for p in pods]
+        diagnosis = self._diagnosis_summary(
+            self.diagnose([p["name"] for p in pods if p.get("issue") == "crashloop"])
+        )
+        if diagnosis:
+            pods = [dict(p, root_cause=diagnosis["pods"].get(p["name"])) for p in pods]
+        result = self._heal_group(deployment, pods, replicas, names)
+        if diagnosis:
+            result["diagnosis"] = diagnosis
+            result["new_state"]["root_cause"] = diagnosis["root_cause"]
+        return result
+    
+    def _heal_group(self, deployment: str, pods: List[Dict], replicas: int, names: List[str]) -> Dict:
+        plan = self.plan_group(pods, replicas)
+        logger.warning(f"Healing {len(pods)} unhealthy pod(s) of {deployment} "
+                       f"({replicas} replicas): {plan}")
+        
+        if plan == "escalate":
+            causes = {p.get("root_cause") for p in pods} & UNRECOVERABLE
+            if causes:
+                message = (f"Pods of {deployment} crash with {', '.join(sorted(causes))}; "
+                           f"not restarting, escalating")
+            else:
+                message = (f"All {replicas} replicas of {deployment} are crashlooping; "
+                           f"not restarting (likely a bad release), escalating")
+            logger.error(message)
+            return {
+                "success": False,
+                "reason": "escalated",
+                "escalated": True,
+                "action": "escalate",
+                "deployment": deployment,
+                "pods": names,
+                "message": message,
+                "new_state": {"plan": plan, "pods": names},
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        if plan == "restart_deployment":
+            result = self.restart_deployment(
+                deployment,
+                reason=f"{len(pods)}/{replicas} pods unhealthy"
+            )
+            result.update({
+                "deployment": deployment,
+                "pods": names,
+                "message": f"Rolling restart of {deployment} for {len(names)} unhealthy pod(s)",
+                "new_state": {"plan": plan, "pods": names}
+            })
+            return result
+        
+        # Delete the pods individually (the worst ones first, up to the per-cycle cap).
+        # Backoff is checked once per history key, so sibling pods of one
+        # ReplicaSet are deleted together and count as a single attempt.
+        selected = sorted(pods, key=lambda p: p.get("restarts", 0), reverse=True)[:self.max_pod_deletes]
+        deleted, failed, held = [], {}, {}
+        attempted = set()
+        for pod in selected:
+            key = self._backoff_key(pod["name"])
+            if key not in held:
+                held[key] = self.backoff.check(self.namespace, key)
+            if held[key]:
+                failed[pod["name"]] = held[key]["reason"]
+                continue
+            result = self.restart_pod(
+                pod["name"],
+                reason=f"{pod.get('issue', 'unhealthy')} pod of {deployment}",
+                deployment=deployment,
+                use_backoff=False
             )
+            if result.get("success"):
+                deleted.append(pod["name"])
+                attempted.add(key)
+            else:
+                failed[pod["name"]] = result.get("reason")
+        for key in attempted:
+            self.backoff.record(self.namespace, key)
+        
+        skipped = [name for name in names if name not in deleted and name not in failed]
+        if not deleted and failed and all(reason == "gave_up" for reason in failed.values()):
+            message = (f"Unhealthy pods of {deployment} did not recover after repeated deletes; "
+                       f"escalating")
+            return {
+                "success": False,
+                "reason": "gave_up",
+                "escalated": True,
+                "action": "escalate",
+                "deployment": deployment,
+                "pods": names,
+                "message": message,
+                "new_state": {"plan": plan, "pods": names, "failed": failed},
+                "timestamp": datetime.now().isoformat()
+            }
+        return {
+            "success": bool(deleted) and not failed,
+            "action": "delete_pods",
+            "deployment": deployment,
+            "pods": names,
+            "deleted": deleted,
+            "failed": failed,
+            "skipped": skipped,
+            "message": f"Deleted {len(deleted)}/{len(names)} unhealthy pod(s) of {deployment}",
+            "new_state": {"plan": plan, "pods": names, "deleted": deleted, "failed": failed, "skipped": skipped},
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def recommend_memory_limit(self, current: int, peak: float) -> int:
+        """
+        New memory limit (bytes) for a container that was OOMKilled: at least
+        one step above the current limit, enough for the observed peak plus
+        headroom, but never more than OOM_MAX_INCREASE times the current
+        limit or OOM_MEMORY_CEILING
+        """
+        desired = max(current * OOM_MEMORY_STEP, peak * OOM_PEAK_HEADROOM)
+        ceiling = min(current * OOM_MAX_INCREASE, parse_memory(OOM_MEMORY_CEILING) or float("inf"))
+        return int(min(desired, ceiling))
+    
+    def right_size_memory(self, deployment: str, container: str, pods: List[str]) -> Dict:
+        """
+        Raise the memory limit of a container that keeps getting OOMKilled
+        (restarting it would only crash it again). In "propose" mode the
+        recommendation is only recorded on the incident.
+        """
+        key = f"{deployment}/{container}"
+        since = time.time() - self._resized.get(key, 0.0)
+        if since < OOM_RESIZE_COOLDOWN:
+            # The last change is still rolling out (old pods keep their OOMKilled status)
+            return {
+                "success": False,
+                "reason": "cooldown",
+                "deployment": deployment,
+                "retry_in_s": round(OOM_RESIZE_COOLDOWN - since, 1)
+            }
+        
+        resources = self.k8s.get_container_resources(deployment, self.namespace).get(container, {})
+        current = parse_memory(resources.get("limits", {}).get("memory"))
+        if not current:
+            message = (f"{deployment}/{container} was OOMKilled without a memory limit "
+                       f"(node memory pressure); escalating")
+            logger.error(message)
+            return {
+                "success": False,
+                "reason": "escalated",
+                "escalated": True,
+                "action": "escalate",
+                "deployment": deployment,
+                "pods": pods,
+                "message": message,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        peak = prometheus_client.get_peak_memory(self.namespace, deployment, container, OOM_PEAK_WINDOW)
+        recommended = self.recommend_memory_limit(current, peak)
+        new_state = {
+            "container": container,
+            "pods": pods,
+            "current_limit": format_memory(current),
+            "recommended_limit": format_memory(recommended),
+            "peak_bytes": int(peak),
+            "mode": self.oom_mode,
+            "applied": False
+        }
+        
+        if recommended <= current:
+            message = (f"{deployment}/{container} is OOMKilled at its ceiling "
+                       f"({format_memory(current)}); escalating")
+            logger.error(message)
+            return {
+                "success": False,
+                "reason": "at_ceiling",
+                "escalated": True,
+                "action": "escalate",
+                "deployment": deployment,
+                "pods": pods,
+                "message": message,
+                "new_state": new_state,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        self._resized[key] = time.time()
+        change = f"{new_state['current_limit']} → {new_state['recommended_limit']}"
+        if self.oom_mode != "apply":
+            logger.warning(f"Proposed memory limit for {key}: {change} (peak {peak / 1024 ** 2:.0f}Mi)")
+            return {
+                "success": True,
+                "action": "propose_memory_limit",
+                "deployment": deployment,
+                "pods": pods,
+                "message": f"Proposed memory limit {change} for {key}",
+                "new_state": new_state,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        try:
+            limited = remediation_limiter.check("set_memory_limit", self.namespace, deployment)
+            if limited:
+                del self._resized[key]
+                return limited
+            
+            if not self.k8s.set_memory_limit(deployment, container, new_state["recommended_limit"], self.namespace):
+                del self._resized[key]
+                return {"success": False, "reason": "k8s_error", "deployment": deployment}
+        except Exception as e:
+            self._resized.pop(key, None)
+            logger.error(f"Error setting memory limit of {key}: {e}")
+            return {"success": False, "reason": str(e)}
+        
+        new_state["applied"] = True
+        logger.info(f"Raised memory limit of {key}: {change}")
+        return {
+            "success": True,
+            "action": "set_memory_limit",
+            "deployment": deployment,
+            "pods": pods,
+            "message": f"Raised memory limit {change} for {key}",
+            "new_state": new_state,
+            "timestamp": datetime.now().isoformat()
+        }
     
     def heal_pending(self, pod_info: Dict) -> Dict:
         """
         Handle pod stuck in Pending state
         """
         pod_name = pod_info.get("name")
+        
+        # Leave pods that may still be scheduling or pulling images alone
+        pending_seconds = pod_info.get("pending_seconds")
+        if pending_seconds is None and pod_info.get("created_at"):
+            pending_seconds = time.time() - pod_info["created_at"]
+        if pending_seconds is not None and pending_seconds < self.pending_age_threshold:
+            logger.debug(f"Pod {pod_name} Pending for {pending_seconds:.0f}s, below "
+                         f"{self.pending_age_threshold}s; not healing yet")
+            return {
+                "success": False,
+                "reason": "pending_too_recent",
+                "pod": pod_name,
+                "pending_seconds": round(pending_seconds, 1)
+            }
+        
         logger.warning(f"Healing Pending pod: {pod_name}")
         
         # Try restarting the pod
@@ -127,7 +674,8 @@ class HealerAgent:
         actions_taken = []
         
         try:
-            pods = k8s_client.get_pods(self.namespace)
+            pods = self.k8s.get_pods(self.namespace)
+            self.prune_backoff(pods)
             
             for pod in pods:
                 pod_name = pod.get("name")
@@ -140,7 +688,7 @@ class HealerAgent:
                     if result.get("success"):
                         actions_taken.append(result)
                 
-                # Check for Pending (stuck for more than 5 minutes would need age check)
+                # Check for Pending (only once older than pending_age_threshold)
                 elif status == "pending":
                     result = self.heal_pending(pod)
                     if result.get("success"):
@@ -161,7 +709,7 @@ class HealerAgent:
                 logger.info(f"Healing complete: {len(actions_taken)} action(s) taken")
             
             return actions_taken
-            
+        
         except Exception as e:
             logger.error(f"Error in check_and_heal: {e}")
             return actions_taken
@@ -173,7 +721,7 @@ class HealerAgent:
         problematic = []
         
         try:
-            pods = k8s_client.get_pods(self.namespace)
+            pods = self.k8s.get_pods(self.namespace)
             
             for pod in pods:
                 status = pod.get("status", "").lower()
@@ -188,13 +736,14 @@ class HealerAgent:
                     })
             
             return problematic
-            
+        
         except Exception as e:
             logger.error(f"Error getting problematic pods: {e}")
             return []
 
 
-# Create singleton instance
+# Create singleton instances
+heal_backoff = HealBackoff()
 healer_agent = HealerAgent()
 
 
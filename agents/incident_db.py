@@ -0,0 +1,252 @@
+"""
+Incident DB - SQLite incident storage with indexed queries
+Optional backend for IncidentTracker (INCIDENT_BACKEND=sqlite): filters and
+statistics run as SQL over indexed columns, and WAL mode lets the engine and
+the API process write concurrently without interleaving records
+"""
+import sys
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.incident_store import IncidentStore, action_type, record_time
+from mcp_server.config import INCIDENT_DB, INCIDENTS_LOG
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id          TEXT PRIMARY KEY,
+    ts          REAL NOT NULL,
+    issue_type  TEXT,
+    severity    TEXT,
+    resource    TEXT,
+    action_type TEXT,
+    success     INTEGER,
+    duration_ms REAL,
+    body        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_ts ON incidents (ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_type ON incidents (issue_type, ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_severity ON incidents (severity, ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_resource ON incidents (resource, ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_action ON incidents (action_type, ts);
+"""
+
+# Rows fetched per query by read_range
+READ_BATCH = 500
+
+# Rows written before action types were recorded correctly say "none"
+BACKFILL_ACTION_TYPE = """
+UPDATE incidents SET action_type = json_extract(body, '$.action.details.type')
+WHERE action_type = 'none' AND json_extract(body, '$.action.details.type') IS NOT NULL
+"""
+
+UPSERT = """
+INSERT INTO incidents (id, ts, issue_type, severity, resource, action_type, success, duration_ms, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    success = excluded.success,
+    duration_ms = excluded.duration_ms,
+    body = excluded.body
+"""
+
+
+def _row(record: Dict) -> tuple:
+    """Indexed columns plus the JSON body of an incident record"""
+    # Tracker records nest the issue; records posted to the API may be flat
+    issue = record.get("issue") if isinstance(record.get("issue"), dict) else record
+    result = record.get("result") or {}
+    success = result.get("success")
+    return (
+        record["id"],
+        record_time(record),
+        issue.get("type"),
+        issue.get("severity"),
+        issue.get("resource"),
+        action_type(record),
+        None if success is None else int(bool(success)),
+        result.get("duration_ms"),
+        json.dumps(record)
+    )
+
+
+class SQLiteIncidentStore:
+    """
+    Incident records keyed by id, with the fields queries filter on held
+    in indexed columns and the full record kept as JSON. Offers the same
+    append/tail/read_range interface as the JSONL IncidentStore.
+    """
+    
+    def __init__(self, path: str = INCIDENT_DB, import_from: Optional[str] = INCIDENTS_LOG):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.execute(BACKFILL_ACTION_TYPE)
+        if import_from and Path(import_from).exists() and self.count() == 0:
+            self._import_jsonl(import_from)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _import_jsonl(self, path: str):
+        """Seed an empty database from the JSONL incident log"""
+        imported = 0
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            for record in IncidentStore(path).read_range():
+                record.setdefault("id", uuid.uuid4().hex[:8])
+                conn.execute(UPSERT, _row(record))
+                imported += 1
+        if imported:
+            logger.info(f"Imported {imported} incident(s) from {path} into {self.path}")
+    
+    def append(self, record: Dict):
+        """Insert a record (an existing id is replaced)"""
+        record.setdefault("id", uuid.uuid4().hex[:8])
+        self._conn().execute(UPSERT, _row(record))
+    
+    def update(self, record: Dict):
+        """Store a changed record in place"""
+        self.append(record)
+    
+    def get(self, incident_id: str) -> Optional[Dict]:
+        """One record by id"""
+        row = self._conn().execute("SELECT body FROM incidents WHERE id = ?", (incident_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def count(self) -> int:
+        """Number of stored records"""
+        return self._conn().execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+    
+    def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        severity: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        resource: Optional[str] = None,
+        action_types: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True
+    ) -> List[Dict]:
+        """Records matching every given filter, ordered by time"""
+        where, params = self._where(since, until, severity, issue_type, resource, action_types)
+        sql = f"SELECT body FROM incidents{where} ORDER BY ts {'DESC' if newest_first else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(body) for (body,) in self._conn().execute(sql, params)]
+    
+    @staticmethod
+    def _where(
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        severity: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        resource: Optional[str] = None,
+        action_types: Optional[List[str]] = None
+    ) -> tuple:
+        """WHERE clause (empty if no filter) and its parameters"""
+        clauses, params = [], []
+        for column, op, value in (
+            ("ts", ">", since), ("ts", "<=", until), ("severity", "=", severity),
+            ("issue_type", "=", issue_type), ("resource", "=", resource)
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        if action_types:
+            clauses.append(f"action_type IN ({', '.join('?' * len(action_types))})")
+            params.extend(action_types)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def action_counts(self, since: float, action_types: Optional[List[str]] = None) -> Dict[str, int]:
+        """Incidents per action type since `since` (only the given types, if any)"""
+        where, params = self._where(since=since, action_types=action_types)
+        rows = self._conn().execute(
+            f"SELECT action_type, COUNT(*) FROM incidents{where} GROUP BY action_type", params
+        ).fetchall()
+        return {kind: count for kind, count in rows if kind is not None}
+    
+    def outcome_counts(self, since: float) -> Dict[str, int]:
+        """Total and successful incidents since `since`"""
+        total, successful = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(success), 0) FROM incidents WHERE ts > ?", (since,)
+        ).fetchone()
+        return {"total": total, "successful": successful}
+    
+    def next_time(self, after: float) -> Optional[float]:
+        """Timestamp of the first incident after `after` (an index seek)"""
+        return self._conn().execute("SELECT MIN(ts) FROM incidents WHERE ts > ?", (after,)).fetchone()[0]
+    
+    def stats(self, since: float) -> Dict:
+        """Counts by severity and type, success rate and average duration since `since`"""
+        conn = self._conn()
+        by_severity = dict(conn.execute(
+            "SELECT COALESCE(severity, 'unknown'), COUNT(*) FROM incidents WHERE ts > ? GROUP BY 1", (since,)
+        ).fetchall())
+        by_type = dict(conn.execute(
+            "SELECT COALESCE(issue_type, 'unknown'), COUNT(*) FROM incidents WHERE ts > ? GROUP BY 1", (since,)
+        ).fetchall())
+        total, resolved, successful, avg_duration = conn.execute(
+            "SELECT COUNT(*), COUNT(success), COALESCE(SUM(success), 0), AVG(duration_ms) "
+            "FROM incidents WHERE ts > ?", (since,)
+        ).fetchone()
+        return {
+            "total_incidents": total,
+            "by_severity": by_severity,
+            "by_type": by_type,
+            "success_rate": round(successful / resolved * 100, 2) if resolved else 0.0,
+            "avg_resolution_time_ms": round(avg_duration or 0.0, 2)
+        }
+    
+    def tail(self, count: int) -> List[Dict]:
+        """Newest `count` records, oldest first"""
+        return list(reversed(self.query(limit=count)))
+    
+    def read_range(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Records with since <= timestamp <= until, oldest first. Rows are
+        fetched in (ts, rowid) keyset batches, each on the calling thread's
+        connection, so the generator can be resumed from another thread
+        (StreamingResponse iterates it in the threadpool).
+        """
+        sql = (
+            "SELECT ts, rowid, body FROM incidents "
+            "WHERE ts <= ? AND (ts > ? OR (ts = ? AND rowid > ?)) ORDER BY ts, rowid LIMIT ?"
+        )
+        until = until if until is not None else float("inf")
+        last_ts, last_rowid = (since if since is not None else float("-inf")), -1
+        while True:
+            rows = self._conn().execute(sql, (until, last_ts, last_ts, last_rowid, READ_BATCH)).fetchall()
+            for _, _, body in rows:
+                yield json.loads(body)
+            if len(rows) < READ_BATCH:
+                return
+            last_ts, last_rowid = rows[-1][0], rows[-1][1]
+    
+    def get_status(self) -> Dict:
+        """Database file and row count"""
+        return {
+            "path": str(self.path),
+            "backend": "sqlite",
+            "incidents": self.count(),
+            "total_bytes": self.path.stat().st_size if self.path.exists() else 0
+        }
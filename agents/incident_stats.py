@@ -0,0 +1,136 @@
+"""
+Incident Stats - Rolling per-minute incident aggregates
+Counters are updated as incidents are logged and resolved, so statistics for
+a window are a sum over its buckets instead of a pass over every incident
+"""
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.incident_store import record_time
+from mcp_server.config import INCIDENT_WINDOW_HOURS
+
+# Bucket width in seconds
+BUCKET_SECONDS = 60
+
+
+class IncidentStats:
+    """
+    Buckets keyed by minute of the incident's timestamp, each holding the
+    total, counts by severity and type, resolved/successful counts and the
+    sum and count of durations. An incident is added when logged and
+    removed and re-added around an update. Windows are answered at
+    bucket granularity (the oldest minute is counted whole). Buckets older
+    than retention_hours are dropped.
+    """
+    
+    def __init__(self, retention_hours: float = INCIDENT_WINDOW_HOURS):
+        self.retention = retention_hours * 3600
+        self._buckets: Dict[int, Dict] = {}
+        self._oldest: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _new_bucket() -> Dict:
+        return {
+            "total": 0,
+            "by_severity": {},
+            "by_type": {},
+            "resolved": 0,
+            "successful": 0,
+            "duration_sum": 0.0,
+            "duration_count": 0
+        }
+    
+    def _apply(self, incident: Dict, sign: int):
+        minute = int(record_time(incident) // BUCKET_SECONDS)
+        issue = incident.get("issue") or {}
+        result = incident.get("result") or {}
+        with self._lock:
+            bucket = self._buckets.get(minute)
+            if bucket is None:
+                if sign < 0:
+                    return  # already pruned
+                bucket = self._buckets[minute] = self._new_bucket()
+                if self._oldest is None or minute < self._oldest:
+                    self._oldest = minute
+            bucket["total"] += sign
+            for field, key in (("by_severity", issue.get("severity", "unknown")), ("by_type", issue.get("type", "unknown"))):
+                counts = bucket[field]
+                counts[key] = counts.get(key, 0) + sign
+                if not counts[key]:
+                    del counts[key]
+            if result.get("success") is not None:
+                bucket["resolved"] += sign
+                if result.get("success") is True:
+                    bucket["successful"] += sign
+            if result.get("duration_ms") is not None:
+                bucket["duration_sum"] += sign * result["duration_ms"]
+                bucket["duration_count"] += sign
+        self.prune()
+    
+    def add(self, incident: Dict):
+        """Count an incident"""
+        self._apply(incident, 1)
+    
+    def remove(self, incident: Dict):
+        """Uncount an incident (before changing it)"""
+        self._apply(incident, -1)
+    
+    def prune(self, now: Optional[float] = None):
+        """Drop buckets older than the retention period"""
+        horizon = int(((now if now is not None else time.time()) - self.retention) // BUCKET_SECONDS)
+        with self._lock:
+            if self._oldest is None or self._oldest >= horizon:
+                return
+            if horizon - self._oldest > len(self._buckets):
+                expired = [minute for minute in self._buckets if minute < horizon]
+            else:
+                expired = range(self._oldest, horizon)
+            for minute in expired:
+                self._buckets.pop(minute, None)
+            self._oldest = min(self._buckets) if self._buckets else None
+    
+    def covers(self, hours: float) -> bool:
+        """Whether a window of `hours` is within the retained buckets"""
+        return hours * 3600 <= self.retention
+    
+    def summary(self, hours: float) -> Dict:
+        """Statistics for the last `hours`, in the format of IncidentTracker.get_stats"""
+        now = time.time()
+        self.prune(now)
+        first = int((now - hours * 3600) // BUCKET_SECONDS)
+        last = int(now // BUCKET_SECONDS)
+        total = resolved = successful = duration_count = 0
+        duration_sum = 0.0
+        by_severity: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        with self._lock:
+            for minute in range(max(first, self._oldest if self._oldest is not None else last + 1), last + 1):
+                bucket = self._buckets.get(minute)
+                if bucket is None:
+                    continue
+                total += bucket["total"]
+                resolved += bucket["resolved"]
+                successful += bucket["successful"]
+                duration_sum += bucket["duration_sum"]
+                duration_count += bucket["duration_count"]
+                for key, count in bucket["by_severity"].items():
+                    by_severity[key] = by_severity.get(key, 0) + count
+                for key, count in bucket["by_type"].items():
+                    by_type[key] = by_type.get(key, 0) + count
+        return {
+            "total_incidents": total,
+            "by_severity": by_severity,
+            "by_type": by_type,
+            "success_rate": round(successful / resolved * 100, 2) if resolved else 0.0,
+            "avg_resolution_time_ms": round(duration_sum / duration_count, 2) if duration_count else 0.0
+        }
+    
+    def get_status(self) -> Dict:
+        """Number of live buckets"""
+        return {"buckets": len(self._buckets), "bucket_seconds": BUCKET_SECONDS}
@@ -3,15 +3,21 @@ Incident Tracker - Logs and tracks all incidents and remediation actions
 """
 import sys
 import json
+import time
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
 import uuid
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from mcp_server.config import INCIDENTS_LOG
+from agents.incident_store import IncidentStore, action_type, record_time
+from agents.incident_db import SQLiteIncidentStore
+from agents.incident_window import IncidentWindow
+from agents.incident_stats import IncidentStats
+from mcp_server.config import INCIDENTS_LOG, INCIDENT_BACKEND
 
 logger = logging.getLogger(__name__)
 
@@ -21,34 +27,28 @@ class IncidentTracker:
     Tracks incidents, actions taken, and results
     """
     
-    def __init__(self, log_file: str = INCIDENTS_LOG):
+    def __init__(self, log_file: str = INCIDENTS_LOG, backend: str = INCIDENT_BACKEND):
         self.log_file = Path(log_file)
-        self.incidents = []
-        self._ensure_log_file()
-        self._load_recent_incidents()
-    
-    def _ensure_log_file(self):
-        """Ensure log file and directory exist"""
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self.log_file.exists():
-            self.log_file.touch()
+        self.incidents = IncidentWindow()
+        self.stats = IncidentStats()
+        # Engines for several namespaces may log from worker threads concurrently
+        self._lock = threading.RLock()
+        
+        # With SQLite, queries go to the database and nothing is kept in memory
+        self.db: Optional[SQLiteIncidentStore] = None
+        if backend == "sqlite":
+            self.db = SQLiteIncidentStore(import_from=log_file)
+            self.store = self.db
+        else:
+            self.store = IncidentStore(log_file)
+            self._load_recent_incidents()
     
-    def _load_recent_incidents(self, hours: int = 24):
-        """Load recent incidents from file"""
+    def _load_recent_incidents(self):
+        """Fill the in-memory window from the store (seeks to it via the segment index)"""
         try:
-            if self.log_file.exists():
-                with open(self.log_file, 'r') as f:
-                    lines = f.readlines()
-                    cutoff = datetime.now() - timedelta(hours=hours)
-                    
-                    for line in lines:
-                        try:
-                            incident = json.loads(line.strip())
-                            incident_time = datetime.fromisoformat(incident.get("timestamp", ""))
-                            if incident_time > cutoff:
-                                self.incidents.append(incident)
-                        except (json.JSONDecodeError, ValueError):
-                            continue
+            self.incidents.extend(self.store.read_range(since=time.time() - self.incidents.max_age))
+            for incident in self.incidents:
+                self.stats.add(incident)
         except Exception as e:
             logger.error(f"Error loading incidents: {e}")
     
@@ -78,11 +78,11 @@ class IncidentTracker:
         
         if action:
             incident["action"] = {
-                "type": action.get("action", "none"),
+                "type": action.get("type") or action.get("action", "none"),
                 "target": action.get("deployment") or action.get("pod") or action.get("resource", ""),
                 "details": {
                     k: v for k, v in action.items() 
-                    if k not in ["action", "deployment", "pod", "resource", "success", "timestamp"]
+                    if k not in ["type", "action", "deployment", "pod", "resource", "success", "timestamp", "issue", "issues"]
                 }
             }
         
@@ -93,6 +93,8 @@ class IncidentTracker:
                 "duration_ms": result.get("duration_ms"),
                 "new_state": result.get("new_state")
             }
+            if result.get("diagnosis"):
+                incident["diagnosis"] = result["diagnosis"]
         else:
             # If no result provided but action exists, mark as pending
             if action:
@@ -104,10 +106,7 @@ class IncidentTracker:
         
         # Save to file
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(incident) + '\n')
-            
-            self.incidents.append(incident)
+            self.add_incident(incident)
             logger.info(f"Logged incident {incident_id}: {issue.get('type')}")
             
         except Exception as e:
@@ -115,40 +114,58 @@ class IncidentTracker:
         
         return incident
     
+    def add_incident(self, incident: Dict):
+        """Persist an already-built incident record and keep it in memory"""
+        with self._lock:
+            self.store.append(incident)
+            if self.db is None:
+                self.incidents.add(incident)
+                self.stats.add(incident)
+    
     def update_incident(self, incident_id: str, result: Dict) -> bool:
         """
         Update an existing incident with results
         """
         try:
-            # Find incident in memory
-            for incident in self.incidents:
-                if incident.get("id") == incident_id:
-                    incident["result"] = {
-                        "success": result.get("success", False),
-                        "message": result.get("message", ""),
-                        "duration_ms": result.get("duration_ms"),
-                        "new_state": result.get("new_state")
-                    }
-                    incident["updated_at"] = datetime.now().isoformat()
-                    
-                    # Re-write the log file with updated incident
-                    self._rewrite_log_file()
-                    return True
+            if self.db is not None:
+                incident = self.db.get(incident_id)
+                if incident is None:
+                    return False
+                self._apply_result(incident, result)
+                self.db.update(incident)
+                return True
             
-            return False
+            # Find incident in memory
+            with self._lock:
+                incident = self.incidents.get(incident_id)
+                if incident is None:
+                    return False
+                self.stats.remove(incident)
+                changes = self._apply_result(incident, result)
+                self.stats.add(incident)
+                
+                # Append the change as a delta record (merged on read, compacted later)
+                self.store.append_update(incident_id, changes, record_time(incident))
+                return True
             
         except Exception as e:
             logger.error(f"Error updating incident {incident_id}: {e}")
             return False
     
-    def _rewrite_log_file(self):
-        """Rewrite entire log file with current incidents"""
-        try:
-            with open(self.log_file, 'w') as f:
-                for incident in self.incidents:
-                    f.write(json.dumps(incident) + '\n')
-        except Exception as e:
-            logger.error(f"Error rewriting log file: {e}")
+    @staticmethod
+    def _apply_result(incident: Dict, result: Dict) -> Dict:
+        """Set an incident's result; returns the changed fields"""
+        changes = {
+            "result": {
+                "success": result.get("success", False),
+                "message": result.get("message", ""),
+                "duration_ms": result.get("duration_ms"),
+                "new_state": result.get("new_state")
+            },
+            "updated_at": datetime.now().isoformat()
+        }
+        incident.update(changes)
+        return changes
     
     def get_incidents(
         self,
@@ -160,15 +177,22 @@ class IncidentTracker:
         """
         Get incidents with optional filters
         """
-        filtered = self.incidents.copy()
+        if self.db is not None:
+            return self.db.query(
+                since=time.time() - hours * 3600 if hours else None,
+                severity=severity,
+                issue_type=issue_type,
+                limit=limit
+            )
         
-        # Filter by time
-        if hours:
-            cutoff = datetime.now() - timedelta(hours=hours)
-            filtered = [
-                i for i in filtered
-                if datetime.fromisoformat(i["timestamp"]) > cutoff
-            ]
+        # Filter by time (binary search on the window's timestamp column;
+        # longer periods than the window are read from the store)
+        cutoff = time.time() - hours * 3600 if hours else None
+        if cutoff is not None and hours * 3600 > self.incidents.max_age:
+            filtered = list(self.store.read_range(since=cutoff))
+        else:
+            self.incidents.evict()
+            filtered = self.incidents.since(cutoff)
         
         # Filter by severity
         if severity:
@@ -184,8 +208,8 @@ class IncidentTracker:
                 if i.get("issue", {}).get("type") == issue_type
             ]
         
-        # Sort by timestamp (newest first)
-        filtered.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # Newest first (the window is kept in timestamp order)
+        filtered.reverse()
         
         # Limit results
         if limit:
@@ -197,6 +221,17 @@ class IncidentTracker:
         """
         Get incident statistics
         """
+        if self.db is not None:
+            stats = self.db.stats(since=time.time() - hours * 3600)
+            stats["period_hours"] = hours
+            return stats
+        
+        # Summed from the per-minute buckets within their retention period
+        if self.stats.covers(hours):
+            stats = self.stats.summary(hours)
+            stats["period_hours"] = hours
+            return stats
+        
         incidents = self.get_incidents(hours=hours)
         
         if not incidents:
@@ -247,6 +282,58 @@ class IncidentTracker:
         Get recent incident timeline
         """
         return self.get_incidents(limit=count)
+    
+    def get_timeline(self, hours: int = 24) -> List[Dict]:
+        """
+        Incidents of the last `hours`, oldest first (read from storage, so
+        windows longer than the in-memory 24h work too)
+        """
+        since = time.time() - hours * 3600
+        if self.db is not None:
+            return self.db.query(since=since, newest_first=False)
+        return list(self.store.read_range(since=since))
+    
+    def get_actions(self, hours: int, action_types: List[str]) -> List[Dict]:
+        """Incidents of the last `hours` whose action is one of `action_types`, oldest first"""
+        since = time.time() - hours * 3600
+        if self.db is not None:
+            return self.db.query(since=since, action_types=action_types, newest_first=False)
+        incidents = self.get_incidents(hours=hours)
+        incidents.reverse()
+        return [i for i in incidents if action_type(i) in action_types]
+    
+    def count_actions(self, hours: int, action_types: List[str]) -> Dict[str, int]:
+        """Number of incidents per action type over the last `hours`"""
+        if self.db is not None:
+            return self.db.action_counts(time.time() - hours * 3600, action_types)
+        counts: Dict[str, int] = {}
+        for incident in self.get_actions(hours, action_types):
+            kind = action_type(incident)
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+    
+    def count_outcomes(self, hours: int) -> Dict[str, int]:
+        """Total and successful incidents over the last `hours`"""
+        if self.db is not None:
+            return self.db.outcome_counts(time.time() - hours * 3600)
+        incidents = self.get_incidents(hours=hours)
+        return {
+            "total": len(incidents),
+            "successful": sum(1 for i in incidents if (i.get("result") or {}).get("success") is True)
+        }
+    
+    def next_incident_time(self, after: float) -> Optional[float]:
+        """Epoch timestamp of the first incident logged after `after` (None if none yet)"""
+        if self.db is not None:
+            return self.db.next_time(after)
+        if after >= time.time() - self.incidents.max_age:
+            return self.incidents.next_after(after)
+        return next((record_time(i) for i in self.store.read_range(since=after) if record_time(i) > after), None)
+    
+    def export_jsonl(self) -> Iterator[str]:
+        """Every stored incident as JSONL, oldest first (works for both backends)"""
+        for incident in self.store.read_range():
+            yield json.dumps(incident) + "\n"
 
 
 # Create singleton instance
@@ -0,0 +1,114 @@
+"""
+Incident Window - Bounded in-memory buffer of recent incidents
+Records are kept sorted by a pre-parsed epoch timestamp column, so time
+filters are a binary search and eviction of expired records is a slice
+"""
+import sys
+import time
+import bisect
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.incident_store import record_time
+from mcp_server.config import INCIDENT_WINDOW_HOURS, INCIDENT_WINDOW_MAX
+
+
+class IncidentWindow:
+    """
+    Two parallel columns (epoch timestamps, records) ordered by timestamp,
+    plus an id -> record map. Records older than max_age_hours, or beyond
+    the newest max_records, are evicted as new ones arrive; evicted records
+    stay available from the incident store. Eviction only advances a start
+    offset, and the dead prefix is trimmed once it is half the buffer.
+    """
+    
+    def __init__(self, max_age_hours: float = INCIDENT_WINDOW_HOURS, max_records: int = INCIDENT_WINDOW_MAX):
+        self.max_age = max_age_hours * 3600
+        self.max_records = max_records
+        self._ts: List[float] = []
+        self._records: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._start = 0
+        self._lock = threading.RLock()
+        self.evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self._records) - self._start
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Records oldest first"""
+        return iter(self.since())
+    
+    def add(self, record: Dict):
+        """Insert a record at its timestamp (appending is the common case)"""
+        ts = record_time(record)
+        with self._lock:
+            if not self._ts or ts >= self._ts[-1]:
+                self._ts.append(ts)
+                self._records.append(record)
+            else:
+                position = bisect.bisect_right(self._ts, ts, lo=self._start)
+                self._ts.insert(position, ts)
+                self._records.insert(position, record)
+            if record.get("id"):
+                self._by_id[record["id"]] = record
+            self.evict(time.time())
+    
+    def extend(self, records: Iterator[Dict]):
+        """Add records (e.g. loaded from the store), evicting once at the end"""
+        with self._lock:
+            for record in records:
+                ts = record_time(record)
+                position = bisect.bisect_right(self._ts, ts, lo=self._start)
+                self._ts.insert(position, ts)
+                self._records.insert(position, record)
+                if record.get("id"):
+                    self._by_id[record["id"]] = record
+            self.evict(time.time())
+    
+    def evict(self, now: Optional[float] = None):
+        """Drop records older than the window and any beyond max_records"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            cut = bisect.bisect_left(self._ts, now - self.max_age, lo=self._start)
+            cut = max(cut, len(self._records) - self.max_records)
+            if cut <= self._start:
+                return
+            for record in self._records[self._start:cut]:
+                if self._by_id.get(record.get("id")) is record:
+                    del self._by_id[record["id"]]
+            self.evicted += cut - self._start
+            self._start = cut
+            if self._start * 2 > len(self._records):
+                del self._ts[:self._start]
+                del self._records[:self._start]
+                self._start = 0
+    
+    def get(self, incident_id: str) -> Optional[Dict]:
+        """Record by id (None if unknown or evicted)"""
+        return self._by_id.get(incident_id)
+    
+    def since(self, cutoff: Optional[float] = None) -> List[Dict]:
+        """Records with timestamp > cutoff (all if None), oldest first"""
+        with self._lock:
+            if cutoff is None:
+                return self._records[self._start:]
+            return self._records[bisect.bisect_right(self._ts, cutoff, lo=self._start):]
+    
+    def next_after(self, ts: float) -> Optional[float]:
+        """Timestamp of the first record after `ts` (None if there is none)"""
+        with self._lock:
+            position = bisect.bisect_right(self._ts, ts, lo=self._start)
+            return self._ts[position] if position < len(self._ts) else None
+    
+    def get_status(self) -> Dict:
+        """Size and eviction counters"""
+        return {
+            "records": len(self),
+            "max_records": self.max_records,
+            "max_age_hours": self.max_age / 3600,
+            "evicted": self.evicted
+        }
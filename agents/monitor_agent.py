@@ -2,6 +2,7 @@
 Monitor Agent - Collects metrics and analyzes system health
 """
 import sys
+import time
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -10,12 +11,21 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from tools.k8s_client import k8s_client
+from tools.k8s_client import K8sClient, k8s_client
 from tools.prometheus import prometheus_client
+from agents.scale_schedule import scale_schedule
 from mcp_server.config import (
     CPU_HIGH_THRESHOLD,
     CPU_LOW_THRESHOLD,
     MEMORY_HIGH_THRESHOLD,
+    MIN_REPLICAS,
+    MAX_REPLICAS,
+    SCALING_MODE,
+    CPU_TARGET_UTILIZATION,
+    MEMORY_TARGET_UTILIZATION,
+    SCALING_TOLERANCE,
+    PENDING_AGE_THRESHOLD,
+    OOM_LOOKBACK,
     K8S_NAMESPACE
 )
 
@@ -27,9 +37,13 @@ class MonitorAgent:
     Monitors Kubernetes cluster metrics and detects issues
     """
     
-    def __init__(self, namespace: str = K8S_NAMESPACE):
+    def __init__(self, namespace: str = K8S_NAMESPACE, k8s: Optional[K8sClient] = None):
         self.namespace = namespace
+        self.k8s = k8s or k8s_client
         self.last_metrics = {}
+        self.last_pods = []
+        self.last_collected_at = 0.0  # epoch seconds of the last successful collection
+        self.events = None  # EventWatcher feeding event-sourced issues, if enabled
     
     def collect_metrics(self) -> Dict:
         """
@@ -40,8 +54,8 @@ class MonitorAgent:
             prom_metrics = prometheus_client.get_all_metrics(self.namespace)
             
             # Get Kubernetes pod status
-            pods = k8s_client.get_pods(self.namespace)
-            deployments = k8s_client.get_deployments(self.namespace)
+            pods = self.k8s.get_pods(self.namespace)
+            deployments = self.k8s.get_deployments(self.namespace)
             
             metrics = {
                 "timestamp": datetime.now().isoformat(),
@@ -55,8 +69,15 @@ class MonitorAgent:
                 "node_cpu": prom_metrics.get("node_cpu", 0.0),
                 "node_memory": prom_metrics.get("node_memory", 0.0),
             }
+            if SCALING_MODE == "proportional":
+                metrics["deployment_utilization"] = prometheus_client.get_deployment_utilization(self.namespace)
+            if self.events is not None:
+                # Kept in the metrics so recorded traces replay the same issues
+                metrics["event_issues"] = self.events.drain()
             
             self.last_metrics = metrics
+            self.last_pods = pods
+            self.last_collected_at = time.time()
             logger.debug(f"Collected metrics: CPU={metrics['cpu_usage']:.1f}%, "
                         f"Memory={metrics['memory_usage']:.1f}%, "
                         f"Pods={metrics['pod_count']}")
@@ -67,15 +88,43 @@ class MonitorAgent:
             logger.error(f"Error collecting metrics: {e}")
             return self.last_metrics if self.last_metrics else {}
     
+    @staticmethod
+    def _pending_details(pod: Dict, now: float) -> Dict:
+        """How long a Pending pod has waited (from creationTimestamp) and why, if known"""
+        created_at = pod.get("created_at")
+        scheduled = (pod.get("conditions") or {}).get("PodScheduled") or {}
+        return {
+            "pending_seconds": round(now - created_at, 1) if created_at else None,
+            "pending_reason": scheduled.get("reason") if scheduled.get("status") == "False" else None
+        }
+    
+    @staticmethod
+    def _oom_active(pod: Dict, now: float) -> bool:
+        """
+        Whether a container's OOMKilled last termination still matters: it
+        happened within OOM_LOOKBACK, or that container is waiting / not ready
+        now. A pod that recovered long ago keeps the reason but is left alone.
+        Other containers' terminations (e.g. a sidecar's Error) do not hide it.
+        """
+        if pod.get("oom_container") is None:
+            return False
+        finished_at = pod.get("oom_finished_at")
+        if finished_at is not None and now - finished_at <= OOM_LOOKBACK:
+            return True
+        return bool(pod.get("oom_container_waiting")) or pod.get("oom_container_ready") is False
+    
     def _analyze_pod_status(self, pods: List[Dict]) -> Dict:
         """
         Analyze pod status and categorize
         """
+        now = time.time()
         status_counts = {
             "running": 0,
             "pending": 0,
             "failed": 0,
             "crashloopbackoff": 0,
+            "image_pull": 0,
+            "oom_killed": 0,
             "unknown": 0
         }
         
@@ -83,29 +132,54 @@ class MonitorAgent:
         
         for pod in pods:
             status = pod.get("status", "Unknown").lower()
+            # Phase stays Running/Pending in CrashLoopBackOff; the reason is on the container
+            waiting = (pod.get("waiting_reason") or "").lower()
             
-            if status == "running":
-                status_counts["running"] += 1
-            elif status == "pending":
-                status_counts["pending"] += 1
+            if self._oom_active(pod, now) and status != "failed":
+                # Restarting would only hit the limit again; reported for right-sizing
+                status_counts["oom_killed"] += 1
                 problematic_pods.append({
                     "name": pod["name"],
-                    "issue": "pending",
-                    "restarts": pod.get("restarts", 0)
+                    "issue": "oom_killed",
+                    "container": pod.get("oom_container"),
+                    "restarts": pod.get("restarts", 0),
+                    "deployment": pod.get("deployment")
                 })
-            elif "crash" in status.lower() or "backoff" in status.lower():
+            elif "crash" in status or "backoff" in status or waiting == "crashloopbackoff":
                 status_counts["crashloopbackoff"] += 1
                 problematic_pods.append({
                     "name": pod["name"],
                     "issue": "crashloop",
-                    "restarts": pod.get("restarts", 0)
+                    "restarts": pod.get("restarts", 0),
+                    "deployment": pod.get("deployment")
+                })
+            elif waiting in ("imagepullbackoff", "errimagepull", "invalidimagename"):
+                status_counts["image_pull"] += 1
+                problematic_pods.append({
+                    "name": pod["name"],
+                    "issue": "image_pull",
+                    "reason": pod.get("waiting_reason"),
+                    "restarts": pod.get("restarts", 0),
+                    "deployment": pod.get("deployment")
+                })
+            elif status == "running":
+                status_counts["running"] += 1
+            elif status == "pending":
+                status_counts["pending"] += 1
+                problematic_pods.append({
+                    "name": pod["name"],
+                    "issue": "pending",
+                    "restarts": pod.get("restarts", 0),
+                    "deployment": pod.get("deployment"),
+                    **self._pending_details(pod, now)
                 })
             elif status == "failed":
                 status_counts["failed"] += 1
                 problematic_pods.append({
                     "name": pod["name"],
                     "issue": "failed",
-                    "restarts": pod.get("restarts", 0)
+                    "restarts": pod.get("restarts", 0),
+                    "deployment": pod.get("deployment")
                 })
             else:
                 status_counts["unknown"] += 1
@@ -121,45 +195,52 @@ class MonitorAgent:
         """
         issues = []
         
-        # CPU Analysis
-        cpu_usage = metrics.get("cpu_usage", 0.0)
-        if cpu_usage > CPU_HIGH_THRESHOLD:
-            issues.append({
-                "type": "cpu_overload",
-                "severity": "high",
-                "value": cpu_usage,
-                "threshold": CPU_HIGH_THRESHOLD,
-                "message": f"CPU usage ({cpu_usage:.1f}%) exceeds threshold ({CPU_HIGH_THRESHOLD}%)",
-                "resource": self.namespace,
-                "timestamp": datetime.now().isoformat()
-            })
-        elif cpu_usage < CPU_LOW_THRESHOLD:
-            # Get deployment info to check if we can scale down
-            deployments = metrics.get("deployments", [])
-            for deployment in deployments:
-                if deployment.get("replicas", 0) > 2:  # Don't suggest scale down if already at minimum
-                    issues.append({
-                        "type": "cpu_underutilized",
-                        "severity": "low",
-                        "value": cpu_usage,
-                        "threshold": CPU_LOW_THRESHOLD,
-                        "message": f"CPU usage ({cpu_usage:.1f}%) below threshold ({CPU_LOW_THRESHOLD}%), possible cost savings",
-                        "resource": deployment["name"],
-                        "timestamp": datetime.now().isoformat()
-                    })
+        if SCALING_MODE == "proportional":
+            # Each deployment is judged against its own utilization target
+            issues.extend(self._analyze_utilization(metrics))
+        else:
+            # CPU Analysis
+            cpu_usage = metrics.get("cpu_usage", 0.0)
+            if cpu_usage > CPU_HIGH_THRESHOLD:
+                issues.append({
+                    "type": "cpu_overload",
+                    "severity": "high",
+                    "value": cpu_usage,
+                    "threshold": CPU_HIGH_THRESHOLD,
+                    "message": f"CPU usage ({cpu_usage:.1f}%) exceeds threshold ({CPU_HIGH_THRESHOLD}%)",
+                    "resource": self.namespace,
+                    "timestamp": datetime.now().isoformat()
+                })
+            elif cpu_usage < CPU_LOW_THRESHOLD:
+                # Get deployment info to check if we can scale down
+                deployments = metrics.get("deployments", [])
+                for deployment in deployments:
+                    if deployment.get("replicas", 0) > 2:  # Don't suggest scale down if already at minimum
+                        issues.append({
+                            "type": "cpu_underutilized",
+                            "severity": "low",
+                            "value": cpu_usage,
+                            "threshold": CPU_LOW_THRESHOLD,
+                            "message": f"CPU usage ({cpu_usage:.1f}%) below threshold ({CPU_LOW_THRESHOLD}%), possible cost savings",
+                            "resource": deployment["name"],
+                            "timestamp": datetime.now().isoformat()
+                        })
+            
+            # Memory Analysis
+            memory_usage = metrics.get("memory_usage", 0.0)
+            if memory_usage > MEMORY_HIGH_THRESHOLD:
+                issues.append({
+                    "type": "memory_pressure",
+                    "severity": "medium",
+                    "value": memory_usage,
+                    "threshold": MEMORY_HIGH_THRESHOLD,
+                    "message": f"Memory usage ({memory_usage:.1f}%) exceeds threshold ({MEMORY_HIGH_THRESHOLD}%)",
+                    "resource": self.namespace,
+                    "timestamp": datetime.now().isoformat()
+                })
         
-        # Memory Analysis
-        memory_usage = metrics.get("memory_usage", 0.0)
-        if memory_usage > MEMORY_HIGH_THRESHOLD:
-            issues.append({
-                "type": "memory_pressure",
-                "severity": "medium",
-                "value": memory_usage,
-                "threshold": MEMORY_HIGH_THRESHOLD,
-                "message": f"Memory usage ({memory_usage:.1f}%) exceeds threshold ({MEMORY_HIGH_THRESHOLD}%)",
-                "resource": self.namespace,
-                "timestamp": datetime.now().isoformat()
-            })
+        # Scheduled replica floors/ceilings
+        issues.extend(self._analyze_schedule(metrics))
         
         # Pod Status Analysis
         pod_status = metrics.get("pod_status", {})
@@ -175,15 +256,26 @@ class MonitorAgent:
                     "value": pod_info["restarts"],
                     "message": f"Pod {pod_info['name']} is in CrashLoopBackOff state",
                     "resource": pod_info["name"],
+                    "deployment": pod_info.get("deployment"),
                     "timestamp": datetime.now().isoformat()
                 })
             
             elif issue_type == "pending":
+                # Recently created pods are usually still scheduling or pulling images
+                # (records without an age, e.g. from old traces, are always reported)
+                pending_seconds = pod_info.get("pending_seconds")
+                if pending_seconds is not None and pending_seconds < PENDING_AGE_THRESHOLD:
+                    continue
+                reason = f" ({pod_info['pending_reason']})" if pod_info.get("pending_reason") else ""
+                duration = f" for {pending_seconds / 60:.0f}m" if pending_seconds is not None else ""
                 issues.append({
                     "type": "pod_pending",
                     "severity": "medium",
-                    "message": f"Pod {pod_info['name']} stuck in Pending state",
+                    "value": pending_seconds,
+                    "threshold": PENDING_AGE_THRESHOLD,
+                    "message": f"Pod {pod_info['name']} stuck in Pending state{duration}{reason}",
                     "resource": pod_info["name"],
+                    "deployment": pod_info.get("deployment"),
                     "timestamp": datetime.now().isoformat()
                 })
             
@@ -193,9 +285,39 @@ class MonitorAgent:
                     "severity": "high",
                     "message": f"Pod {pod_info['name']} has failed",
                     "resource": pod_info["name"],
+                    "deployment": pod_info.get("deployment"),
+                    "timestamp": datetime.now().isoformat()
+                })
+            
+            elif issue_type == "oom_killed":
+                issues.append({
+                    "type": "pod_oom_killed",
+                    "severity": "high",
+                    "value": pod_info["restarts"],
+                    "message": f"Container {pod_info.get('container')} of pod {pod_info['name']} was OOMKilled",
+                    "resource": pod_info["name"],
+                    "container": pod_info.get("container"),
+                    "deployment": pod_info.get("deployment"),
+                    "timestamp": datetime.now().isoformat()
+                })
+            
+            elif issue_type == "image_pull":
+                issues.append({
+                    "type": "pod_image_pull",
+                    "severity": "high",
+                    "message": f"Pod {pod_info['name']} cannot pull its image ({pod_info.get('reason')})",
+                    "resource": pod_info["name"],
+                    "deployment": pod_info.get("deployment"),
                     "timestamp": datetime.now().isoformat()
                 })
         
+        # Issues from the Events watch, unless polling already reported the same one
+        reported = {(i["type"], i.get("resource")) for i in issues}
+        for issue in metrics.get("event_issues", []):
+            if (issue["type"], issue.get("resource")) not in reported:
+                reported.add((issue["type"], issue.get("resource")))
+                issues.append(issue)
+        
         # High restart count analysis
         restart_count = metrics.get("container_restarts", 0)
         if restart_count > 10:
@@ -215,6 +337,101 @@ class MonitorAgent:
         
         return issues
     
+    def _analyze_utilization(self, metrics: Dict) -> List[Dict]:
+        """
+        Proportional mode: flag deployments whose CPU or memory utilization is
+        outside the target's tolerance band (the scaler sizes the correction)
+        """
+        issues = []
+        utilization = metrics.get("deployment_utilization", {})
+        
+        for deployment in metrics.get("deployments", []):
+            name = deployment["name"]
+            usage = utilization.get(name)
+            if not usage:
+                continue
+            
+            cpu = usage.get("cpu")
+            if cpu is not None and cpu > CPU_TARGET_UTILIZATION * (1 + SCALING_TOLERANCE):
+                issues.append({
+                    "type": "cpu_overload",
+                    "severity": "high",
+                    "value": cpu,
+                    "threshold": CPU_TARGET_UTILIZATION,
+                    "message": f"{name} CPU utilization ({cpu:.1f}%) above target ({CPU_TARGET_UTILIZATION}%)",
+                    "resource": name,
+                    "timestamp": datetime.now().isoformat()
+                })
+            elif (cpu is not None and cpu < CPU_TARGET_UTILIZATION * (1 - SCALING_TOLERANCE)
+                    and deployment.get("replicas", 0) > MIN_REPLICAS):
+                issues.append({
+                    "type": "cpu_underutilized",
+                    "severity": "low",
+                    "value": cpu,
+                    "threshold": CPU_TARGET_UTILIZATION,
+                    "message": f"{name} CPU utilization ({cpu:.1f}%) below target ({CPU_TARGET_UTILIZATION}%), possible cost savings",
+                    "resource": name,
+                    "timestamp": datetime.now().isoformat()
+                })
+            
+            memory = usage.get("memory")
+            if memory is not None and memory > MEMORY_TARGET_UTILIZATION * (1 + SCALING_TOLERANCE):
+                issues.append({
+                    "type": "memory_pressure",
+                    "severity": "medium",
+                    "value": memory,
+                    "threshold": MEMORY_TARGET_UTILIZATION,
+                    "message": f"{name} memory utilization ({memory:.1f}%) above target ({MEMORY_TARGET_UTILIZATION}%)",
+                    "resource": name,
+                    "timestamp": datetime.now().isoformat()
+                })
+        
+        return issues
+    
+    def _analyze_schedule(self, metrics: Dict) -> List[Dict]:
+        """
+        Flag deployments outside a scheduled floor or ceiling (evaluated at
+        the metrics' collection time so replays see the same schedule)
+        """
+        issues = []
+        if not scale_schedule.entries:
+            return issues
+        
+        try:
+            moment = datetime.fromisoformat(metrics["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            moment = datetime.now()
+        
+        for deployment in metrics.get("deployments", []):
+            name = deployment["name"]
+            replicas = deployment.get("replicas", 0)
+            floor, ceiling = scale_schedule.bounds(self.namespace, name, moment)
+            if floor is not None:
+                floor = min(floor, MAX_REPLICAS)  # the scaler never goes above the global ceiling
+            
+            if floor is not None and replicas < floor:
+                issues.append({
+                    "type": "below_scheduled_floor",
+                    "severity": "medium",
+                    "value": replicas,
+                    "threshold": floor,
+                    "message": f"{name} has {replicas} replicas, scheduled floor is {floor}",
+                    "resource": name,
+                    "timestamp": datetime.now().isoformat()
+                })
+            elif ceiling is not None and replicas > max(ceiling, MIN_REPLICAS):
+                issues.append({
+                    "type": "above_scheduled_ceiling",
+                    "severity": "low",
+                    "value": replicas,
+                    "threshold": ceiling,
+                    "message": f"{name} has {replicas} replicas, scheduled ceiling is {ceiling}",
+                    "resource": name,
+                    "timestamp": datetime.now().isoformat()
+                })
+        
+        return issues
+    
     def get_health_summary(self) -> Dict:
         """
         Get overall health summary
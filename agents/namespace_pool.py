@@ -0,0 +1,238 @@
+"""
+Namespace Pool - Runs decision cycles for many namespaces in one process
+Each namespace gets its own DecisionEngine (and agents), cycles run on a worker pool
+"""
+import sys
+import time
+import signal
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.decision_engine import DecisionEngine
+from agents.sharding import ShardCoordinator
+from tools.k8s_client import k8s_client
+from mcp_server.config import (
+    DECISION_LOOP_INTERVAL,
+    K8S_NAMESPACES,
+    K8S_NAMESPACE_SELECTOR,
+    ENGINE_WORKERS,
+    EVENT_WATCH_ENABLED
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NamespacePool:
+    """
+    Manages a set of namespaces (explicit list or label-selected) and
+    schedules one decision cycle per namespace per interval on a thread pool.
+    A slow namespace never delays the others: each namespace is scheduled
+    independently and is never run twice concurrently.
+    """
+    
+    def __init__(
+        self,
+        namespaces: Optional[List[str]] = None,
+        label_selector: str = K8S_NAMESPACE_SELECTOR,
+        interval: int = DECISION_LOOP_INTERVAL,
+        workers: int = ENGINE_WORKERS,
+        shard: Optional[ShardCoordinator] = None
+    ):
+        self.static_namespaces = list(namespaces if namespaces is not None else K8S_NAMESPACES)
+        self.label_selector = label_selector
+        self.interval = interval
+        self.workers = max(1, workers)
+        self.running = False
+        # When set, only the namespaces this replica owns are managed
+        self.shard = shard
+        self.candidates: List[str] = []
+        
+        self.engines: Dict[str, DecisionEngine] = {}
+        # Namespaces assigned at the last reconcile (engines may outlive it while in flight)
+        self._assigned: Set[str] = set()
+        self._next_due: Dict[str, float] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._last_refresh = 0.0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        logger.info(f"Namespace pool initialized (interval: {interval}s, workers: {self.workers}, "
+                    f"namespaces: {self.static_namespaces or '-'}, selector: {label_selector or '-'})")
+    
+    def resolve_namespaces(self) -> List[str]:
+        """
+        Current namespace set: the explicit list plus any label-selected namespaces
+        """
+        namespaces = list(self.static_namespaces)
+        if self.label_selector:
+            for ns in k8s_client.get_namespaces(self.label_selector):
+                if ns not in namespaces:
+                    namespaces.append(ns)
+        return namespaces
+    
+    def refresh(self) -> List[str]:
+        """
+        Re-resolve the candidate namespaces and reconcile engines with them
+        """
+        self.candidates = self.resolve_namespaces()
+        self._last_refresh = time.monotonic()
+        return self._reconcile()
+    
+    def _reconcile(self) -> List[str]:
+        """
+        Create engines for assigned namespaces and drop the rest
+        """
+        namespaces = self.shard.assign(self.candidates) if self.shard else list(self.candidates)
+        wanted = set(namespaces)
+        
+        with self._lock:
+            self._assigned = wanted
+            for ns in namespaces:
+                if ns not in self.engines:
+                    self.engines[ns] = DecisionEngine(namespace=ns, interval=self.interval)
+                    self._next_due[ns] = time.monotonic()
+                    if EVENT_WATCH_ENABLED and self.running:
+                        self.engines[ns].watch_events(lambda ns=ns: self._due_now(ns))
+                    logger.info(f"[POOL] Managing namespace {ns}")
+            
+            for ns in list(self.engines):
+                if ns not in wanted and ns not in self._in_flight:
+                    self._release(ns)
+        
+        return namespaces
+    
+    def _owns(self, namespace: str) -> bool:
+        """Whether namespace is still ours (checked again before every submit)"""
+        if namespace not in self._assigned:
+            return False
+        return self.shard.owns(namespace) if self.shard else True
+    
+    def _release(self, namespace: str):
+        """Drop a namespace's engine (caller holds the lock)"""
+        self.engines.pop(namespace).stop_events()
+        self._next_due.pop(namespace, None)
+        logger.info(f"[POOL] Released namespace {namespace}")
+    
+    def _due_now(self, namespace: str):
+        """Run namespace on the next tick (an urgent event arrived)"""
+        with self._lock:
+            if namespace in self._next_due:
+                self._next_due[namespace] = 0.0
+    
+    def tick(self) -> int:
+        """
+        Submit every due, idle namespace to the worker pool; returns how many were submitted
+        """
+        now = time.monotonic()
+        submitted = 0
+        
+        with self._lock:
+            for ns, future in list(self._in_flight.items()):
+                if future.done():
+                    del self._in_flight[ns]
+            
+            for ns, engine in list(self.engines.items()):
+                if ns in self._in_flight:
+                    continue
+                if not self._owns(ns):
+                    # Released while its cycle was in flight: drop it now, not at the next reconcile
+                    self._release(ns)
+                    continue
+                if now < self._next_due.get(ns, 0.0):
+                    continue
+                self._next_due[ns] = now + self.interval
+                self._in_flight[ns] = self._executor.submit(self._run_namespace, engine)
+                submitted += 1
+        
+        return submitted
+    
+    def _run_namespace(self, engine: DecisionEngine):
+        """Run one cycle for one namespace (worker thread)"""
+        engine.cycle_count += 1
+        logger.info(f"[POOL] CYCLE #{engine.cycle_count} for namespace {engine.namespace}")
+        engine.run_cycle()
+    
+    def start(self):
+        """
+        Start the pool loop
+        """
+        self.running = True
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine")
+        
+        logger.info("=" * 70)
+        logger.info("SENTINELOPS DECISION ENGINE STARTED (multi-namespace)")
+        logger.info("=" * 70)
+        
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        
+        try:
+            while self.running:
+                membership_changed = self.shard.heartbeat() if self.shard else False
+                if time.monotonic() - self._last_refresh >= self.interval:
+                    self.refresh()
+                elif membership_changed:
+                    # A replica joined or its lease expired: take over / hand off now
+                    self._reconcile()
+                self.tick()
+                # Short tick so newly due namespaces start promptly
+                self._stop.wait(1.0)
+        except Exception as e:
+            logger.error(f"Fatal error in namespace pool: {e}", exc_info=True)
+        finally:
+            for engine in list(self.engines.values()):
+                engine.stop_events()
+            self._executor.shutdown(wait=True)
+            if self.shard:
+                self.shard.release()
+            self.running = False
+            logger.info("SENTINELOPS DECISION ENGINE STOPPED (multi-namespace)")
+    
+    def stop(self):
+        """Stop scheduling new cycles; in-flight cycles finish"""
+        self.running = False
+        self._stop.set()
+    
+    def _signal_handler(self, signum, frame):
+        """Handle shutdown signals"""
+        logger.info("\n\nShutdown signal received...")
+        self.stop()
+    
+    def get_status(self) -> Dict:
+        """
+        Pool status with per-namespace cycle counters and latency
+        """
+        with self._lock:
+            engines = dict(self.engines)
+            in_flight = {ns for ns, future in self._in_flight.items() if not future.done()}
+        
+        namespaces = {}
+        for ns, engine in engines.items():
+            status = engine.get_status()
+            namespaces[ns] = {
+                "cycle_count": status["cycle_count"],
+                "in_flight": ns in in_flight,
+                "cycles": status["cycles"],
+                "cycle_latency_ms": status["cycle_latency_ms"],
+                "last_cycle": status["last_cycle"]
+            }
+        
+        return {
+            "running": self.running,
+            "mode": "multi_namespace",
+            "interval": self.interval,
+            "workers": self.workers,
+            "label_selector": self.label_selector,
+            "namespace_count": len(namespaces),
+            "namespaces": namespaces,
+            "sharding": self.shard.get_status() if self.shard else None,
+            "timestamp": datetime.now().isoformat()
+        }
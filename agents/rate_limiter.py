@@ -0,0 +1,151 @@
+"""
+Rate Limiter - Token buckets for remediation writes
+Caps pod deletions, restarts and scale calls globally, per namespace and per deployment
+"""
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import metrics_registry
+from mcp_server.config import (
+    REMEDIATION_RATE_GLOBAL,
+    REMEDIATION_BURST_GLOBAL,
+    REMEDIATION_RATE_NAMESPACE,
+    REMEDIATION_BURST_NAMESPACE,
+    REMEDIATION_RATE_DEPLOYMENT,
+    REMEDIATION_BURST_DEPLOYMENT
+)
+
+logger = logging.getLogger(__name__)
+
+rate_limited_total = metrics_registry.counter(
+    "sentinelops_remediation_rate_limited_total",
+    "Remediation writes dropped because a token bucket was empty",
+    ["scope", "action"]
+)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` stored
+    """
+    
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+    
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+    
+    def refill(self, now: float) -> float:
+        """Add tokens for the time elapsed since the last refill"""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        return self.tokens
+
+
+class RemediationRateLimiter:
+    """
+    Three tiers of token buckets (global, per namespace, per deployment).
+    A write goes through only if every tier has a token; tokens are then
+    taken from all tiers at once, so a rejected write costs nothing.
+    Rates are configured per minute.
+    """
+    
+    def __init__(
+        self,
+        global_rate: float = REMEDIATION_RATE_GLOBAL,
+        global_burst: int = REMEDIATION_BURST_GLOBAL,
+        namespace_rate: float = REMEDIATION_RATE_NAMESPACE,
+        namespace_burst: int = REMEDIATION_BURST_NAMESPACE,
+        deployment_rate: float = REMEDIATION_RATE_DEPLOYMENT,
+        deployment_burst: int = REMEDIATION_BURST_DEPLOYMENT,
+        clock: Callable[[], float] = time.monotonic,
+        max_buckets: int = 4096
+    ):
+        self.clock = clock
+        self.limits = {
+            "global": (global_rate / 60.0, global_burst),
+            "namespace": (namespace_rate / 60.0, namespace_burst),
+            "deployment": (deployment_rate / 60.0, deployment_burst)
+        }
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, scope: str, key: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get((scope, key))
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune(now)
+            rate, burst = self.limits[scope]
+            bucket = TokenBucket(rate, burst, now)
+            self._buckets[(scope, key)] = bucket
+        return bucket
+    
+    def _prune(self, now: float):
+        """Forget buckets that have refilled completely (they carry no state)"""
+        for key, bucket in list(self._buckets.items()):
+            if bucket.refill(now) >= bucket.capacity:
+                del self._buckets[key]
+    
+    def try_acquire(self, namespace: str, deployment: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Take one token from every applicable bucket.
+        Returns (allowed, scope of the first empty bucket)
+        """
+        now = self.clock()
+        scopes = [("global", ""), ("namespace", namespace)]
+        if deployment:
+            scopes.append(("deployment", f"{namespace}/{deployment}"))
+        
+        with self._lock:
+            buckets = [(scope, self._bucket(scope, key, now)) for scope, key in scopes]
+            for scope, bucket in buckets:
+                if bucket.refill(now) < 1.0:
+                    return False, scope
+            for _, bucket in buckets:
+                bucket.tokens -= 1.0
+        return True, None
+    
+    def check(self, action: str, namespace: str, deployment: Optional[str] = None) -> Optional[Dict]:
+        """
+        Gate a remediation write. Returns None when allowed, otherwise the
+        result dict to hand back instead of acting (the write is dropped;
+        the next cycle re-detects the issue if it persists)
+        """
+        allowed, scope = self.try_acquire(namespace, deployment)
+        if allowed:
+            return None
+        
+        target = f"{namespace}/{deployment}" if deployment else namespace
+        logger.warning(f"[RATE LIMIT] Dropped {action} for {target}: {scope} token bucket empty")
+        rate_limited_total.inc(scope=scope, action=action)
+        return {
+            "success": False,
+            "reason": "rate_limited",
+            "limit": scope,
+            "action": action,
+            "target": target
+        }
+    
+    def get_status(self) -> Dict:
+        """Configured limits (per minute) and tracked bucket count"""
+        return {
+            "limits_per_minute": {
+                scope: {"rate": round(rate * 60, 2), "burst": burst}
+                for scope, (rate, burst) in self.limits.items()
+            },
+            "tracked_buckets": len(self._buckets)
+        }
+
+
+# Create singleton instance (shared by every namespace's agents)
+remediation_limiter = RemediationRateLimiter()
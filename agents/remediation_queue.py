@@ -0,0 +1,121 @@
+"""
+Remediation Queue - Orders planned actions by severity and age
+High-severity work runs first; actions that miss their deadline expire
+and actions left over from an earlier cycle are superseded
+"""
+import sys
+import heapq
+import time
+import itertools
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import metrics_registry
+from mcp_server.config import (
+    ACTION_DEADLINE_HIGH,
+    ACTION_DEADLINE_MEDIUM,
+    ACTION_DEADLINE_LOW
+)
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first; unknown severities sort with "low"
+SEVERITY_PRIORITY = {"high": 0, "medium": 1, "low": 2}
+
+# Seconds an action may wait (from detection) before it is no longer worth starting
+SEVERITY_DEADLINE = {
+    "high": ACTION_DEADLINE_HIGH,
+    "medium": ACTION_DEADLINE_MEDIUM,
+    "low": ACTION_DEADLINE_LOW
+}
+
+dropped_total = metrics_registry.counter(
+    "sentinelops_remediation_dropped_total",
+    "Planned remediation actions that never started",
+    ["reason", "action"]
+)
+
+
+class RemediationQueue:
+    """
+    Min-heap of planned actions keyed by (priority, detected_at, seq).
+    Each action carries "severity", "priority", "detected_at" and "deadline"
+    (epoch seconds), set by `stamp`.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.superseded = 0
+    
+    def stamp(self, action: Dict, severity: str, detected_at: Optional[float] = None) -> Dict:
+        """Attach priority and deadline fields to an action"""
+        detected_at = self.clock() if detected_at is None else detected_at
+        action["severity"] = severity
+        action["priority"] = SEVERITY_PRIORITY.get(severity, SEVERITY_PRIORITY["low"])
+        action["detected_at"] = round(detected_at, 3)
+        action["deadline"] = round(detected_at + SEVERITY_DEADLINE.get(severity, ACTION_DEADLINE_LOW), 3)
+        return action
+    
+    def push(self, action: Dict, cycle: int):
+        """Queue one stamped action planned in `cycle`"""
+        if "priority" not in action:
+            self.stamp(action, "low")
+        with self._lock:
+            heapq.heappush(
+                self._heap,
+                (action["priority"], action["detected_at"], next(self._seq), cycle, action)
+            )
+    
+    def supersede(self, cycle: int) -> List[Dict]:
+        """
+        Drop actions planned before `cycle`; the new cycle re-detected
+        whatever still needs doing, so the stale plan is discarded
+        """
+        with self._lock:
+            stale = [entry[4] for entry in self._heap if entry[3] < cycle]
+            if not stale:
+                return []
+            self._heap = [entry for entry in self._heap if entry[3] >= cycle]
+            heapq.heapify(self._heap)
+        
+        self.superseded += len(stale)
+        for action in stale:
+            dropped_total.inc(reason="superseded", action=action.get("type", "unknown"))
+        logger.info(f"   [QUEUE] Superseded {len(stale)} action(s) still pending from an earlier cycle")
+        return stale
+    
+    def pop(self) -> Optional[Dict]:
+        """Highest-priority action, or None when empty"""
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[4]
+    
+    def is_expired(self, action: Dict, now: Optional[float] = None) -> bool:
+        """Whether the action missed its deadline (counted as a drop)"""
+        now = self.clock() if now is None else now
+        if now <= action.get("deadline", float("inf")):
+            return False
+        self.expired += 1
+        dropped_total.inc(reason="expired", action=action.get("type", "unknown"))
+        return True
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def get_status(self) -> Dict:
+        """Queue depth and drop counters"""
+        return {
+            "pending": len(self._heap),
+            "expired": self.expired,
+            "superseded": self.superseded,
+            "deadlines_seconds": dict(SEVERITY_DEADLINE)
+        }
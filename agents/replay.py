@@ -0,0 +1,255 @@
+"""
+Record & Replay - Captures decision cycle inputs and replays them offline
+Used to benchmark and regression-test decision policy changes without a cluster
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.k8s_client import K8sClient
+
+logger = logging.getLogger(__name__)
+
+# Action fields that identify a decision; free-text and timing fields are ignored when diffing
+DECISION_KEYS = ("type", "deployment", "pod", "pods", "delta", "replicas")
+
+
+class TraceRecorder:
+    """
+    Appends one compact JSON line per cycle:
+    {"ts": epoch, "ns": namespace, "metrics": {...}, "pods": [...], "actions": [...]}
+    Deployments travel inside metrics["deployments"], as collected by MonitorAgent.
+    """
+    
+    _shared: Dict[str, "TraceRecorder"] = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls, path: str) -> "TraceRecorder":
+        """One recorder per file so engines of several namespaces share its lock"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+    
+    def record(self, namespace: str, metrics: Dict, pods: List[Dict], actions: List[Dict]):
+        """Append one cycle to the trace"""
+        line = json.dumps(
+            {
+                "ts": round(time.time(), 3),
+                "ns": namespace,
+                "metrics": metrics,
+                "pods": pods,
+                "actions": [{k: v for k, v in action.items() if k not in ("issue", "issues")} for action in actions]
+            },
+            separators=(",", ":"),
+            default=str
+        )
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+def load_trace(path: str) -> List[Dict]:
+    """Read a trace (or a saved decision baseline) into memory"""
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+class ReplayK8sClient(K8sClient):
+    """
+    K8sClient that answers reads from the cycle being replayed and turns
+    every write into a no-op, so replay never touches kubectl
+    """
+    
+    def __init__(self, namespace: str = "demo"):
+        super().__init__(namespace)
+        self.pods: List[Dict] = []
+        self.deployments: List[Dict] = []
+        # Previous-container logs per pod, when the trace carries them
+        self.logs: Dict[str, str] = {}
+        self._replicas: Dict[str, int] = {}
+    
+    def load(self, record: Dict):
+        """Point the stub at one recorded cycle"""
+        self.pods = record.get("pods") or []
+        self.deployments = record.get("metrics", {}).get("deployments") or []
+        self._replicas = {d["name"]: d.get("replicas", 0) for d in self.deployments}
+        self.logs = record.get("logs") or {}
+    
+    def _run_command(self, cmd: List[str], input: Optional[str] = None, timeout: float = 5) -> Dict:
+        # timeout is accepted for signature compatibility; nothing runs
+        if cmd[:2] == ["kubectl", "logs"]:
+            return {"success": True, "output": self.logs.get(cmd[2], ""), "error": None}
+        return {"success": True, "output": "{}", "error": None}
+    
+    def get_pods(self, namespace: Optional[str] = None) -> List[Dict]:
+        return self.pods
+    
+    def get_deployments(self, namespace: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        return self.deployments
+    
+    def get_deployment_replicas(self, deployment: str, namespace: Optional[str] = None) -> int:
+        return self._replicas.get(deployment, 0)
+    
+    def get_deployment(self, deployment: str, namespace: Optional[str] = None) -> Optional[Dict]:
+        return next((d for d in self.deployments if d["name"] == deployment), None)
+    
+    def scale_deployment(self, deployment: str, replicas: int, namespace: Optional[str] = None) -> bool:
+        return True
+    
+    def delete_pod(self, pod_name: str, namespace: Optional[str] = None) -> bool:
+        return True
+    
+    def restart_deployment(self, deployment: str, namespace: Optional[str] = None) -> bool:
+        return True
+
+
+def decision_signature(actions: List[Dict]) -> List[Tuple]:
+    """Comparable form of a cycle's decisions"""
+    return [
+        tuple((key, json.dumps(action.get(key), sort_keys=True)) for key in DECISION_KEYS if key in action)
+        for action in actions
+    ]
+
+
+class ReplayRunner:
+    """
+    Feeds recorded cycles through MonitorAgent.analyze_metrics and
+    DecisionEngine.decide_actions as fast as possible
+    """
+    
+    def __init__(self, records: List[Dict]):
+        self.records = records
+        self._engines = {}
+        self._clients = {}
+    
+    @classmethod
+    def from_file(cls, path: str) -> "ReplayRunner":
+        return cls(load_trace(path))
+    
+    def _engine_for(self, namespace: str):
+        """One stubbed engine per namespace, as in production"""
+        if namespace not in self._engines:
+            from agents.decision_engine import DecisionEngine
+            client = ReplayK8sClient(namespace)
+            self._clients[namespace] = client
+            engine = DecisionEngine(namespace=namespace, k8s=client)
+            engine.recorder = None  # never re-record while replaying
+            self._engines[namespace] = engine
+        return self._engines[namespace], self._clients[namespace]
+    
+    def run(self, limit: Optional[int] = None) -> Dict:
+        """
+        Replay the trace; returns throughput figures and the decisions per cycle
+        """
+        records = self.records[:limit] if limit else self.records
+        decisions = []
+        total_actions = 0
+        
+        start = time.perf_counter()
+        for record in records:
+            engine, client = self._engine_for(record.get("ns", "demo"))
+            client.load(record)
+            metrics = record.get("metrics", {})
+            issues = engine.monitor.analyze_metrics(metrics)
+            actions = engine.decide_actions(issues, metrics) if issues else []
+            total_actions += len(actions)
+            decisions.append(actions)
+        elapsed = time.perf_counter() - start
+        
+        return {
+            "cycles": len(records),
+            "decisions": total_actions,
+            "elapsed_s": round(elapsed, 4),
+            "cycles_per_sec": round(len(records) / elapsed, 1) if elapsed > 0 else 0.0,
+            "decisions_per_sec": round(total_actions / elapsed, 1) if elapsed > 0 else 0.0,
+            "actions": decisions
+        }
+    
+    @staticmethod
+    def diff(baseline: List[List[Dict]], replayed: List[List[Dict]]) -> List[Dict]:
+        """
+        Cycles whose decisions differ from the baseline
+        """
+        diffs = []
+        for index in range(max(len(baseline), len(replayed))):
+            expected = baseline[index] if index < len(baseline) else []
+            actual = replayed[index] if index < len(replayed) else []
+            if decision_signature(expected) != decision_signature(actual):
+                diffs.append({
+                    "cycle": index,
+                    "expected": [{k: a[k] for k in DECISION_KEYS if k in a} for a in expected],
+                    "actual": [{k: a[k] for k in DECISION_KEYS if k in a} for a in actual]
+                })
+        return diffs
+
+
+def main():
+    """
+    python -m agents.replay TRACE [--baseline FILE] [--save FILE] [--limit N]
+    Without --baseline, the decisions recorded in the trace are the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Replay a SentinelOps decision trace")
+    parser.add_argument("trace", help="trace file written by DECISION_TRACE_FILE")
+    parser.add_argument("--baseline", help="decisions saved by a previous --save run")
+    parser.add_argument("--save", help="write replayed decisions here (one JSON list per line)")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N cycles")
+    args = parser.parse_args()
+    
+    # Per-cycle agent logging would dominate the measurement
+    logging.disable(logging.WARNING)
+    
+    runner = ReplayRunner.from_file(args.trace)
+    report = runner.run(limit=args.limit)
+    
+    if args.baseline:
+        baseline = load_trace(args.baseline)
+    else:
+        baseline = [record.get("actions", []) for record in runner.records[:report["cycles"]]]
+    diffs = ReplayRunner.diff(baseline, report["actions"])
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            for actions in report["actions"]:
+                f.write(json.dumps(actions, separators=(",", ":"), default=str) + "\n")
+    
+    print("=" * 60)
+    print("SentinelOps Decision Replay")
+    print("=" * 60)
+    print(f"Cycles replayed:   {report['cycles']}")
+    print(f"Decisions:         {report['decisions']}")
+    print(f"Elapsed:           {report['elapsed_s']}s")
+    print(f"Cycles/sec:        {report['cycles_per_sec']}")
+    print(f"Decisions/sec:     {report['decisions_per_sec']}")
+    print(f"Changed decisions: {len(diffs)} cycle(s)")
+    for d in diffs[:20]:
+        print(f"  - cycle {d['cycle']}: expected {d['expected']} got {d['actual']}")
+    print("=" * 60)
+    
+    sys.exit(1 if diffs else 0)
+
+
+if __name__ == "__main__":
+    main()
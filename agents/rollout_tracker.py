@@ -0,0 +1,196 @@
+"""
+Rollout Tracker - Follows scale operations until the new capacity is Ready
+Records time to capacity on the incident and keeps a per-deployment startup estimate
+"""
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.k8s_client import K8sClient, k8s_client
+from tools.telemetry import metrics_registry
+from agents.incident_tracker import incident_tracker
+from mcp_server.config import ROLLOUT_POLL_INTERVAL, ROLLOUT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the startup latency estimate
+STARTUP_EWMA_ALPHA = 0.3
+
+time_to_capacity_seconds = metrics_registry.histogram(
+    "sentinelops_time_to_capacity_seconds",
+    "Seconds from a scale command until readyReplicas reached the target",
+    ["direction", "outcome"]
+)
+
+
+class RolloutTracker:
+    """
+    Watches readyReplicas of recently scaled deployments from one daemon
+    thread, so the decision loop never waits for pods to start. When a
+    rollout converges (or times out) the incident's duration_ms and
+    new_state are updated.
+    """
+    
+    def __init__(self, poll_interval: float = ROLLOUT_POLL_INTERVAL, timeout: int = ROLLOUT_TIMEOUT):
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.tracker = incident_tracker
+        self._watches: Dict[tuple, Dict] = {}
+        self._estimates: Dict[str, float] = {}  # "namespace/deployment" -> EWMA seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def track(
+        self,
+        namespace: str,
+        deployment: str,
+        target: int,
+        previous: int,
+        incident_id: Optional[str] = None,
+        k8s: Optional[K8sClient] = None
+    ):
+        """
+        Start following a scale of deployment from `previous` to `target`
+        replicas; a newer scale of the same deployment replaces the old watch
+        """
+        watch = {
+            "namespace": namespace,
+            "deployment": deployment,
+            "target": target,
+            "previous": previous,
+            "direction": "up" if target > previous else "down",
+            "incident_id": incident_id,
+            "k8s": k8s or k8s_client,
+            "started": time.monotonic(),
+            "started_at": datetime.now().isoformat(),
+            "ready": None
+        }
+        with self._lock:
+            replaced = self._watches.get((namespace, deployment))
+            self._watches[(namespace, deployment)] = watch
+            self._ensure_thread()
+        
+        if replaced:
+            self._finish(replaced, "superseded", replaced["ready"])
+        logger.info(f"[ROLLOUT] Tracking {namespace}/{deployment}: {previous} → {target} replicas")
+        self._wake.set()
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sentinelops-rollouts", daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """Poll every active watch, then sleep; exits when nothing is left"""
+        while True:
+            with self._lock:
+                watches = list(self._watches.values())
+                if not watches:
+                    self._thread = None
+                    return
+            
+            self._wake.clear()
+            for watch in watches:
+                try:
+                    self.poll(watch)
+                except Exception as e:
+                    logger.error(f"Error polling rollout of {watch['deployment']}: {e}")
+            
+            self._wake.wait(self.poll_interval)
+    
+    def poll(self, watch: Dict):
+        """Check one watch and finish it if it converged or timed out"""
+        status = watch["k8s"].get_deployment(watch["deployment"], watch["namespace"])
+        if status is not None:
+            watch["ready"] = status.get("ready_replicas", 0)
+            if self._converged(watch, status):
+                self._finish(watch, "ready", watch["ready"])
+                return
+        
+        if time.monotonic() - watch["started"] > self.timeout:
+            self._finish(watch, "timed_out", watch["ready"])
+    
+    @staticmethod
+    def _converged(watch: Dict, status: Dict) -> bool:
+        if status.get("replicas") != watch["target"]:
+            return False  # someone scaled it again; keep waiting until timeout or replaced
+        if watch["direction"] == "up":
+            return status.get("ready_replicas", 0) >= watch["target"]
+        return status.get("ready_replicas", 0) <= watch["target"]
+    
+    def _finish(self, watch: Dict, outcome: str, ready: Optional[int]):
+        """Drop the watch and record its outcome"""
+        key = (watch["namespace"], watch["deployment"])
+        with self._lock:
+            if self._watches.get(key) is watch:
+                del self._watches[key]
+        
+        elapsed = time.monotonic() - watch["started"]
+        time_to_capacity_seconds.observe(elapsed, direction=watch["direction"], outcome=outcome)
+        
+        if outcome == "ready" and watch["direction"] == "up":
+            self._update_estimate(f"{watch['namespace']}/{watch['deployment']}", elapsed)
+        
+        log = logger.info if outcome == "ready" else logger.warning
+        log(f"[ROLLOUT] {watch['namespace']}/{watch['deployment']} {outcome} after {elapsed:.1f}s "
+            f"(ready {ready}/{watch['target']})")
+        
+        if watch["incident_id"] and outcome != "superseded":
+            self.tracker.update_incident(watch["incident_id"], {
+                "success": outcome == "ready",
+                "message": f"{outcome}: {ready}/{watch['target']} replicas ready after {elapsed:.1f}s",
+                "duration_ms": round(elapsed * 1000, 1),
+                "new_state": {
+                    "replicas": watch["target"],
+                    "ready_replicas": ready,
+                    "previous_replicas": watch["previous"],
+                    "rollout": outcome
+                }
+            })
+    
+    def _update_estimate(self, key: str, seconds: float):
+        with self._lock:
+            previous = self._estimates.get(key)
+            if previous is None:
+                self._estimates[key] = seconds
+            else:
+                self._estimates[key] = STARTUP_EWMA_ALPHA * seconds + (1 - STARTUP_EWMA_ALPHA) * previous
+    
+    def startup_estimate(self, namespace: str, deployment: str) -> Optional[float]:
+        """Smoothed seconds for a scale-up of deployment to become Ready (None if never observed)"""
+        return self._estimates.get(f"{namespace}/{deployment}")
+    
+    def active(self) -> List[Dict]:
+        """Rollouts still being watched"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "namespace": w["namespace"],
+                    "deployment": w["deployment"],
+                    "target": w["target"],
+                    "ready": w["ready"],
+                    "elapsed_s": round(now - w["started"], 1)
+                }
+                for w in self._watches.values()
+            ]
+    
+    def get_status(self) -> Dict:
+        """Active rollouts and startup latency estimates"""
+        return {
+            "active": self.active(),
+            "startup_estimates_s": {key: round(value, 1) for key, value in self._estimates.items()},
+            "poll_interval": self.poll_interval,
+            "timeout": self.timeout
+        }
+
+
+# Create singleton instance
+rollout_tracker = RolloutTracker()
@@ -0,0 +1,235 @@
+"""
+Scale Schedule - Cron-like replica floors and ceilings per deployment
+Lets known traffic peaks be pre-scaled instead of waiting for reactive thresholds
+
+Schedule file (JSON list, times in the engine's local time):
+[
+    {
+        "deployment": "api",
+        "namespace": "demo",          # optional, defaults to every namespace
+        "cron": "0 8 * * 1-5",        # peak start: minute hour day-of-month month day-of-week
+        "duration_minutes": 240,      # how long the peak lasts
+        "lead_minutes": 10,           # apply this long before the peak starts
+        "min_replicas": 6,            # floor while active (optional)
+        "max_replicas": 10            # ceiling while active (optional)
+    }
+]
+"""
+import sys
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mcp_server.config import SCALE_SCHEDULE_FILE
+
+logger = logging.getLogger(__name__)
+
+# (lowest, highest) accepted value of each cron field
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Seconds between checks of the schedule file's mtime
+RELOAD_CHECK_INTERVAL = 30
+
+
+class CronExpr:
+    """
+    Five-field cron expression supporting *, n, a-b, lists and /step.
+    Day of week is 0-6 with 0 = Sunday (7 is accepted as Sunday too).
+    As in cron, when both day fields are restricted either may match.
+    """
+    
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, CRON_FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+    
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"invalid cron step: {field!r}")
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(v) for v in item.split("-", 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"cron field out of range: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def matches(self, moment: datetime) -> bool:
+        """Whether the expression fires at this minute"""
+        if moment.minute not in self.minutes or moment.hour not in self.hours or moment.month not in self.months:
+            return False
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+
+class ScaleSchedule:
+    """
+    Loaded schedule entries; `bounds` answers which floor and ceiling
+    apply to a deployment at a given time. Results are cached per minute
+    since entries only change state on minute boundaries.
+    """
+    
+    def __init__(self, path: Optional[str] = SCALE_SCHEDULE_FILE):
+        self.path = Path(path) if path else None
+        self.entries: List[Dict] = []
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._cache: Dict[Tuple[str, str, datetime], Tuple[Optional[int], Optional[int]]] = {}
+        self._lock = threading.Lock()
+        self._reload_if_changed(force=True)
+    
+    def load(self, entries: List[Dict]):
+        """Validate and install schedule entries (bad entries are skipped)"""
+        parsed = []
+        for entry in entries:
+            try:
+                min_replicas = self._replicas(entry, "min_replicas")
+                max_replicas = self._replicas(entry, "max_replicas")
+                if min_replicas is not None and max_replicas is not None and min_replicas > max_replicas:
+                    raise ValueError(f"min_replicas {min_replicas} > max_replicas {max_replicas}")
+                parsed.append({
+                    "deployment": entry["deployment"],
+                    "namespace": entry.get("namespace"),
+                    "cron": CronExpr(entry["cron"]),
+                    "duration": timedelta(minutes=int(entry.get("duration_minutes", 60))),
+                    "lead": timedelta(minutes=int(entry.get("lead_minutes", 0))),
+                    "min_replicas": min_replicas,
+                    "max_replicas": max_replicas
+                })
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Skipping invalid scale schedule entry {entry}: {e}")
+        with self._lock:
+            self.entries = parsed
+            self._cache.clear()
+        logger.info(f"Loaded {len(parsed)} scale schedule entr{'y' if len(parsed) == 1 else 'ies'}")
+    
+    @staticmethod
+    def _replicas(entry: Dict, field: str) -> Optional[int]:
+        """Replica bound as an int (None if unset); raises ValueError if negative"""
+        value = entry.get(field)
+        if value is None:
+            return None
+        value = int(value)
+        if value < 0:
+            raise ValueError(f"{field} must not be negative, got {value}")
+        return value
+    
+    def _reload_if_changed(self, force: bool = False):
+        if self.path is None:
+            return
+        now = time.time()
+        if not force and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            if self.entries:
+                logger.warning(f"Scale schedule {self.path} is gone; clearing schedule")
+                self.load([])
+            self._mtime = None
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            with open(self.path, "r") as f:
+                self.load(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error loading scale schedule {self.path}: {e}")
+    
+    @staticmethod
+    def _is_active(entry: Dict, moment: datetime) -> bool:
+        """Active if a cron start s satisfies s - lead <= moment < s + duration"""
+        earliest = moment - entry["duration"] + timedelta(minutes=1)
+        latest = moment + entry["lead"]
+        start = earliest
+        while start <= latest:
+            if entry["cron"].matches(start):
+                return True
+            start += timedelta(minutes=1)
+        return False
+    
+    def bounds(self, namespace: str, deployment: str, now: Optional[datetime] = None) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (floor, ceiling) scheduled for deployment at `now`; None where no
+        active entry sets one. Overlapping entries combine to the highest
+        floor and the lowest ceiling.
+        """
+        self._reload_if_changed()
+        if not self.entries:
+            return None, None
+        
+        minute = (now or datetime.now()).replace(second=0, microsecond=0)
+        key = (namespace, deployment, minute)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            if len(self._cache) > 4096:
+                self._cache.clear()
+        
+        floor, ceiling = None, None
+        for entry in self.entries:
+            if entry["deployment"] != deployment or entry["namespace"] not in (None, namespace):
+                continue
+            if not self._is_active(entry, minute):
+                continue
+            if entry["min_replicas"] is not None:
+                floor = entry["min_replicas"] if floor is None else max(floor, entry["min_replicas"])
+            if entry["max_replicas"] is not None:
+                ceiling = entry["max_replicas"] if ceiling is None else min(ceiling, entry["max_replicas"])
+        
+        with self._lock:
+            self._cache[key] = (floor, ceiling)
+        return floor, ceiling
+    
+    def get_status(self) -> Dict:
+        """Configured entries"""
+        return {
+            "file": str(self.path) if self.path else None,
+            "entries": [
+                {
+                    "deployment": e["deployment"],
+                    "namespace": e["namespace"],
+                    "cron": e["cron"].expr,
+                    "duration_minutes": int(e["duration"].total_seconds() // 60),
+                    "lead_minutes": int(e["lead"].total_seconds() // 60),
+                    "min_replicas": e["min_replicas"],
+                    "max_replicas": e["max_replicas"]
+                }
+                for e in self.entries
+            ]
+        }
+
+
+# Create singleton instance
+scale_schedule = ScaleSchedule()
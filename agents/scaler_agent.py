@@ -1,50 +1,340 @@
 """
 Scaler Agent - Handles auto-scaling of deployments
 """
+import os
 import sys
+import json
+import math
+import time
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from tools.k8s_client import k8s_client
-from mcp_server.config import MIN_REPLICAS, MAX_REPLICAS, K8S_NAMESPACE
+from tools.k8s_client import K8sClient, k8s_client
+from tools.file_lock import FileLock
+from agents.rate_limiter import remediation_limiter
+from agents.scale_schedule import scale_schedule
+from mcp_server.config import (
+    MIN_REPLICAS,
+    MAX_REPLICAS,
+    K8S_NAMESPACE,
+    CPU_TARGET_UTILIZATION,
+    MEMORY_TARGET_UTILIZATION,
+    SCALING_TOLERANCE,
+    SCALE_UP_COOLDOWN,
+    SCALE_DOWN_COOLDOWN,
+    SCALE_DOWN_STABILIZATION_WINDOW,
+    SCALER_STATE_FILE,
+    SCALE_BATCH_WORKERS
+)
 
 logger = logging.getLogger(__name__)
 
 
+class ScaleStabilizer:
+    """
+    Per-deployment scaling memory, keyed "namespace/deployment":
+    the time and direction of the last scale (for cooldowns) and the
+    replica recommendations seen within the stabilization window.
+    A scale-down never goes below the highest recommendation in the
+    window, so a recent spike holds capacity until it has aged out.
+    State is small and persisted to SCALER_STATE_FILE on every change.
+    The engine and the API server (POST /scale/batch) share the file: it
+    is re-read whenever it changed on disk, and saves merge with what is
+    on disk (newest scale, union of recommendations) under a file lock.
+    """
+    
+    def __init__(
+        self,
+        state_file: Optional[str] = SCALER_STATE_FILE,
+        up_cooldown: int = SCALE_UP_COOLDOWN,
+        down_cooldown: int = SCALE_DOWN_COOLDOWN,
+        window: int = SCALE_DOWN_STABILIZATION_WINDOW,
+        clock: Callable[[], float] = time.time
+    ):
+        self.state_file = Path(state_file) if state_file else None
+        self.cooldowns = {"up": up_cooldown, "down": down_cooldown}
+        self.window = window
+        self.clock = clock
+        # key -> {"last_scale": epoch, "direction": "up"|"down", "recs": deque[(epoch, replicas)]}
+        self._state: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.state_file.with_suffix(".lock")) if self.state_file else None
+        # (inode, mtime) of the state file as last read or written by us
+        self._seen: Optional[Tuple[int, int]] = None
+        self._load()
+    
+    def _entry(self, key: str) -> Dict:
+        entry = self._state.get(key)
+        if entry is None:
+            entry = {"last_scale": 0.0, "direction": None, "recs": deque()}
+            self._state[key] = entry
+        return entry
+    
+    def _prune(self, entry: Dict, now: float):
+        recs = entry["recs"]
+        while recs and recs[0][0] < now - self.window:
+            recs.popleft()
+    
+    def cooldown_remaining(self, key: str, direction: str) -> float:
+        """Seconds until a scale in `direction` is allowed (0 when allowed now)"""
+        with self._lock:
+            self._refresh()
+            entry = self._state.get(key)
+            if not entry or not entry["last_scale"]:
+                return 0.0
+            return max(0.0, entry["last_scale"] + self.cooldowns[direction] - self.clock())
+    
+    def recommend(self, key: str, replicas: int):
+        """Remember a replica recommendation for the stabilization window"""
+        now = self.clock()
+        with self._lock:
+            self._refresh()
+            entry = self._entry(key)
+            self._prune(entry, now)
+            entry["recs"].append((round(now, 1), replicas))
+            self._save()
+    
+    def stabilized_down(self, key: str, desired: int) -> int:
+        """
+        Record a scale-down recommendation and return the replica count to
+        actually use: the highest recommendation within the window
+        """
+        now = self.clock()
+        with self._lock:
+            self._refresh()
+            entry = self._entry(key)
+            self._prune(entry, now)
+            entry["recs"].append((round(now, 1), desired))
+            self._save()
+            return max(replicas for _, replicas in entry["recs"])
+    
+    def mark_scaled(self, key: str, direction: str):
+        """Start the cooldown after a successful scale"""
+        with self._lock:
+            self._refresh()
+            entry = self._entry(key)
+            entry["last_scale"] = round(self.clock(), 1)
+            entry["direction"] = direction
+            self._save()
+    
+    def _save(self):
+        """
+        Merge with the file on disk and write atomically (caller holds the
+        lock); another process may have saved since we last read it
+        """
+        if self.state_file is None:
+            return
+        try:
+            with self._file_lock:
+                self._refresh()
+                state = {
+                    key: {"t": entry["last_scale"], "d": entry["direction"], "r": list(entry["recs"])}
+                    for key, entry in self._state.items()
+                }
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.state_file.with_suffix(".tmp")
+                with open(tmp, "w") as f:
+                    json.dump(state, f, separators=(",", ":"))
+                os.replace(tmp, self.state_file)
+                self._seen = self._file_version()
+        except OSError as e:
+            logger.error(f"Error saving scaler state: {e}")
+    
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.state_file.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+    
+    def _refresh(self):
+        """Merge the state file if another process changed it (caller holds the lock)"""
+        if self.state_file is None:
+            return
+        version = self._file_version()
+        if version is None or version == self._seen:
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error loading scaler state: {e}")
+            return
+        self._seen = version
+        self._merge(state)
+    
+    def _merge(self, state: Dict):
+        """Fold saved entries in: the newest scale wins, recommendations are unioned"""
+        now = self.clock()
+        for key, saved in state.items():
+            entry = self._entry(key)
+            if saved.get("t", 0.0) > entry["last_scale"]:
+                entry["last_scale"] = saved["t"]
+                entry["direction"] = saved.get("d")
+            recs = set(entry["recs"]) | {(ts, replicas) for ts, replicas in saved.get("r", [])}
+            entry["recs"] = deque(sorted(recs))
+            self._prune(entry, now)
+    
+    def _load(self):
+        """Restore state from a previous run (or another process), dropping recommendations outside the window"""
+        with self._lock:
+            self._refresh()
+        if self._state:
+            logger.info(f"Restored scaling state for {len(self._state)} deployment(s)")
+    
+    def get_status(self) -> Dict:
+        """Cooldown and window view per deployment"""
+        now = self.clock()
+        with self._lock:
+            self._refresh()
+            return {
+                key: {
+                    "last_scale": entry["last_scale"],
+                    "direction": entry["direction"],
+                    "cooldown_remaining_s": {
+                        direction: round(max(0.0, entry["last_scale"] + cooldown - now), 1) if entry["last_scale"] else 0.0
+                        for direction, cooldown in self.cooldowns.items()
+                    },
+                    "window_max": max((replicas for _, replicas in entry["recs"]), default=None)
+                }
+                for key, entry in self._state.items()
+            }
+
+
 class ScalerAgent:
     """
     Automatically scales deployments based on metrics
     """
     
-    def __init__(self, namespace: str = K8S_NAMESPACE):
+    def __init__(self, namespace: str = K8S_NAMESPACE, k8s: Optional[K8sClient] = None):
         self.namespace = namespace
+        self.k8s = k8s or k8s_client
         self.min_replicas = MIN_REPLICAS
         self.max_replicas = MAX_REPLICAS
+        self.targets = {"cpu": CPU_TARGET_UTILIZATION, "memory": MEMORY_TARGET_UTILIZATION}
+        self.tolerance = SCALING_TOLERANCE
+        self.stabilizer = scale_stabilizer
+        self.schedule = scale_schedule
+        self._clamped_floors: Dict[str, int] = {}  # deployment -> floor last reported as above MAX_REPLICAS
+    
+    def replica_limits(self, deployment: str, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Effective (min, max) replicas: MIN/MAX_REPLICAS narrowed by any
+        scheduled floor or ceiling active for deployment. A floor above
+        MAX_REPLICAS is clamped to it (the global ceiling always wins).
+        """
+        floor, ceiling = self.schedule.bounds(self.namespace, deployment, now)
+        if floor is not None and floor > self.max_replicas:
+            if self._clamped_floors.get(deployment) != floor:
+                self._clamped_floors[deployment] = floor
+                logger.warning(f"Scheduled floor {floor} for {self.namespace}/{deployment} exceeds "
+                               f"MAX_REPLICAS ({self.max_replicas}); using {self.max_replicas}")
+            floor = self.max_replicas
+        low = max(self.min_replicas, floor or 0)
+        high = self.max_replicas if ceiling is None else min(self.max_replicas, ceiling)
+        return low, max(low, high)
+    
+    def _key(self, deployment: str) -> str:
+        return f"{self.namespace}/{deployment}"
+    
+    def _stabilize(self, deployment: str, current: int, target: int) -> Tuple[int, Optional[Dict]]:
+        """
+        Apply cooldowns and the scale-down stabilization window.
+        Returns (target to use, result dict to return instead when blocked)
+        """
+        key = self._key(deployment)
+        direction = "up" if target > current else "down"
+        
+        # Recommendations count toward the window even when the scale is blocked
+        if direction == "up":
+            self.stabilizer.recommend(key, target)
+            stabilized = target
+        else:
+            stabilized = self.stabilizer.stabilized_down(key, target)
+        
+        remaining = self.stabilizer.cooldown_remaining(key, direction)
+        if remaining > 0:
+            logger.info(f"Not scaling {deployment} {direction}: cooldown, {remaining:.0f}s remaining")
+            return current, {
+                "success": False,
+                "reason": "cooldown",
+                "direction": direction,
+                "current": current,
+                "retry_in_s": round(remaining, 1)
+            }
+        
+        if direction == "down" and stabilized >= current:
+            logger.info(f"Not scaling {deployment} down: {stabilized} replicas recommended within the "
+                        f"last {self.stabilizer.window}s")
+            return current, {
+                "success": False,
+                "reason": "stabilizing",
+                "current": current,
+                "recommended": target,
+                "window_max": stabilized
+            }
+        return stabilized, None
+    
+    def recommend_replicas(self, current: int, utilization: Dict[str, float], deployment: Optional[str] = None) -> int:
+        """
+        HPA-style replica recommendation: ceil(current * observed / target)
+        per resource, ignoring ratios within the tolerance band, taking the
+        largest recommendation across resources and clamping to min/max
+        (including any schedule for deployment)
+        """
+        recommendations = []
+        for resource, observed in utilization.items():
+            target = self.targets.get(resource)
+            if not target or observed is None:
+                continue
+            ratio = observed / target
+            if abs(ratio - 1.0) <= self.tolerance:
+                recommendations.append(current)
+            else:
+                recommendations.append(math.ceil(current * ratio))
+        
+        if not recommendations:
+            return current
+        low, high = self.replica_limits(deployment) if deployment else (self.min_replicas, self.max_replicas)
+        return max(low, min(max(recommendations), high))
     
     def scale_up(self, deployment: str, delta: int = 2, reason: str = "") -> Dict:
         """
         Scale up a deployment by delta replicas
         """
         try:
-            current = k8s_client.get_deployment_replicas(deployment, self.namespace)
-            new_count = min(current + delta, self.max_replicas)
+            current = self.k8s.get_deployment_replicas(deployment, self.namespace)
+            _, max_replicas = self.replica_limits(deployment)
+            new_count = min(current + delta, max_replicas)
             
-            if new_count == current:
-                logger.info(f"Cannot scale up {deployment}: already at maximum ({self.max_replicas})")
+            if new_count <= current:
+                logger.info(f"Cannot scale up {deployment}: already at maximum ({max_replicas})")
                 return {
                     "success": False,
                     "reason": "at_maximum",
                     "current": current,
-                    "max": self.max_replicas
+                    "max": max_replicas
                 }
             
-            success = k8s_client.scale_deployment(deployment, new_count, self.namespace)
+            new_count, blocked = self._stabilize(deployment, current, new_count)
+            if blocked:
+                return blocked
+            
+            limited = remediation_limiter.check("scale_up", self.namespace, deployment)
+            if limited:
+                return limited
+            
+            success = self.k8s.scale_deployment(deployment, new_count, self.namespace)
             
             if success:
+                self.stabilizer.mark_scaled(self._key(deployment), "up")
                 logger.info(f"Scaled up {deployment}: {current} → {new_count} replicas. Reason: {reason}")
                 return {
                     "success": True,
@@ -58,7 +348,7 @@ class ScalerAgent:
                 }
             else:
                 return {"success": False, "reason": "k8s_error"}
-                
+        
         except Exception as e:
             logger.error(f"Error scaling up {deployment}: {e}")
             return {"success": False, "reason": str(e)}
@@ -68,21 +358,31 @@ class ScalerAgent:
         Scale down a deployment by delta replicas
         """
         try:
-            current = k8s_client.get_deployment_replicas(deployment, self.namespace)
-            new_count = max(current - delta, self.min_replicas)
+            current = self.k8s.get_deployment_replicas(deployment, self.namespace)
+            min_replicas, _ = self.replica_limits(deployment)
+            new_count = max(current - delta, min_replicas)
             
-            if new_count == current:
-                logger.info(f"Cannot scale down {deployment}: already at minimum ({self.min_replicas})")
+            if new_count >= current:
+                logger.info(f"Cannot scale down {deployment}: already at minimum ({min_replicas})")
                 return {
                     "success": False,
                     "reason": "at_minimum",
                     "current": current,
-                    "min": self.min_replicas
+                    "min": min_replicas
                 }
             
-            success = k8s_client.scale_deployment(deployment, new_count, self.namespace)
+            new_count, blocked = self._stabilize(deployment, current, new_count)
+            if blocked:
+                return blocked
+            
+            limited = remediation_limiter.check("scale_down", self.namespace, deployment)
+            if limited:
+                return limited
+            
+            success = self.k8s.scale_deployment(deployment, new_count, self.namespace)
             
             if success:
+                self.stabilizer.mark_scaled(self._key(deployment), "down")
                 logger.info(f"Scaled down {deployment}: {current} → {new_count} replicas. Reason: {reason}")
                 return {
                     "success": True,
@@ -96,7 +396,7 @@ class ScalerAgent:
                 }
             else:
                 return {"success": False, "reason": "k8s_error"}
-                
+        
         except Exception as e:
             logger.error(f"Error scaling down {deployment}: {e}")
             return {"success": False, "reason": str(e)}
@@ -106,8 +406,9 @@ class ScalerAgent:
         Scale deployment to exact target replica count
         """
         try:
-            current = k8s_client.get_deployment_replicas(deployment, self.namespace)
-            target = max(self.min_replicas, min(target, self.max_replicas))
+            current = self.k8s.get_deployment_replicas(deployment, self.namespace)
+            min_replicas, max_replicas = self.replica_limits(deployment)
+            target = max(min_replicas, min(target, max_replicas))
             
             if target == current:
                 logger.info(f"{deployment} already at target ({target} replicas)")
@@ -117,10 +418,19 @@ class ScalerAgent:
                     "current": current
                 }
             
-            success = k8s_client.scale_deployment(deployment, target, self.namespace)
+            target, blocked = self._stabilize(deployment, current, target)
+            if blocked:
+                return blocked
+            
+            limited = remediation_limiter.check("scale", self.namespace, deployment)
+            if limited:
+                return limited
+            
+            success = self.k8s.scale_deployment(deployment, target, self.namespace)
             
             if success:
                 action = "scale_up" if target > current else "scale_down"
+                self.stabilizer.mark_scaled(self._key(deployment), "up" if target > current else "down")
                 logger.info(f"Scaled {deployment}: {current} → {target} replicas. Reason: {reason}")
                 return {
                     "success": True,
@@ -134,33 +444,124 @@ class ScalerAgent:
                 }
             else:
                 return {"success": False, "reason": "k8s_error"}
-                
+        
         except Exception as e:
             logger.error(f"Error scaling {deployment} to {target}: {e}")
             return {"success": False, "reason": str(e)}
     
+    def scale_many(self, targets: Dict[str, int], reason: str = "") -> Dict:
+        """
+        Scale several deployments to exact replica counts in one call.
+        Targets are validated together against one deployment listing and
+        MIN/MAX_REPLICAS; valid changes are applied concurrently.
+        Operator-requested, so cooldowns and rate limits do not apply, but
+        the new counts are recorded so the engine does not scale them back
+        down within the stabilization window. If the deployments cannot be
+        listed, every target fails with k8s_error.
+        """
+        start = time.perf_counter()
+        listing = self.k8s.get_deployments(self.namespace, strict=True)
+        if listing is None:
+            logger.error(f"Batch scale in {self.namespace} aborted: could not list deployments")
+            return {
+                "success": False,
+                "namespace": self.namespace,
+                "reason": "k8s_error",
+                "applied": 0,
+                "failed": len(targets),
+                "results": {deployment: {"success": False, "reason": "k8s_error"} for deployment in targets},
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+        current = {d["name"]: d["replicas"] for d in listing}
+        results = {}
+        to_apply = {}
+        
+        for deployment, target in targets.items():
+            if deployment not in current:
+                results[deployment] = {"success": False, "reason": "not_found"}
+            elif not isinstance(target, int) or not self.min_replicas <= target <= self.max_replicas:
+                results[deployment] = {
+                    "success": False,
+                    "reason": "out_of_range",
+                    "requested": target,
+                    "min": self.min_replicas,
+                    "max": self.max_replicas
+                }
+            elif target == current[deployment]:
+                results[deployment] = {
+                    "success": True,
+                    "action": "none",
+                    "reason": "already_at_target",
+                    "from": target,
+                    "to": target
+                }
+            else:
+                to_apply[deployment] = target
+        
+        def apply(deployment: str) -> Dict:
+            target = to_apply[deployment]
+            try:
+                if not self.k8s.scale_deployment(deployment, target, self.namespace):
+                    return {"success": False, "reason": "k8s_error"}
+            except Exception as e:
+                logger.error(f"Error scaling {deployment} to {target}: {e}")
+                return {"success": False, "reason": str(e)}
+            
+            direction = "up" if target > current[deployment] else "down"
+            self.stabilizer.recommend(self._key(deployment), target)
+            self.stabilizer.mark_scaled(self._key(deployment), direction)
+            return {
+                "success": True,
+                "action": f"scale_{direction}",
+                "deployment": deployment,
+                "from": current[deployment],
+                "to": target,
+                "delta": abs(target - current[deployment]),
+                "reason": reason,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        if to_apply:
+            with ThreadPoolExecutor(max_workers=min(SCALE_BATCH_WORKERS, len(to_apply))) as executor:
+                for deployment, result in zip(to_apply, executor.map(apply, to_apply)):
+                    results[deployment] = result
+        
+        applied = sum(1 for name in to_apply if results[name].get("success"))
+        failed = sum(1 for result in results.values() if not result.get("success"))
+        logger.info(f"Batch scaled {applied}/{len(targets)} deployment(s) in {self.namespace} "
+                    f"({failed} failed). Reason: {reason}")
+        return {
+            "success": failed == 0,
+            "namespace": self.namespace,
+            "applied": applied,
+            "failed": failed,
+            "results": results,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+    
     def get_current_replicas(self, deployment: str) -> int:
         """
         Get current replica count for deployment
         """
-        return k8s_client.get_deployment_replicas(deployment, self.namespace)
+        return self.k8s.get_deployment_replicas(deployment, self.namespace)
     
     def can_scale_up(self, deployment: str) -> bool:
         """
         Check if deployment can be scaled up
         """
         current = self.get_current_replicas(deployment)
-        return current < self.max_replicas
+        return current < self.replica_limits(deployment)[1]
     
     def can_scale_down(self, deployment: str) -> bool:
         """
         Check if deployment can be scaled down
         """
         current = self.get_current_replicas(deployment)
-        return current > self.min_replicas
+        return current > self.replica_limits(deployment)[0]
 
 
-# Create singleton instance
+# Create singleton instances (the stabilizer is shared by every namespace's scaler)
+scale_stabilizer = ScaleStabilizer()
 scaler_agent = ScalerAgent()
 
 
@@ -0,0 +1,276 @@
+"""
+Sharding - Splits namespaces across engine replicas
+Membership is tracked with Kubernetes Lease objects (one per replica) and
+namespaces are assigned to live replicas with a consistent hash ring
+"""
+import sys
+import abc
+import time
+import bisect
+import hashlib
+import socket
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timezone
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.k8s_client import k8s_client
+from mcp_server.config import (
+    ENGINE_REPLICA_ID,
+    SHARD_LEASE_NAMESPACE,
+    SHARD_LEASE_DURATION,
+    SHARD_RENEW_INTERVAL,
+    SHARD_VIRTUAL_NODES
+)
+
+logger = logging.getLogger(__name__)
+
+LEASE_PREFIX = "sentinelops-replica-"
+LEASE_LABEL_SELECTOR = "app.kubernetes.io/component=sentinelops-shard"
+
+
+class LeaseBackend(abc.ABC):
+    """
+    Storage for replica membership leases.
+    Leases are plain dicts: {"name", "holder", "renew_time" (epoch seconds), "duration" (seconds)}
+    """
+    
+    @abc.abstractmethod
+    def list_leases(self) -> Optional[List[Dict]]:
+        """Return all membership leases, or None if they could not be read"""
+    
+    @abc.abstractmethod
+    def renew(self, name: str, holder: str, duration: int) -> bool:
+        """Create or refresh the lease `name` for `holder`"""
+    
+    @abc.abstractmethod
+    def release(self, name: str, holder: str) -> bool:
+        """Give up the lease so peers take over immediately"""
+
+
+class InMemoryLeaseBackend(LeaseBackend):
+    """
+    Process-local lease store; several ShardCoordinators can share one
+    instance to simulate replicas (clock is injectable for tests, and
+    setting available = False makes listing fail like an API outage)
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.available = True
+        self._leases: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def list_leases(self) -> Optional[List[Dict]]:
+        if not self.available:
+            return None
+        with self._lock:
+            return [dict(lease) for lease in self._leases.values()]
+    
+    def renew(self, name: str, holder: str, duration: int) -> bool:
+        with self._lock:
+            self._leases[name] = {
+                "name": name,
+                "holder": holder,
+                "renew_time": self.clock(),
+                "duration": duration
+            }
+        return True
+    
+    def release(self, name: str, holder: str) -> bool:
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease and lease["holder"] == holder:
+                del self._leases[name]
+        return True
+
+
+class KubectlLeaseBackend(LeaseBackend):
+    """
+    coordination.k8s.io/v1 Lease objects managed through kubectl
+    """
+    
+    def __init__(self, namespace: str = SHARD_LEASE_NAMESPACE):
+        self.namespace = namespace
+    
+    def list_leases(self) -> Optional[List[Dict]]:
+        items = k8s_client.get_leases(self.namespace, LEASE_LABEL_SELECTOR)
+        if items is None:
+            return None
+        leases = []
+        for item in items:
+            spec = item.get("spec", {})
+            renew_time = self._parse_time(spec.get("renewTime"))
+            if renew_time is None:
+                continue
+            leases.append({
+                "name": item["metadata"]["name"],
+                "holder": spec.get("holderIdentity", ""),
+                "renew_time": renew_time,
+                "duration": spec.get("leaseDurationSeconds", SHARD_LEASE_DURATION)
+            })
+        return leases
+    
+    def renew(self, name: str, holder: str, duration: int) -> bool:
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        manifest = {
+            "apiVersion": "coordination.k8s.io/v1",
+            "kind": "Lease",
+            "metadata": {
+                "name": name,
+                "namespace": self.namespace,
+                "labels": {"app.kubernetes.io/component": "sentinelops-shard"}
+            },
+            "spec": {
+                "holderIdentity": holder,
+                "leaseDurationSeconds": duration,
+                "renewTime": now
+            }
+        }
+        return k8s_client.apply_manifest(manifest)
+    
+    def release(self, name: str, holder: str) -> bool:
+        return k8s_client.delete_lease(name, self.namespace)
+    
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[float]:
+        """Parse a Lease MicroTime into epoch seconds"""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes; adding or removing a member
+    only moves the keys that hashed to that member
+    """
+    
+    def __init__(self, members: List[str], vnodes: int = SHARD_VIRTUAL_NODES):
+        self.members = sorted(set(members))
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        
+        ring = sorted(
+            (self._hash(f"{member}#{i}"), member)
+            for member in self.members
+            for i in range(vnodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [member for _, member in ring]
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+    
+    def owner(self, key: str) -> Optional[str]:
+        """Member responsible for key"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+class ShardCoordinator:
+    """
+    Keeps this replica's membership lease fresh and decides which
+    namespaces it owns. A replica that stops renewing drops out of the ring
+    once its lease expires (SHARD_LEASE_DURATION), and its namespaces move
+    to the survivors on their next heartbeat.
+    
+    Hand-over is not fenced: for at most one renew interval two replicas can
+    both consider a namespace theirs. Each cycle re-reads cluster state, so
+    the overlap costs at most one duplicate decision.
+    """
+    
+    def __init__(
+        self,
+        backend: LeaseBackend,
+        replica_id: str = ENGINE_REPLICA_ID,
+        lease_duration: int = SHARD_LEASE_DURATION,
+        renew_interval: int = SHARD_RENEW_INTERVAL,
+        vnodes: int = SHARD_VIRTUAL_NODES,
+        clock: Callable[[], float] = time.time
+    ):
+        self.backend = backend
+        self.replica_id = replica_id or socket.gethostname()
+        self.lease_name = f"{LEASE_PREFIX}{self.replica_id}"
+        self.lease_duration = lease_duration
+        self.renew_interval = renew_interval
+        self.vnodes = vnodes
+        self.clock = clock
+        
+        self._last_renew = None
+        self._ring = HashRing([self.replica_id], vnodes)
+    
+    def heartbeat(self, force: bool = False) -> bool:
+        """
+        Renew our lease and refresh the live member set if the renew interval
+        elapsed; returns True when membership changed. If the leases cannot
+        be listed the previous ring is kept (an empty listing would make
+        every replica claim every namespace).
+        """
+        now = self.clock()
+        if not force and self._last_renew is not None and now - self._last_renew < self.renew_interval:
+            return False
+        
+        if not self.backend.renew(self.lease_name, self.replica_id, self.lease_duration):
+            logger.warning(f"[SHARD] Failed to renew lease {self.lease_name}")
+        self._last_renew = now
+        
+        members = self.live_members(now)
+        if members is None:
+            logger.warning(f"[SHARD] Could not list leases, keeping members {self._ring.members}")
+            return False
+        if self.replica_id not in members:
+            # Our own lease is missing (renewal failed); keep ourselves in the
+            # ring rather than dropping every namespace
+            members.append(self.replica_id)
+        
+        if sorted(set(members)) == self._ring.members:
+            return False
+        
+        logger.info(f"[SHARD] Membership changed: {self._ring.members} -> {sorted(set(members))}")
+        self._ring = HashRing(members, self.vnodes)
+        return True
+    
+    def live_members(self, now: Optional[float] = None) -> Optional[List[str]]:
+        """Holders of leases that have not expired (None if the leases could not be listed)"""
+        now = self.clock() if now is None else now
+        leases = self.backend.list_leases()
+        if leases is None:
+            return None
+        return [
+            lease["holder"]
+            for lease in leases
+            if lease["name"].startswith(LEASE_PREFIX)
+            and lease["holder"]
+            and lease["renew_time"] + lease["duration"] > now
+        ]
+    
+    def owns(self, namespace: str) -> bool:
+        """Whether this replica is responsible for namespace"""
+        return self._ring.owner(namespace) == self.replica_id
+    
+    def assign(self, namespaces: List[str]) -> List[str]:
+        """Subset of namespaces owned by this replica"""
+        return [ns for ns in namespaces if self.owns(ns)]
+    
+    def release(self):
+        """Drop our lease on shutdown so peers take over without waiting for expiry"""
+        self.backend.release(self.lease_name, self.replica_id)
+    
+    def get_status(self) -> Dict:
+        """Sharding view of this replica"""
+        return {
+            "replica_id": self.replica_id,
+            "members": list(self._ring.members),
+            "lease_duration": self.lease_duration,
+            "renew_interval": self.renew_interval
+        }
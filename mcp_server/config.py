@@ -20,6 +20,27 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_DIR = os.getenv("LOG_DIR", "logs")
 ACTIONS_LOG = f"{LOG_DIR}/actions.log"
 INCIDENTS_LOG = f"{LOG_DIR}/incidents.log"
+# Incident log segments are sealed at this size; the sidecar index gets one
+# (timestamp, offset) entry per INCIDENT_INDEX_BYTES of log
+INCIDENT_SEGMENT_BYTES = int(os.getenv("INCIDENT_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+INCIDENT_INDEX_BYTES = int(os.getenv("INCIDENT_INDEX_BYTES", str(64 * 1024)))
+# Incident updates are appended as delta records; after this many, a background
+# compaction folds them into the incidents they update
+INCIDENT_COMPACT_UPDATES = int(os.getenv("INCIDENT_COMPACT_UPDATES", "500"))
+# Incident records are written by one background thread in batches of up to
+# INCIDENT_WRITE_BATCH. INCIDENT_FSYNC: "none" (leave it to the OS), "batch"
+# (fsync every batch) or "interval" (at most every INCIDENT_FSYNC_INTERVAL s)
+INCIDENT_FSYNC = os.getenv("INCIDENT_FSYNC", "interval")
+INCIDENT_FSYNC_INTERVAL = float(os.getenv("INCIDENT_FSYNC_INTERVAL", "1.0"))
+INCIDENT_WRITE_BATCH = int(os.getenv("INCIDENT_WRITE_BATCH", "512"))
+# In-memory window of recent incidents (older ones are read from the store)
+INCIDENT_WINDOW_HOURS = float(os.getenv("INCIDENT_WINDOW_HOURS", "24"))
+INCIDENT_WINDOW_MAX = int(os.getenv("INCIDENT_WINDOW_MAX", "100000"))
+# Incident storage backend: "jsonl" (segmented log above) or "sqlite" (indexed
+# queries; an empty database is seeded from the JSONL log on first start)
+INCIDENT_BACKEND = os.getenv("INCIDENT_BACKEND", "jsonl")
+INCIDENT_DB = os.getenv("INCIDENT_DB", f"{LOG_DIR}/incidents.db")
+SCALER_STATE_FILE = os.getenv("SCALER_STATE_FILE", f"{LOG_DIR}/scaler_state.json")
 
 # Thresholds for Auto-Scaling
 CPU_HIGH_THRESHOLD = float(os.getenv("CPU_HIGH_THRESHOLD", "80.0"))
@@ -30,8 +51,114 @@ MEMORY_HIGH_THRESHOLD = float(os.getenv("MEMORY_HIGH_THRESHOLD", "85.0"))
 MIN_REPLICAS = int(os.getenv("MIN_REPLICAS", "2"))
 MAX_REPLICAS = int(os.getenv("MAX_REPLICAS", "10"))
 
+# Cron-like replica floors/ceilings per deployment (JSON file, empty = disabled)
+SCALE_SCHEDULE_FILE = os.getenv("SCALE_SCHEDULE_FILE", "")
+
+# Concurrent kubectl calls for bulk scaling (POST /scale/batch)
+SCALE_BATCH_WORKERS = int(os.getenv("SCALE_BATCH_WORKERS", "10"))
+
+# Scaling mode: "step" (fixed deltas on namespace thresholds) or
+# "proportional" (HPA-style: desired = ceil(current * observed / target) per deployment)
+SCALING_MODE = os.getenv("SCALING_MODE", "step").lower()
+CPU_TARGET_UTILIZATION = float(os.getenv("CPU_TARGET_UTILIZATION", "60.0"))  # % of CPU requests
+MEMORY_TARGET_UTILIZATION = float(os.getenv("MEMORY_TARGET_UTILIZATION", "70.0"))  # % of memory limits
+SCALING_TOLERANCE = float(os.getenv("SCALING_TOLERANCE", "0.1"))  # ignore ratios within 1 +/- tolerance
+
+# Scale stabilization (per deployment): minimum seconds since the last scale before
+# scaling up / down again, and the window whose highest recommendation caps a scale-down
+SCALE_UP_COOLDOWN = int(os.getenv("SCALE_UP_COOLDOWN", "60"))
+SCALE_DOWN_COOLDOWN = int(os.getenv("SCALE_DOWN_COOLDOWN", "300"))
+SCALE_DOWN_STABILIZATION_WINDOW = int(os.getenv("SCALE_DOWN_STABILIZATION_WINDOW", "300"))
+
+# Post-scale rollout tracking (poll readyReplicas until converged or timed out)
+ROLLOUT_POLL_INTERVAL = float(os.getenv("ROLLOUT_POLL_INTERVAL", "5"))  # seconds
+ROLLOUT_TIMEOUT = int(os.getenv("ROLLOUT_TIMEOUT", "300"))  # seconds
+
+# Grouped healing: unhealthy share of a deployment that triggers one rollout restart
+# instead of pod deletes, and the most pods deleted for one deployment per cycle
+HEAL_RESTART_FRACTION = float(os.getenv("HEAL_RESTART_FRACTION", "0.5"))
+HEAL_MAX_POD_DELETES = int(os.getenv("HEAL_MAX_POD_DELETES", "3"))
+
+# Pods are only treated as stuck once Pending for this long (image pulls and
+# scheduling of fresh pods take a while)
+PENDING_AGE_THRESHOLD = int(os.getenv("PENDING_AGE_THRESHOLD", "300"))  # seconds
+
+# OOMKilled right-sizing: "propose" records the recommended memory limit on the
+# incident, "apply" sets it. The new limit is the larger of current * OOM_MEMORY_STEP
+# and peak usage * OOM_PEAK_HEADROOM, capped at current * OOM_MAX_INCREASE and
+# OOM_MEMORY_CEILING; a deployment is resized at most once per OOM_RESIZE_COOLDOWN
+OOM_REMEDIATION_MODE = os.getenv("OOM_REMEDIATION_MODE", "propose")  # propose | apply
+OOM_MEMORY_STEP = float(os.getenv("OOM_MEMORY_STEP", "1.25"))
+OOM_PEAK_HEADROOM = float(os.getenv("OOM_PEAK_HEADROOM", "1.3"))
+OOM_MAX_INCREASE = float(os.getenv("OOM_MAX_INCREASE", "2.0"))
+OOM_MEMORY_CEILING = os.getenv("OOM_MEMORY_CEILING", "4Gi")
+OOM_PEAK_WINDOW = os.getenv("OOM_PEAK_WINDOW", "1h")
+OOM_RESIZE_COOLDOWN = int(os.getenv("OOM_RESIZE_COOLDOWN", "900"))  # seconds
+# A container's last termination stays "OOMKilled" until it dies again; it is
+# only reported if the kill finished within OOM_LOOKBACK seconds or the
+# container is not ready / waiting now
+OOM_LOOKBACK = int(os.getenv("OOM_LOOKBACK", "900"))
+
+# Kubernetes Events watch: Warning events become issues as they arrive and wake
+# the engine early (at most once per EVENT_WAKE_MIN_INTERVAL seconds); repeats of
+# the same object and reason within EVENT_DEDUPE_WINDOW seconds are merged
+EVENT_WATCH_ENABLED = os.getenv("EVENT_WATCH_ENABLED", "true").lower() == "true"
+EVENT_DEDUPE_WINDOW = int(os.getenv("EVENT_DEDUPE_WINDOW", "300"))
+EVENT_WAKE_MIN_INTERVAL = float(os.getenv("EVENT_WAKE_MIN_INTERVAL", "5"))
+
+# Per-pod healing backoff: delay doubles after each delete (base..max seconds);
+# after HEAL_GIVE_UP_ATTEMPTS deletes the pod is escalated instead of deleted again
+HEAL_BACKOFF_BASE = int(os.getenv("HEAL_BACKOFF_BASE", "60"))
+HEAL_BACKOFF_MAX = int(os.getenv("HEAL_BACKOFF_MAX", "1800"))
+HEAL_GIVE_UP_ATTEMPTS = int(os.getenv("HEAL_GIVE_UP_ATTEMPTS", "5"))
+HEAL_BACKOFF_MAX_PODS = int(os.getenv("HEAL_BACKOFF_MAX_PODS", "5000"))
+
+# Crash log diagnosis: previous-container logs of crashlooping pods are fetched
+# concurrently (at most LOG_LIMIT_BYTES each) and classified before healing;
+# pods whose logs are not back within LOG_FETCH_DEADLINE seconds stay "unknown"
+LOG_FETCH_WORKERS = int(os.getenv("LOG_FETCH_WORKERS", "16"))
+LOG_FETCH_DEADLINE = float(os.getenv("LOG_FETCH_DEADLINE", "0.8"))
+LOG_LIMIT_BYTES = int(os.getenv("LOG_LIMIT_BYTES", "32768"))
+LOG_TAIL_LINES = int(os.getenv("LOG_TAIL_LINES", "200"))
+
+# Remediation write rate limits (token buckets, writes per minute + burst size)
+REMEDIATION_RATE_GLOBAL = float(os.getenv("REMEDIATION_RATE_GLOBAL", "30"))
+REMEDIATION_BURST_GLOBAL = int(os.getenv("REMEDIATION_BURST_GLOBAL", "10"))
+REMEDIATION_RATE_NAMESPACE = float(os.getenv("REMEDIATION_RATE_NAMESPACE", "10"))
+REMEDIATION_BURST_NAMESPACE = int(os.getenv("REMEDIATION_BURST_NAMESPACE", "5"))
+REMEDIATION_RATE_DEPLOYMENT = float(os.getenv("REMEDIATION_RATE_DEPLOYMENT", "3"))
+REMEDIATION_BURST_DEPLOYMENT = int(os.getenv("REMEDIATION_BURST_DEPLOYMENT", "2"))
+
 # Decision Engine
 DECISION_LOOP_INTERVAL = int(os.getenv("DECISION_LOOP_INTERVAL", "60"))  # seconds
+# A standalone engine (python agents/decision_engine.py) serves its cycle and
+# action histograms at http://<host>:ENGINE_METRICS_PORT/metrics (0 = disabled);
+# with ENGINE_IN_PROCESS=true they are on the API's /metrics/prometheus instead
+ENGINE_METRICS_PORT = int(os.getenv("ENGINE_METRICS_PORT", "9108"))
+
+# Remediation queue deadlines by issue severity (seconds from detection until an action expires)
+ACTION_DEADLINE_HIGH = int(os.getenv("ACTION_DEADLINE_HIGH", "30"))
+ACTION_DEADLINE_MEDIUM = int(os.getenv("ACTION_DEADLINE_MEDIUM", "120"))
+ACTION_DEADLINE_LOW = int(os.getenv("ACTION_DEADLINE_LOW", "300"))
+
+# Run the decision engine as a background task inside the API process
+ENGINE_IN_PROCESS = os.getenv("ENGINE_IN_PROCESS", "false").lower() == "true"
+
+# Record every cycle's inputs and decisions for offline replay (empty = disabled)
+DECISION_TRACE_FILE = os.getenv("DECISION_TRACE_FILE", "")
+
+# Multi-namespace mode (either an explicit comma-separated list or a label selector)
+K8S_NAMESPACES = [ns.strip() for ns in os.getenv("K8S_NAMESPACES", "").split(",") if ns.strip()]
+K8S_NAMESPACE_SELECTOR = os.getenv("K8S_NAMESPACE_SELECTOR", "")  # e.g. "sentinelops=enabled"
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", "8"))
+
+# Sharding namespaces across engine replicas (Lease-based membership + consistent hashing)
+SHARDING_ENABLED = os.getenv("SHARDING_ENABLED", "false").lower() == "true"
+ENGINE_REPLICA_ID = os.getenv("ENGINE_REPLICA_ID", os.getenv("HOSTNAME", ""))
+SHARD_LEASE_NAMESPACE = os.getenv("SHARD_LEASE_NAMESPACE", K8S_NAMESPACE)
+SHARD_LEASE_DURATION = int(os.getenv("SHARD_LEASE_DURATION", "15"))  # seconds
+SHARD_RENEW_INTERVAL = int(os.getenv("SHARD_RENEW_INTERVAL", "5"))  # seconds
+SHARD_VIRTUAL_NODES = int(os.getenv("SHARD_VIRTUAL_NODES", "64"))
 
 # Cost Configuration (example rates in $/hour)
 COST_PER_CPU_HOUR = float(os.getenv("COST_PER_CPU_HOUR", "0.0416"))
@@ -2,13 +2,15 @@
 SentinelOps MCP Server - Main FastAPI application
 Autonomous Kubernetes SRE powered by Model Context Protocol
 """
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import logging
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Dict
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -16,10 +18,14 @@ sys.path.append(str(Path(__file__).parent.parent))
 from tools.k8s_client import k8s_client
 from tools.prometheus import prometheus_client
 from tools.chaos import chaos_engine
+from tools.telemetry import metrics_registry, CONTENT_TYPE
 from agents.cost_analyzer import cost_analyzer
+from agents.incident_tracker import incident_tracker
+from agents.engine_service import engine_service
+from agents.scaler_agent import ScalerAgent, scaler_agent
 from mcp_server.config import (
     K8S_NAMESPACE, PROMETHEUS_URL, LOG_LEVEL, 
-    ACTIONS_LOG, INCIDENTS_LOG
+    ACTIONS_LOG, INCIDENTS_LOG, ENGINE_IN_PROCESS
 )
 
 # Initialize FastAPI app
@@ -66,6 +72,7 @@ def root():
             "core": {
                 "health": "/health",
                 "metrics": "/metrics",
+                "telemetry": "/metrics/prometheus",
                 "pods": "/pods",
                 "deployments": "/deployments",
                 "nodes": "/nodes"
@@ -76,6 +83,7 @@ def root():
             },
             "control": {
                 "scale": "/scale",
+                "scale_batch": "/scale/batch (POST)",
                 "restart": "/restart",
                 "delete_pod": "/delete_pod"
             },
@@ -87,8 +95,14 @@ def root():
             },
             "incidents": {
                 "list": "/incidents?limit=50",
+                "export": "/incidents/export",
                 "log": "/incidents (POST)"
             },
+            "engine": {
+                "status": "/engine/status",
+                "pause": "/engine/pause (POST)",
+                "resume": "/engine/resume (POST)"
+            },
             "chaos": {
                 "cpu_spike": "/simulate/cpu_spike",
                 "crash": "/simulate/crash",
@@ -180,6 +194,20 @@ def get_memory_metrics(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """
+    SentinelOps' own latency histograms and counters in Prometheus text
+    format. Cycle and action metrics are only here when the engine runs
+    in-process (ENGINE_IN_PROCESS=true); a standalone engine serves them on
+    its own port (ENGINE_METRICS_PORT)
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type=CONTENT_TYPE
+    )
+
+
 # ============================================================================
 # KUBERNETES RESOURCE ENDPOINTS
 # ============================================================================
@@ -188,7 +216,8 @@ def get_memory_metrics(
 def get_pods(namespace: str = Query(default=K8S_NAMESPACE)):
     """Get all pods in namespace"""
     try:
-        pods = k8s_client.get_pods(namespace)
+        snapshot = _engine_snapshot(namespace)
+        pods = snapshot["pods"] if snapshot else k8s_client.get_pods(namespace)
         return {
             "success": True,
             "namespace": namespace,
@@ -204,7 +233,8 @@ def get_pods(namespace: str = Query(default=K8S_NAMESPACE)):
 def get_deployments(namespace: str = Query(default=K8S_NAMESPACE)):
     """Get all deployments in namespace"""
     try:
-        deployments = k8s_client.get_deployments(namespace)
+        snapshot = _engine_snapshot(namespace)
+        deployments = snapshot["deployments"] if snapshot else k8s_client.get_deployments(namespace)
         return {
             "success": True,
             "namespace": namespace,
@@ -265,6 +295,28 @@ def scale_deployment(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/scale/batch")
+def scale_deployments_batch(
+    targets: Dict[str, int] = Body(..., embed=True),
+    namespace: str = Query(default=K8S_NAMESPACE)
+):
+    """Scale several deployments at once ({"targets": {"deployment": replicas, ...}})"""
+    if not targets:
+        raise HTTPException(status_code=400, detail="No targets given")
+    
+    try:
+        scaler = scaler_agent if namespace == K8S_NAMESPACE else ScalerAgent(namespace)
+        result = scaler.scale_many(targets, reason="batch scale via API")
+        log_action("scale_batch", ",".join(targets), namespace, {"targets": targets})
+        
+        result["timestamp"] = datetime.now().isoformat()
+        return result
+    
+    except Exception as e:
+        logger.error(f"Error batch scaling deployments: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/restart")
 def restart_deployment(
     deployment: str,
@@ -349,18 +401,8 @@ def get_pod_logs(
 def get_incidents(limit: int = Query(default=50)):
     """Get recent incidents from log file"""
     try:
-        incidents = []
-        incident_file = Path(INCIDENTS_LOG)
-        
-        if incident_file.exists():
-            with open(incident_file, 'r') as f:
-                lines = f.readlines()
-                for line in lines[-limit:]:
-                    try:
-                        incident = json.loads(line.strip())
-                        incidents.append(incident)
-                    except json.JSONDecodeError:
-                        continue
+        # Read backwards from the end of the newest segments only
+        incidents = incident_tracker.store.tail(limit) if limit > 0 else []
         
         return {
             "success": True,
@@ -372,14 +414,19 @@ def get_incidents(limit: int = Query(default=50)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/incidents/export")
+def export_incidents():
+    """Stream every stored incident as JSONL (whatever the storage backend)"""
+    return StreamingResponse(incident_tracker.export_jsonl(), media_type="application/x-ndjson")
+
+
 @app.post("/incidents")
 def log_incident(incident: dict):
     """Log a new incident"""
     try:
         incident["timestamp"] = datetime.now().isoformat()
         
-        with open(INCIDENTS_LOG, 'a') as f:
-            f.write(json.dumps(incident) + '\n')
+        incident_tracker.add_incident(incident)
         
         logger.info(f"Logged incident: {incident.get('type', 'unknown')}")
         
@@ -476,25 +523,22 @@ def get_dashboard_stats(hours: int = Query(default=24)):
     Combines metrics, cost, incidents, and recommendations
     """
     try:
-        # Gather all data
-        pods = k8s_client.get_pods(K8S_NAMESPACE)
-        deployments = k8s_client.get_deployments(K8S_NAMESPACE)
-        metrics = prometheus_client.get_all_metrics(K8S_NAMESPACE)
+        # Gather all data (reuse the in-process engine's snapshot when fresh)
+        snapshot = _engine_snapshot(K8S_NAMESPACE)
+        if snapshot:
+            pods = snapshot["pods"]
+            deployments = snapshot["deployments"]
+            metrics = snapshot["metrics"]
+        else:
+            pods = k8s_client.get_pods(K8S_NAMESPACE)
+            deployments = k8s_client.get_deployments(K8S_NAMESPACE)
+            metrics = prometheus_client.get_all_metrics(K8S_NAMESPACE)
         current_cost = cost_analyzer.calculate_current_cost()
         savings = cost_analyzer.calculate_savings(hours)
         recommendations = cost_analyzer.get_optimization_recommendations()
         
         # Get recent incidents
-        incidents = []
-        incident_file = Path(INCIDENTS_LOG)
-        if incident_file.exists():
-            with open(incident_file, 'r') as f:
-                lines = f.readlines()
-                for line in lines[-20:]:  # Last 20 incidents
-                    try:
-                        incidents.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        continue
+        incidents = incident_tracker.store.tail(20)  # Last 20 incidents
         
         # Calculate success rate
         successful_incidents = len([i for i in incidents if i.get('result', {}).get('success', False)])
@@ -557,8 +601,13 @@ def get_stats_summary():
     Quick summary stats (lighter version of dashboard/stats)
     """
     try:
-        pods = k8s_client.get_pods(K8S_NAMESPACE)
-        metrics = prometheus_client.get_all_metrics(K8S_NAMESPACE)
+        snapshot = _engine_snapshot(K8S_NAMESPACE)
+        if snapshot:
+            pods = snapshot["pods"]
+            metrics = snapshot["metrics"]
+        else:
+            pods = k8s_client.get_pods(K8S_NAMESPACE)
+            metrics = prometheus_client.get_all_metrics(K8S_NAMESPACE)
         current_cost = cost_analyzer.calculate_current_cost()
         
         return {
@@ -575,6 +624,54 @@ def get_stats_summary():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# DECISION ENGINE ENDPOINTS (in-process mode)
+# ============================================================================
+
+@app.get("/engine/status")
+def get_engine_status():
+    """
+    Live decision engine state: cycle counters, latency percentiles,
+    last cycle breakdown, pause state
+    """
+    try:
+        return {
+            "success": True,
+            "engine": engine_service.get_status()
+        }
+    except Exception as e:
+        logger.error(f"Error getting engine status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/engine/pause")
+def pause_engine():
+    """Pause the in-process decision engine after its current cycle"""
+    if not engine_service.running:
+        raise HTTPException(status_code=409, detail="Decision engine is not running in this process")
+    engine_service.pause()
+    log_action("engine_pause", "decision_engine", K8S_NAMESPACE, {})
+    return {
+        "success": True,
+        "paused": True,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/engine/resume")
+def resume_engine():
+    """Resume the in-process decision engine (runs a cycle immediately)"""
+    if not engine_service.running:
+        raise HTTPException(status_code=409, detail="Decision engine is not running in this process")
+    engine_service.resume()
+    log_action("engine_resume", "decision_engine", K8S_NAMESPACE, {})
+    return {
+        "success": True,
+        "paused": False,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 # ============================================================================
 # CHAOS / SIMULATION ENDPOINTS
 # ============================================================================
@@ -654,6 +751,13 @@ def chaos_status():
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _engine_snapshot(namespace: str):
+    """Fresh cluster snapshot from the in-process engine, if it covers namespace"""
+    if namespace != K8S_NAMESPACE:
+        return None
+    return engine_service.snapshot()
+
+
 def log_action(action_type: str, resource: str, namespace: str, details: dict):
     """Log an action to actions log"""
     action_entry = {
@@ -682,6 +786,15 @@ async def startup_event():
     # Ensure log directory exists
     Path(ACTIONS_LOG).parent.mkdir(parents=True, exist_ok=True)
     Path(INCIDENTS_LOG).parent.mkdir(parents=True, exist_ok=True)
+    
+    if ENGINE_IN_PROCESS:
+        await engine_service.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown"""
+    await engine_service.stop()
 
 
 if __name__ == "__main__":
@@ -96,6 +96,11 @@ def test_all_endpoints():
     results.append(test_endpoint("GET", "/incidents?limit=10", "Get incidents"))
     print()
     
+    # Decision Engine
+    print(f"{YELLOW}Testing Decision Engine Endpoints...{RESET}")
+    results.append(test_endpoint("GET", "/engine/status", "Engine status"))
+    print()
+    
     # Chaos Engineering
     print(f"{YELLOW}Testing Chaos Engineering Endpoints...{RESET}")
     results.append(test_endpoint("GET", "/chaos/status", "Chaos status"))
@@ -0,0 +1,13 @@
+"""
+Shared test setup: keep runtime files (incident log, scaler state) out of
+the repo's logs/ directory and never start kubectl watches
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="sentinelops-test-"))
+os.environ.setdefault("EVENT_WATCH_ENABLED", "false")
+
+sys.path.append(str(Path(__file__).parent.parent))
@@ -0,0 +1,98 @@
+"""
+Events watch tests
+"""
+import json
+
+import pytest
+
+from agents.decision_engine import DecisionEngine
+from agents.event_watcher import EventWatcher, decode_stream
+from agents.replay import ReplayK8sClient
+
+
+def _event(reason, name="web-1", message="", kind="Pod", count=1, type_="Warning"):
+    return {
+        "kind": "Event",
+        "type": type_,
+        "reason": reason,
+        "message": message,
+        "count": count,
+        "involvedObject": {"kind": kind, "name": name}
+    }
+
+
+def test_decode_stream_splits_documents_and_keeps_remainder():
+    first, second = json.dumps(_event("BackOff")), json.dumps(_event("Evicted"))
+    
+    objects, rest = decode_stream(first + "\n" + second + "\n" + second[:20])
+    
+    assert [o["reason"] for o in objects] == ["BackOff", "Evicted"]
+    assert rest == second[:20]
+    objects, rest = decode_stream(rest + second[20:])
+    assert [o["reason"] for o in objects] == ["Evicted"] and rest == ""
+
+
+@pytest.mark.parametrize("reason, message, issue_type", [
+    ("BackOff", "Back-off restarting failed container app", "pod_crashloop"),
+    ("FailedScheduling", "0/3 nodes are available: 3 Insufficient cpu.", "pod_unschedulable"),
+    ("Failed", 'Failed to pull image "web:v9": not found', "pod_image_pull"),
+    ("Evicted", "The node was low on resource: memory.", "pod_evicted"),
+    ("FailedMount", 'MountVolume.SetUp failed for volume "data"', "pod_failed_mount"),
+    ("FailedCreatePodSandBox", "Failed to create pod sandbox: network not ready", "pod_sandbox_failed"),
+])
+def test_warning_events_become_issues(reason, message, issue_type):
+    watcher = EventWatcher("demo")
+    
+    issue = watcher.handle(_event(reason, message=message))
+    
+    assert issue["type"] == issue_type
+    assert issue["resource"] == "web-1"
+    assert issue["source"] == "event"
+    assert watcher.drain() == [issue]
+
+
+@pytest.mark.parametrize("event", [
+    _event("BackOff", message="Back-off pulling image \"web:v9\""),  # reported as an image error
+    _event("Failed", message="Error: container exited"),
+    _event("Scheduled", type_="Normal"),
+    _event("SomethingElse"),
+])
+def test_other_events_are_ignored(event):
+    watcher = EventWatcher("demo")
+    
+    assert watcher.handle(event) is None
+    assert watcher.drain() == []
+
+
+def test_repeats_update_the_pending_count():
+    watcher = EventWatcher("demo")
+    watcher.handle(_event("FailedMount", count=1))
+    
+    assert watcher.handle(_event("FailedMount", count=7)) is None
+    assert [i["value"] for i in watcher.drain()] == [7]
+    assert watcher.handle(_event("FailedMount", count=8)) is None  # within the dedupe window
+
+
+def test_urgent_issue_wakes_subscribers_once_per_interval():
+    watcher = EventWatcher("demo", wake_interval=60)
+    woken = []
+    watcher.subscribe(lambda: woken.append(True))
+    
+    watcher.handle(_event("BackOff", name="web-1", message="Back-off restarting failed container"))
+    watcher.handle(_event("BackOff", name="web-2", message="Back-off restarting failed container"))
+    
+    assert woken == [True]
+
+
+def test_event_count_is_not_a_restart_count():
+    engine = DecisionEngine("demo", k8s=ReplayK8sClient("demo"))
+    issue = EventWatcher("demo").handle(
+        _event("BackOff", message="Back-off restarting failed container", count=250)
+    )
+    issue["deployment"] = "web"
+    
+    actions = engine.decide_actions([issue], {"deployments": [{"name": "web", "replicas": 4}]})
+    
+    assert actions[0]["type"] == "heal_deployment"
+    assert actions[0]["pod_states"] == [{"name": "web-1", "issue": "crashloop", "restarts": 0}]
+    assert engine.healer.plan_group(actions[0]["pod_states"], 4) == "delete_pods"
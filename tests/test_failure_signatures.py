@@ -0,0 +1,48 @@
+"""
+Crash log classification tests
+"""
+import pytest
+
+from tools.failure_signatures import UNRECOVERABLE, classify, dominant_cause
+
+
+@pytest.mark.parametrize("log, cause", [
+    ("java.lang.OutOfMemoryError: Java heap space", "oom"),
+    ('Error: secret "db-creds" not found', "missing_secret"),
+    ("panic: environment variable DATABASE_URL is not set", "missing_secret"),
+    ("FATAL failed to load config: yaml: line 3: mapping values are not allowed", "bad_config"),
+    ("flag provided but not defined: -listen", "bad_config"),
+    ("Error: unknown flag: --metrics-port", "bad_config"),
+    ("Error: open /etc/app/config.yaml: no such file or directory", "bad_config"),
+    ("exec /app/server: no such file or directory", "bad_config"),
+    ("open /data/db: permission denied", "permission_denied"),
+    ("dial tcp 10.0.0.5:5432: connect: connection refused", "connection_refused"),
+    ("Segmentation fault", "unknown"),
+])
+def test_classify(log, cause):
+    assert classify(log)["root_cause"] == cause
+
+
+@pytest.mark.parametrize("log", [
+    "WARN optional file /etc/app/overrides.yaml not loaded: no such file or directory",
+    "INFO stat /tmp/cache/index: no such file or directory, rebuilding",
+    "WARNING: unknown field 'replicas' in settings is deprecated and ignored",
+    "Deprecated: unknown option --legacy-mode will be removed in 2.0",
+])
+def test_warnings_are_not_unrecoverable(log):
+    assert classify(log)["root_cause"] not in UNRECOVERABLE
+
+
+def test_most_specific_cause_wins_and_evidence_is_its_line():
+    log = "connecting to db\nupstream: connection refused\nOOMKilled\n"
+    result = classify(log)
+    
+    assert result["root_cause"] == "oom"
+    assert result["matches"] == {"connection_refused": 1, "oom": 1}
+    assert result["evidence"] == "OOMKilled"
+
+
+def test_dominant_cause():
+    assert dominant_cause(["unknown", "oom", "bad_config", "bad_config"]) == "bad_config"
+    assert dominant_cause(["oom", "bad_config"]) == "oom"
+    assert dominant_cause(["unknown"]) is None
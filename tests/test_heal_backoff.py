@@ -0,0 +1,85 @@
+"""
+Pod delete backoff and give-up tests
+"""
+from agents.healer_agent import HealBackoff
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _backoff(clock, **kwargs):
+    settings = dict(base=60, max_delay=600, give_up=3, max_entries=100)
+    settings.update(kwargs)
+    return HealBackoff(clock=clock, **settings)
+
+
+def test_delay_doubles_between_deletes():
+    clock = Clock()
+    backoff = _backoff(clock)
+    
+    assert backoff.check("demo", "web-1") is None
+    backoff.record("demo", "web-1")
+    assert backoff.check("demo", "web-1")["retry_in_s"] == 60
+    
+    clock.now += 60
+    assert backoff.check("demo", "web-1") is None
+    backoff.record("demo", "web-1")
+    assert backoff.check("demo", "web-1")["retry_in_s"] == 120
+
+
+def test_gives_up_after_attempts():
+    clock = Clock()
+    backoff = _backoff(clock)
+    for _ in range(3):
+        backoff.record("demo", "web-1")
+        clock.now += 600
+    
+    result = backoff.check("demo", "web-1")
+    assert result["reason"] == "gave_up"
+    assert result["escalated"] is True
+    assert backoff.get_status()["gave_up"] == ["demo/web-1"]
+
+
+def test_quiet_history_starts_over():
+    clock = Clock()
+    backoff = _backoff(clock)
+    backoff.record("demo", "web-1")
+    backoff.record("demo", "web-1")
+    
+    clock.now += 2 * 600 + 1
+    assert backoff.check("demo", "web-1") is None
+    backoff.record("demo", "web-1")
+    assert backoff.check("demo", "web-1")["attempts"] == 1
+
+
+def test_escalated_pod_is_not_reset_until_pruned():
+    clock = Clock()
+    backoff = _backoff(clock)
+    for _ in range(3):
+        backoff.record("demo", "web-1")
+    
+    clock.now += 24 * 3600
+    assert backoff.check("demo", "web-1")["reason"] == "gave_up"
+    
+    backoff.prune("demo", ["web-1"])
+    assert backoff.check("demo", "web-1")["reason"] == "gave_up"
+    backoff.prune("demo", [])
+    assert backoff.check("demo", "web-1") is None
+
+
+def test_eviction_spares_escalated_entries():
+    clock = Clock()
+    backoff = _backoff(clock, max_entries=2)
+    for _ in range(3):
+        backoff.record("demo", "stuck")
+    backoff.record("demo", "web-1")
+    backoff.record("demo", "web-2")
+    
+    assert backoff.check("demo", "stuck")["reason"] == "gave_up"
+    assert backoff.check("demo", "web-1") is None
+    assert backoff.get_status()["tracked"] == 2
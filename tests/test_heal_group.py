@@ -0,0 +1,52 @@
+"""
+Per-deployment pod healing tests
+"""
+from agents.decision_engine import DecisionEngine
+from agents.healer_agent import HealerAgent
+from agents.replay import ReplayK8sClient
+
+
+def _healer():
+    healer = HealerAgent(namespace="demo", k8s=ReplayK8sClient("demo"))
+    healer.restart_threshold, healer.restart_fraction = 5, 0.5
+    return healer
+
+
+def _crashloop(name, restarts=1, **fields):
+    return dict({"name": name, "issue": "crashloop", "restarts": restarts}, **fields)
+
+
+def test_plan_group():
+    healer = _healer()
+    
+    assert healer.plan_group([_crashloop("web-1")], 4) == "delete_pods"
+    assert healer.plan_group([_crashloop("web-1", restarts=6)], 4) == "restart_deployment"
+    assert healer.plan_group([_crashloop("web-1"), {"name": "web-2", "issue": "pending"}], 4) == "restart_deployment"
+    assert healer.plan_group([_crashloop("web-1"), _crashloop("web-2")], 2) == "escalate"
+    assert healer.plan_group([_crashloop("web-1", root_cause="missing_secret")], 4) == "escalate"
+    assert healer.plan_group([_crashloop("web-1", root_cause="connection_refused")], 4) == "delete_pods"
+
+
+def test_one_action_per_deployment():
+    engine = DecisionEngine("demo", k8s=ReplayK8sClient("demo"))
+    issues = [
+        {"type": "pod_crashloop", "severity": "high", "value": 2, "message": "web-1 crashloops",
+         "resource": "web-1", "deployment": "web"},
+        {"type": "pod_pending", "severity": "medium", "value": 900, "message": "web-2 pending",
+         "resource": "web-2", "deployment": "web"},
+        {"type": "pod_failed", "severity": "high", "message": "api-1 failed",
+         "resource": "api-1", "deployment": "api"}
+    ]
+    metrics = {"deployments": [{"name": "web", "replicas": 4}, {"name": "api", "replicas": 2}]}
+    
+    actions = {a["deployment"]: a for a in engine.decide_actions(issues, metrics)}
+    
+    assert set(actions) == {"web", "api"}
+    assert actions["web"]["type"] == "heal_deployment"
+    assert actions["web"]["pods"] == ["web-1", "web-2"]
+    assert actions["web"]["deployment_replicas"] == 4
+    assert actions["web"]["severity"] == "high"
+    assert actions["web"]["pod_states"] == [
+        {"name": "web-1", "issue": "crashloop", "restarts": 2},
+        {"name": "web-2", "issue": "pending", "restarts": 0}
+    ]
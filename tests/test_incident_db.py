@@ -0,0 +1,43 @@
+"""
+SQLite incident backend tests
+"""
+import threading
+
+from agents import incident_db
+from agents.incident_db import SQLiteIncidentStore
+from agents.incident_store import record_time
+
+
+def _incident(i, ts):
+    return {"id": f"inc-{i}", "timestamp": ts, "issue": {"type": "pod_crashloop", "severity": "high"}}
+
+
+def test_read_range_resumes_on_another_thread(tmp_path, monkeypatch):
+    monkeypatch.setattr(incident_db, "READ_BATCH", 3)
+    store = SQLiteIncidentStore(str(tmp_path / "incidents.db"), import_from=None)
+    for i in range(10):
+        # Pairs share a timestamp, so batches split between equal ts values
+        store.append(_incident(i, f"2024-01-01T00:00:{i // 2:02d}"))
+    
+    records = store.read_range()
+    ids = [next(records)["id"]]
+    
+    def resume():
+        ids.extend(record["id"] for record in records)
+    
+    thread = threading.Thread(target=resume)
+    thread.start()
+    thread.join()
+    
+    assert ids == [f"inc-{i}" for i in range(10)]
+
+
+def test_read_range_bounds_are_inclusive(tmp_path):
+    store = SQLiteIncidentStore(str(tmp_path / "incidents.db"), import_from=None)
+    for i in range(5):
+        store.append(_incident(i, f"2024-01-01T00:00:0{i}"))
+    
+    since = record_time(_incident(1, "2024-01-01T00:00:01"))
+    until = record_time(_incident(3, "2024-01-01T00:00:03"))
+    
+    assert [r["id"] for r in store.read_range(since, until)] == ["inc-1", "inc-2", "inc-3"]
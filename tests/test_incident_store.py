@@ -0,0 +1,85 @@
+"""
+Incident store tests
+"""
+import threading
+
+from agents.incident_store import IncidentStore
+
+
+def _ids(store):
+    return [record["id"] for record in store.read_range()]
+
+
+def test_two_writers_share_rotated_segments(tmp_path):
+    path = tmp_path / "incidents.log"
+    a = IncidentStore(str(path), segment_bytes=300, index_bytes=100)
+    b = IncidentStore(str(path), segment_bytes=300, index_bytes=100)
+    
+    expected = []
+    for i in range(20):
+        for name, store in (("a", a), ("b", b)):
+            store.append({"id": f"{name}{i}", "timestamp": f"2024-01-01T00:00:{i:02d}"})
+            store.flush()
+            expected.append(f"{name}{i}")
+    
+    assert len(IncidentStore(str(path)).sealed_segments()) > 1
+    assert _ids(IncidentStore(str(path))) == expected
+
+
+def test_append_after_other_writer_rotates(tmp_path):
+    path = tmp_path / "incidents.log"
+    a = IncidentStore(str(path), segment_bytes=300)
+    b = IncidentStore(str(path), segment_bytes=300)
+    
+    b.append({"id": "b0", "timestamp": "2024-01-01T00:00:00"})
+    b.flush()
+    for i in range(10):
+        a.append({"id": f"a{i}", "timestamp": f"2024-01-01T00:00:{i + 1:02d}"})
+    a.flush()
+    b.append({"id": "b1", "timestamp": "2024-01-01T00:00:59"})
+    b.flush()
+    
+    assert b'"b1"' in path.read_bytes()
+    assert _ids(IncidentStore(str(path)))[-1] == "b1"
+
+
+def test_append_after_other_writer_compacts(tmp_path):
+    path = tmp_path / "incidents.log"
+    a = IncidentStore(str(path))
+    b = IncidentStore(str(path))
+    
+    a.append({"id": "a1", "timestamp": "2024-01-01T00:00:01", "result": None})
+    a.flush()
+    b.append({"id": "b1", "timestamp": "2024-01-01T00:00:02"})
+    b.flush()
+    a.append_update("a1", {"result": {"success": True}}, ref_ts=0)
+    assert a.compact(0) == 1
+    b.append({"id": "b2", "timestamp": "2024-01-01T00:00:03"})
+    b.flush()
+    
+    records = list(IncidentStore(str(path)).read_range())
+    assert [record["id"] for record in records] == ["a1", "b1", "b2"]
+    assert records[0]["result"] == {"success": True}
+
+
+def test_compaction_keeps_concurrent_appends(tmp_path):
+    path = tmp_path / "incidents.log"
+    a = IncidentStore(str(path))
+    b = IncidentStore(str(path))
+    for i in range(200):
+        a.append({"id": f"a{i}", "timestamp": "2024-01-01T00:00:00", "result": None})
+    
+    def writer():
+        for i in range(200):
+            b.append({"id": f"b{i}", "timestamp": "2024-01-01T00:00:01"})
+            b.flush()
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for i in range(200):
+        a.append_update(f"a{i}", {"result": {"success": True}}, ref_ts=0)
+        a.compact(0)
+    thread.join()
+    
+    ids = _ids(IncidentStore(str(path)))
+    assert sorted(ids) == sorted([f"a{i}" for i in range(200)] + [f"b{i}" for i in range(200)])
@@ -0,0 +1,118 @@
+"""
+OOMKilled detection and memory right-sizing tests
+"""
+import time
+
+from agents.decision_engine import DecisionEngine
+from agents.healer_agent import HealerAgent
+from agents.monitor_agent import MonitorAgent
+from agents.replay import ReplayK8sClient
+from tools.k8s_client import format_memory, parse_memory
+
+MI = 1024 ** 2
+
+
+def _pod(name, **fields):
+    pod = {
+        "name": name,
+        "status": "Running",
+        "restarts": 3,
+        "deployment": "web",
+        "waiting_reason": None,
+        "last_termination_reason": None,
+        "oom_container": None,
+        "oom_finished_at": None,
+        "oom_container_ready": None,
+        "oom_container_waiting": None
+    }
+    pod.update(fields)
+    return pod
+
+
+def _metrics(pods, event_issues=()):
+    monitor = MonitorAgent("demo", ReplayK8sClient("demo"))
+    return {
+        "namespace": "demo",
+        "cpu_usage": 10.0,
+        "memory_usage": 10.0,
+        "pod_count": len(pods),
+        "pod_status": monitor._analyze_pod_status(pods),
+        "deployments": [{"name": "web", "replicas": 3, "ready_replicas": 2}],
+        "container_restarts": 0,
+        "event_issues": list(event_issues)
+    }
+
+
+def test_parse_memory():
+    assert parse_memory("256Mi") == 256 * MI
+    assert parse_memory("1G") == 1000 ** 3
+    assert parse_memory("134217728") == 134217728
+    assert parse_memory("lots") is None
+    assert parse_memory(None) is None
+    assert format_memory(256 * MI + 1) == "257Mi"
+
+
+def test_recommend_memory_limit_is_stepped_and_capped():
+    healer = HealerAgent(namespace="demo", k8s=ReplayK8sClient("demo"))
+    
+    assert healer.recommend_memory_limit(256 * MI, 100 * MI) == 320 * MI  # one step up
+    assert healer.recommend_memory_limit(256 * MI, 300 * MI) == int(300 * MI * 1.3)  # peak + headroom
+    assert healer.recommend_memory_limit(256 * MI, 1024 * MI) == 512 * MI  # at most doubled
+    assert healer.recommend_memory_limit(3 * 1024 * MI, 4 * 1024 * MI) == 4 * 1024 * MI  # ceiling
+
+
+def test_oom_reported_when_sidecar_exited_with_error():
+    pod = _pod(
+        "web-1",
+        last_termination_reason="Error",  # the sidecar, listed first
+        oom_container="app",
+        oom_finished_at=time.time() - 60,
+        oom_container_ready=False
+    )
+    status = MonitorAgent("demo", ReplayK8sClient("demo"))._analyze_pod_status([pod])
+    
+    assert status["problematic_pods"][0]["issue"] == "oom_killed"
+    assert status["problematic_pods"][0]["container"] == "app"
+
+
+def test_stale_oom_on_healthy_pod_is_ignored():
+    pod = _pod(
+        "web-1",
+        last_termination_reason="OOMKilled",
+        oom_container="app",
+        oom_finished_at=time.time() - 86400,
+        oom_container_ready=True
+    )
+    status = MonitorAgent("demo", ReplayK8sClient("demo"))._analyze_pod_status([pod])
+    
+    assert status["problematic_pods"] == []
+    assert status["counts"]["running"] == 1
+
+
+def test_crashlooping_oom_pod_is_right_sized_not_restarted():
+    pod = _pod(
+        "web-1",
+        waiting_reason="CrashLoopBackOff",
+        last_termination_reason="OOMKilled",
+        oom_container="app",
+        oom_finished_at=time.time() - 60,
+        oom_container_ready=False,
+        oom_container_waiting="CrashLoopBackOff"
+    )
+    backoff = {
+        "type": "pod_crashloop",
+        "severity": "high",
+        "value": 40,
+        "message": "Pod web-1: BackOff - Back-off restarting failed container",
+        "resource": "web-1",
+        "deployment": "web",
+        "source": "event"
+    }
+    metrics = _metrics([pod], [backoff])
+    engine = DecisionEngine("demo", k8s=ReplayK8sClient("demo"))
+    
+    issues = engine.monitor.analyze_metrics(metrics)
+    actions = engine.decide_actions(issues, metrics)
+    
+    assert {i["type"] for i in issues} >= {"pod_oom_killed", "pod_crashloop"}
+    assert [a["type"] for a in actions] == ["right_size_memory"]
@@ -0,0 +1,72 @@
+"""
+Pod ownership index tests
+"""
+from tools.owner_index import OwnerIndex, controller_owner
+
+
+def _pod(name, kind, owner):
+    return {"name": name, "owner_kind": kind, "owner_name": owner}
+
+
+def _index():
+    index = OwnerIndex()
+    index.update_pods("demo", [
+        _pod("web-abc-1", "ReplicaSet", "web-abc"),
+        _pod("web-abc-2", "ReplicaSet", "web-abc"),
+        _pod("db-0", "StatefulSet", "db"),
+        _pod("debug", None, None)
+    ])
+    index.update_replicasets("demo", [{"name": "web-abc", "owner_kind": "Deployment", "owner_name": "web"}])
+    return index
+
+
+def test_controller_owner_prefers_the_controller_reference():
+    metadata = {"ownerReferences": [
+        {"kind": "Node", "name": "node-1"},
+        {"kind": "ReplicaSet", "name": "web-abc", "controller": True}
+    ]}
+    
+    assert controller_owner(metadata) == ("ReplicaSet", "web-abc")
+    assert controller_owner({"ownerReferences": [{"kind": "Job", "name": "backup"}]}) == ("Job", "backup")
+    assert controller_owner({}) == (None, None)
+
+
+def test_pods_resolve_through_replicasets_to_deployments():
+    index = _index()
+    
+    assert index.deployment_for_pod("demo", "web-abc-1") == "web"
+    assert index.workload_for_pod("demo", "db-0") == ("StatefulSet", "db")
+    assert index.deployment_for_pod("demo", "db-0") is None
+    assert index.workload_for_pod("demo", "debug") is None
+    assert index.pods_for_deployment("demo", "web") == ["web-abc-1", "web-abc-2"]
+    assert index.pods_for_deployment("other", "web") == []
+
+
+def test_unknown_replicaset_is_reported_until_linked():
+    index = OwnerIndex()
+    index.update_pods("demo", [_pod("web-abc-1", "ReplicaSet", "web-abc")])
+    
+    assert index.unresolved_replicasets("demo") == {"web-abc"}
+    assert index.deployment_for_pod("demo", "web-abc-1") is None
+    
+    index.update_replicasets("demo", [{"name": "web-abc", "owner_kind": "Deployment", "owner_name": "web"}])
+    assert index.unresolved_replicasets("demo") == set()
+    assert index.pods_for_deployment("demo", "web") == ["web-abc-1"]
+
+
+def test_listing_removes_missing_pods_and_rehomes_moved_ones():
+    index = _index()
+    index.update_replicasets("demo", [
+        {"name": "web-abc", "owner_kind": "Deployment", "owner_name": "web"},
+        {"name": "web-def", "owner_kind": "Deployment", "owner_name": "web"}
+    ])
+    
+    index.update_pods("demo", [
+        _pod("web-abc-2", "ReplicaSet", "web-abc"),
+        _pod("web-def-1", "ReplicaSet", "web-def"),
+        _pod("db-0", "StatefulSet", "db")
+    ])
+    
+    assert index.pods_for_deployment("demo", "web") == ["web-abc-2", "web-def-1"]
+    assert index.owner_of("demo", "debug") == (None, None)
+    assert index.get_status()["demo"] == {"pods": 3, "replicasets": 2, "workloads": 2}
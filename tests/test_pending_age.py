@@ -0,0 +1,61 @@
+"""
+Pending pod age tests
+"""
+import sys
+import time
+
+from agents.healer_agent import HealerAgent
+from agents.monitor_agent import MonitorAgent
+from agents.replay import ReplayK8sClient
+
+
+def _pending_pod(name, age, reason="Unschedulable"):
+    return {
+        "name": name,
+        "status": "Pending",
+        "restarts": 0,
+        "deployment": "web",
+        "created_at": time.time() - age,
+        "conditions": {"PodScheduled": {"status": "False", "reason": reason}}
+    }
+
+
+def test_pending_details():
+    now = time.time()
+    details = MonitorAgent._pending_details(_pending_pod("web-1", 120), now)
+    
+    assert 119 <= details["pending_seconds"] <= 121
+    assert details["pending_reason"] == "Unschedulable"
+    assert MonitorAgent._pending_details({"name": "old-trace"}, now) == {
+        "pending_seconds": None, "pending_reason": None
+    }
+
+
+def test_only_pods_pending_past_the_threshold_are_issues(monkeypatch):
+    monkeypatch.setattr(sys.modules["agents.monitor_agent"], "PENDING_AGE_THRESHOLD", 300)
+    monitor = MonitorAgent("demo", ReplayK8sClient("demo"))
+    pods = [_pending_pod("web-new", 30), _pending_pod("web-old", 900)]
+    metrics = {
+        "cpu_usage": 10.0,
+        "memory_usage": 10.0,
+        "deployments": [],
+        "pod_status": monitor._analyze_pod_status(pods),
+        "container_restarts": 0
+    }
+    
+    issues = [i for i in monitor.analyze_metrics(metrics) if i["type"] == "pod_pending"]
+    
+    assert [i["resource"] for i in issues] == ["web-old"]
+    assert "(Unschedulable)" in issues[0]["message"]
+    assert issues[0]["threshold"] == 300
+
+
+def test_healer_leaves_recent_pending_pods_alone():
+    healer = HealerAgent(namespace="demo", k8s=ReplayK8sClient("demo"))
+    healer.pending_age_threshold = 300
+    
+    result = healer.heal_pending({"name": "web-new", "pending_seconds": 30})
+    assert result["reason"] == "pending_too_recent"
+    
+    result = healer.heal_pending({"name": "web-new", "created_at": time.time() - 60})
+    assert result["reason"] == "pending_too_recent"
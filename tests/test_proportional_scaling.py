@@ -0,0 +1,44 @@
+"""
+Target-based replica recommendation tests
+"""
+from agents.replay import ReplayK8sClient
+from agents.scale_schedule import ScaleSchedule
+from agents.scaler_agent import ScalerAgent
+
+
+def _scaler():
+    scaler = ScalerAgent("demo", ReplayK8sClient("demo"))
+    scaler.min_replicas, scaler.max_replicas = 1, 20
+    scaler.targets = {"cpu": 60.0, "memory": 70.0}
+    scaler.tolerance = 0.1
+    scaler.schedule = ScaleSchedule(path=None)
+    return scaler
+
+
+def test_ratio_within_tolerance_keeps_current():
+    scaler = _scaler()
+    
+    assert scaler.recommend_replicas(4, {"cpu": 65.0}) == 4  # ratio 1.08
+    assert scaler.recommend_replicas(4, {"cpu": 55.0}) == 4  # ratio 0.92
+
+
+def test_scales_proportionally_outside_tolerance():
+    scaler = _scaler()
+    
+    assert scaler.recommend_replicas(4, {"cpu": 90.0}) == 6  # ceil(4 * 1.5)
+    assert scaler.recommend_replicas(4, {"cpu": 30.0}) == 2
+    assert scaler.recommend_replicas(3, {"cpu": 61.0, "memory": 75.0}) == 3
+
+
+def test_largest_resource_wins_and_unknown_values_are_skipped():
+    scaler = _scaler()
+    
+    assert scaler.recommend_replicas(4, {"cpu": 30.0, "memory": 105.0}) == 6
+    assert scaler.recommend_replicas(4, {"cpu": None, "gpu": 99.0}) == 4
+
+
+def test_result_is_clamped_to_replica_limits():
+    scaler = _scaler()
+    
+    assert scaler.recommend_replicas(10, {"cpu": 300.0}) == 20
+    assert scaler.recommend_replicas(2, {"cpu": 1.0}) == 1
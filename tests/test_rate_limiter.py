@@ -0,0 +1,94 @@
+"""
+Remediation token bucket tests
+"""
+from agents.rate_limiter import RemediationRateLimiter, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock, **kwargs):
+    settings = dict(
+        global_rate=60, global_burst=10,
+        namespace_rate=30, namespace_burst=5,
+        deployment_rate=6, deployment_burst=2
+    )
+    settings.update(kwargs)
+    return RemediationRateLimiter(clock=clock, **settings)
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=2.0, capacity=4, now=0.0)
+    bucket.tokens = 0
+    
+    assert bucket.refill(1.0) == 2.0
+    assert bucket.refill(0.5) == 2.0  # time going backwards adds nothing
+    assert bucket.refill(10.0) == 4
+
+
+def test_deployment_tier_limits_first():
+    clock = Clock()
+    limiter = _limiter(clock)
+    
+    assert limiter.try_acquire("demo", "web") == (True, None)
+    assert limiter.try_acquire("demo", "web") == (True, None)
+    assert limiter.try_acquire("demo", "web") == (False, "deployment")
+    assert limiter.try_acquire("demo", "api") == (True, None)
+    
+    clock.now += 10  # one deployment token per 10s
+    assert limiter.try_acquire("demo", "web") == (True, None)
+
+
+def test_namespace_and_global_tiers():
+    clock = Clock()
+    limiter = _limiter(clock)
+    
+    for i in range(5):
+        assert limiter.try_acquire("demo", f"d{i}")[0]
+    assert limiter.try_acquire("demo", "d9") == (False, "namespace")
+    for i in range(5):
+        assert limiter.try_acquire("other", f"d{i}")[0]
+    assert limiter.try_acquire("third") == (False, "global")
+
+
+def test_rejected_write_costs_no_tokens():
+    clock = Clock()
+    limiter = _limiter(clock, namespace_burst=1)
+    limiter.try_acquire("demo", "web")
+    
+    for _ in range(5):
+        assert limiter.try_acquire("demo", "api") == (False, "namespace")
+    clock.now += 2  # namespace refills one token; api's own bucket is still full
+    assert limiter.try_acquire("demo", "api") == (True, None)
+
+
+def test_check_returns_rate_limited_result():
+    limiter = _limiter(Clock(), deployment_burst=1)
+    
+    assert limiter.check("delete_pod", "demo", "web") is None
+    result = limiter.check("delete_pod", "demo", "web")
+    
+    assert result == {
+        "success": False,
+        "reason": "rate_limited",
+        "limit": "deployment",
+        "action": "delete_pod",
+        "target": "demo/web"
+    }
+
+
+def test_full_buckets_are_pruned():
+    clock = Clock()
+    limiter = _limiter(clock, max_buckets=4)
+    limiter.try_acquire("demo", "web")
+    clock.now += 3600
+    
+    limiter.try_acquire("demo", "api")
+    limiter.try_acquire("demo", "worker")
+    
+    assert limiter.get_status()["tracked_buckets"] <= 4
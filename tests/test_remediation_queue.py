@@ -0,0 +1,63 @@
+"""
+Remediation queue ordering and expiry tests
+"""
+from agents.remediation_queue import SEVERITY_DEADLINE, RemediationQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _drain(queue):
+    actions = []
+    while True:
+        action = queue.pop()
+        if action is None:
+            return actions
+        actions.append(action["type"])
+
+
+def test_severity_first_then_oldest_detection():
+    queue = RemediationQueue(Clock())
+    queue.push(queue.stamp({"type": "scale_down"}, "low", 900), cycle=1)
+    queue.push(queue.stamp({"type": "heal_new"}, "high", 990), cycle=1)
+    queue.push(queue.stamp({"type": "scale_up"}, "medium", 950), cycle=1)
+    queue.push(queue.stamp({"type": "heal_old"}, "high", 980), cycle=1)
+    queue.push({"type": "unstamped"}, cycle=1)
+    
+    assert _drain(queue) == ["heal_old", "heal_new", "scale_up", "scale_down", "unstamped"]
+
+
+def test_equal_keys_keep_insertion_order():
+    queue = RemediationQueue(Clock())
+    for name in ("a", "b", "c"):
+        queue.push(queue.stamp({"type": name}, "high", 990), cycle=1)
+    
+    assert _drain(queue) == ["a", "b", "c"]
+
+
+def test_deadline_is_measured_from_detection():
+    clock = Clock()
+    queue = RemediationQueue(clock)
+    action = queue.stamp({"type": "heal_deployment"}, "high", detected_at=990)
+    
+    assert action["deadline"] == 990 + SEVERITY_DEADLINE["high"]
+    assert not queue.is_expired(action, now=action["deadline"])
+    assert queue.is_expired(action, now=action["deadline"] + 1)
+    assert queue.get_status()["expired"] == 1
+
+
+def test_supersede_drops_earlier_cycles():
+    queue = RemediationQueue(Clock())
+    queue.push(queue.stamp({"type": "old"}, "high"), cycle=1)
+    queue.push(queue.stamp({"type": "new"}, "low"), cycle=2)
+    
+    stale = queue.supersede(2)
+    
+    assert [a["type"] for a in stale] == ["old"]
+    assert _drain(queue) == ["new"]
+    assert queue.get_status()["superseded"] == 1
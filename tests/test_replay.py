@@ -0,0 +1,31 @@
+"""
+Replay client tests
+"""
+from agents.healer_agent import HealerAgent
+from agents.replay import ReplayK8sClient
+
+
+def test_run_command_accepts_timeout():
+    client = ReplayK8sClient("demo")
+    result = client._run_command(["kubectl", "get", "pods"], timeout=2)
+    assert result["success"] is True
+
+
+def test_diagnose_reads_previous_logs_under_replay():
+    client = ReplayK8sClient("demo")
+    client.load({
+        "pods": [],
+        "metrics": {},
+        "logs": {
+            "web-1": "starting\nError: secret \"db-creds\" not found\n",
+            "web-2": "java.lang.OutOfMemoryError: Java heap space\n"
+        }
+    })
+    healer = HealerAgent(namespace="demo", k8s=client)
+    
+    diagnosis = healer.diagnose(["web-1", "web-2", "web-3"])
+    
+    assert diagnosis["web-1"]["root_cause"] == "missing_secret"
+    assert diagnosis["web-2"]["root_cause"] == "oom"
+    assert diagnosis["web-3"]["root_cause"] == "unknown"
+    assert not any(d.get("timed_out") for d in diagnosis.values())
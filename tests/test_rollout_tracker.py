@@ -0,0 +1,85 @@
+"""
+Post-scale rollout tracking tests
+"""
+import time
+
+from agents.replay import ReplayK8sClient
+from agents.rollout_tracker import RolloutTracker
+
+
+class FakeIncidents:
+    def __init__(self):
+        self.updates = {}
+    
+    def update_incident(self, incident_id, result):
+        self.updates[incident_id] = result
+
+
+def _client(replicas, ready):
+    client = ReplayK8sClient("demo")
+    client.load({"metrics": {"deployments": [
+        {"name": "web", "replicas": replicas, "ready_replicas": ready}
+    ]}})
+    return client
+
+
+def _tracker(timeout=60):
+    tracker = RolloutTracker(poll_interval=0.01, timeout=timeout)
+    tracker.tracker = FakeIncidents()
+    return tracker
+
+
+def _wait_idle(tracker, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while tracker.active() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert tracker.active() == []
+
+
+def test_scale_up_finishes_when_ready():
+    tracker = _tracker()
+    client = _client(replicas=5, ready=3)
+    tracker.track("demo", "web", target=5, previous=3, incident_id="inc-1", k8s=client)
+    time.sleep(0.05)
+    assert tracker.active()[0]["ready"] == 3
+    
+    client.deployments[0]["ready_replicas"] = 5
+    _wait_idle(tracker)
+    
+    update = tracker.tracker.updates["inc-1"]
+    assert update["success"] is True
+    assert update["new_state"]["rollout"] == "ready"
+    assert tracker.startup_estimate("demo", "web") is not None
+
+
+def test_scale_down_converges_when_ready_drops():
+    tracker = _tracker()
+    tracker.track("demo", "web", target=2, previous=4, incident_id="inc-2", k8s=_client(replicas=2, ready=2))
+    _wait_idle(tracker)
+    
+    assert tracker.tracker.updates["inc-2"]["success"] is True
+    assert tracker.startup_estimate("demo", "web") is None  # only scale-ups feed the estimate
+
+
+def test_rollout_times_out():
+    tracker = _tracker(timeout=0)
+    tracker.track("demo", "web", target=5, previous=3, incident_id="inc-3", k8s=_client(replicas=5, ready=3))
+    _wait_idle(tracker)
+    
+    update = tracker.tracker.updates["inc-3"]
+    assert update["success"] is False
+    assert update["new_state"]["rollout"] == "timed_out"
+
+
+def test_newer_scale_supersedes_without_updating_the_incident():
+    tracker = _tracker()
+    client = _client(replicas=5, ready=3)
+    tracker.track("demo", "web", target=5, previous=3, incident_id="inc-4", k8s=client)
+    tracker.track("demo", "web", target=8, previous=5, incident_id="inc-5", k8s=client)
+    
+    assert [w["target"] for w in tracker.active()] == [8]
+    client.deployments[0].update(replicas=8, ready_replicas=8)
+    _wait_idle(tracker)
+    
+    assert "inc-4" not in tracker.tracker.updates
+    assert tracker.tracker.updates["inc-5"]["success"] is True
@@ -0,0 +1,47 @@
+"""
+Bulk scaling tests
+"""
+from agents.replay import ReplayK8sClient
+from agents.scaler_agent import ScalerAgent
+from tools.k8s_client import K8sClient
+
+
+class FailingK8sClient(K8sClient):
+    """Every kubectl call fails, as during an API outage"""
+    
+    def _run_command(self, cmd, input=None, timeout=5):
+        return {"success": False, "output": "", "error": "connection refused"}
+
+
+def _scaler():
+    client = ReplayK8sClient("batch")
+    client.load({"metrics": {"deployments": [
+        {"name": "web", "replicas": 2},
+        {"name": "api", "replicas": 3},
+        {"name": "worker", "replicas": 4}
+    ]}})
+    scaler = ScalerAgent("batch", client)
+    scaler.min_replicas, scaler.max_replicas = 1, 10
+    return scaler
+
+
+def test_targets_are_validated_and_applied_together():
+    result = _scaler().scale_many({"web": 5, "api": 3, "worker": 50, "missing": 2, "cache": "3"})
+    results = result["results"]
+    
+    assert results["web"]["action"] == "scale_up" and results["web"]["to"] == 5
+    assert results["api"]["reason"] == "already_at_target"
+    assert results["worker"]["reason"] == "out_of_range"
+    assert results["missing"]["reason"] == "not_found"
+    assert results["cache"]["reason"] == "not_found"
+    assert (result["applied"], result["failed"], result["success"]) == (1, 3, False)
+
+
+def test_failed_listing_is_a_k8s_error_not_not_found():
+    scaler = ScalerAgent("batch", FailingK8sClient("batch"))
+    
+    result = scaler.scale_many({"web": 2, "api": 3})
+    
+    assert result["reason"] == "k8s_error"
+    assert result["failed"] == 2
+    assert {r["reason"] for r in result["results"].values()} == {"k8s_error"}
@@ -0,0 +1,78 @@
+"""
+Scheduled scaling tests
+"""
+from datetime import datetime
+
+import pytest
+
+from agents.replay import ReplayK8sClient
+from agents.scale_schedule import CronExpr, ScaleSchedule
+from agents.scaler_agent import ScalerAgent
+
+# A Monday
+MONDAY_8AM = datetime(2024, 1, 1, 8, 0)
+
+
+def test_cron_fields():
+    cron = CronExpr("*/15 8-10 * * 1-5")
+    
+    assert cron.matches(MONDAY_8AM)
+    assert cron.matches(MONDAY_8AM.replace(hour=10, minute=45))
+    assert not cron.matches(MONDAY_8AM.replace(minute=5))
+    assert not cron.matches(MONDAY_8AM.replace(hour=11))
+    assert not cron.matches(datetime(2024, 1, 6, 8, 0))  # Saturday
+
+
+def test_cron_day_fields_match_either_when_both_restricted():
+    cron = CronExpr("0 0 1 * 0")
+    
+    assert cron.matches(datetime(2024, 2, 1, 0, 0))  # 1st, a Thursday
+    assert cron.matches(datetime(2024, 1, 7, 0, 0))  # a Sunday
+    assert CronExpr("0 0 * * 7").matches(datetime(2024, 1, 7, 0, 0))
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "60 * * * *", "* * * * 8", "*/0 * * * *", "5-1 * * * *"])
+def test_invalid_cron_is_rejected(expr):
+    with pytest.raises(ValueError):
+        CronExpr(expr)
+
+
+def _schedule(*entries):
+    schedule = ScaleSchedule(path=None)
+    schedule.load(list(entries))
+    return schedule
+
+
+def test_bounds_cover_lead_and_duration():
+    schedule = _schedule({
+        "deployment": "api", "cron": "0 8 * * 1-5",
+        "duration_minutes": 60, "lead_minutes": 10, "min_replicas": 6
+    })
+    
+    assert schedule.bounds("demo", "api", MONDAY_8AM.replace(hour=7, minute=49)) == (None, None)
+    assert schedule.bounds("demo", "api", MONDAY_8AM.replace(hour=7, minute=50)) == (6, None)
+    assert schedule.bounds("demo", "api", MONDAY_8AM.replace(minute=59)) == (6, None)
+    assert schedule.bounds("demo", "api", MONDAY_8AM.replace(hour=9)) == (None, None)
+    assert schedule.bounds("demo", "web", MONDAY_8AM) == (None, None)
+
+
+def test_overlapping_entries_combine_and_bad_entries_are_skipped():
+    schedule = _schedule(
+        {"deployment": "api", "cron": "0 8 * * *", "min_replicas": "4", "max_replicas": 9},
+        {"deployment": "api", "cron": "0 8 * * *", "min_replicas": 6, "max_replicas": 8},
+        {"deployment": "api", "cron": "0 8 * * *", "min_replicas": 9, "max_replicas": 2},
+        {"deployment": "api", "cron": "0 8 * *", "min_replicas": 20},
+        {"cron": "0 8 * * *", "min_replicas": 20}
+    )
+    
+    assert len(schedule.entries) == 2
+    assert schedule.bounds("demo", "api", MONDAY_8AM) == (6, 8)
+
+
+def test_floor_above_max_replicas_is_clamped():
+    scaler = ScalerAgent("demo", ReplayK8sClient("demo"))
+    scaler.min_replicas, scaler.max_replicas = 1, 10
+    scaler.schedule = _schedule({"deployment": "api", "cron": "0 8 * * *", "min_replicas": 25})
+    
+    assert scaler.replica_limits("api", MONDAY_8AM) == (10, 10)
+    assert scaler.replica_limits("api", MONDAY_8AM.replace(hour=12)) == (1, 10)
@@ -0,0 +1,53 @@
+"""
+Scale cooldown and stabilization window tests
+"""
+from agents.scaler_agent import ScaleStabilizer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stabilizer(clock, state_file=None):
+    return ScaleStabilizer(state_file, up_cooldown=60, down_cooldown=300, window=300, clock=clock)
+
+
+def test_cooldown_per_direction():
+    clock = Clock()
+    stabilizer = _stabilizer(clock)
+    assert stabilizer.cooldown_remaining("demo/web", "up") == 0.0
+    
+    stabilizer.mark_scaled("demo/web", "up")
+    clock.now += 30
+    assert stabilizer.cooldown_remaining("demo/web", "up") == 30
+    assert stabilizer.cooldown_remaining("demo/web", "down") == 270
+    assert stabilizer.cooldown_remaining("demo/api", "down") == 0.0
+
+
+def test_scale_down_holds_the_window_maximum():
+    clock = Clock()
+    stabilizer = _stabilizer(clock)
+    stabilizer.recommend("demo/web", 8)
+    clock.now += 100
+    
+    assert stabilizer.stabilized_down("demo/web", 3) == 8
+    clock.now += 201  # the spike has aged out of the window
+    assert stabilizer.stabilized_down("demo/web", 4) == 4
+
+
+def test_state_is_shared_through_the_file(tmp_path):
+    clock = Clock()
+    state_file = str(tmp_path / "scaler_state.json")
+    engine = _stabilizer(clock, state_file)
+    api = _stabilizer(clock, state_file)
+    
+    engine.recommend("demo/web", 6)
+    api.mark_scaled("demo/web", "down")
+    
+    assert engine.cooldown_remaining("demo/web", "down") == 300
+    assert api.stabilized_down("demo/web", 2) == 6
+    assert _stabilizer(clock, state_file).get_status()["demo/web"]["window_max"] == 6
@@ -0,0 +1,104 @@
+"""
+Namespace sharding tests (replicas share an in-memory lease backend)
+"""
+from agents.sharding import HashRing, InMemoryLeaseBackend, ShardCoordinator
+
+NAMESPACES = [f"team-{i}" for i in range(50)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _replicas(backend, clock, *ids):
+    return [
+        ShardCoordinator(backend, replica_id=i, lease_duration=15, renew_interval=5, vnodes=32, clock=clock)
+        for i in ids
+    ]
+
+
+def _heartbeat(replicas):
+    for replica in replicas:
+        replica.heartbeat(force=True)
+    for replica in replicas:
+        replica.heartbeat(force=True)
+
+
+def test_every_namespace_has_exactly_one_owner():
+    clock = Clock()
+    backend = InMemoryLeaseBackend(clock)
+    replicas = _replicas(backend, clock, "a", "b", "c")
+    _heartbeat(replicas)
+    
+    owners = [[r.replica_id for r in replicas if r.owns(ns)] for ns in NAMESPACES]
+    assert all(len(o) == 1 for o in owners)
+    assert {o[0] for o in owners} == {"a", "b", "c"}
+
+
+def test_assignment_is_stable_across_heartbeats():
+    clock = Clock()
+    backend = InMemoryLeaseBackend(clock)
+    replicas = _replicas(backend, clock, "a", "b")
+    _heartbeat(replicas)
+    before = [r.assign(NAMESPACES) for r in replicas]
+    
+    clock.now += 5
+    assert not any(r.heartbeat() for r in replicas)
+    assert [r.assign(NAMESPACES) for r in replicas] == before
+
+
+def test_adding_a_member_only_moves_its_keys():
+    before = HashRing(["a", "b"], vnodes=32)
+    after = HashRing(["a", "b", "c"], vnodes=32)
+    
+    moved = [ns for ns in NAMESPACES if before.owner(ns) != after.owner(ns)]
+    assert moved
+    assert all(after.owner(ns) == "c" for ns in moved)
+
+
+def test_survivor_takes_over_after_lease_expiry():
+    clock = Clock()
+    backend = InMemoryLeaseBackend(clock)
+    a, b = _replicas(backend, clock, "a", "b")
+    _heartbeat([a, b])
+    assert not all(a.owns(ns) for ns in NAMESPACES)
+    
+    # b stops renewing; a keeps it in the ring until its lease expires
+    clock.now += 10
+    a.heartbeat(force=True)
+    assert a.get_status()["members"] == ["a", "b"]
+    
+    clock.now += 10
+    assert a.heartbeat(force=True) is True
+    assert a.get_status()["members"] == ["a"]
+    assert all(a.owns(ns) for ns in NAMESPACES)
+
+
+def test_release_hands_over_without_waiting_for_expiry():
+    clock = Clock()
+    backend = InMemoryLeaseBackend(clock)
+    a, b = _replicas(backend, clock, "a", "b")
+    _heartbeat([a, b])
+    
+    b.release()
+    assert a.heartbeat(force=True) is True
+    assert all(a.owns(ns) for ns in NAMESPACES)
+
+
+def test_failed_listing_keeps_previous_ring():
+    clock = Clock()
+    backend = InMemoryLeaseBackend(clock)
+    a, b = _replicas(backend, clock, "a", "b")
+    _heartbeat([a, b])
+    owned = a.assign(NAMESPACES)
+    
+    backend.available = False
+    clock.now += 5
+    assert a.heartbeat(force=True) is False
+    assert a.live_members() is None
+    assert a.get_status()["members"] == ["a", "b"]
+    assert a.assign(NAMESPACES) == owned
@@ -0,0 +1,56 @@
+"""
+Telemetry rendering and exporter tests
+"""
+import urllib.request
+
+from tools.telemetry import Counter, Histogram, MetricsRegistry, percentile
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("phase_seconds", "Phase duration", ["phase"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, phase="collect")
+    histogram.observe(0.5, phase="collect")
+    histogram.observe(5.0, phase="collect")
+    
+    assert histogram.render() == [
+        "# HELP phase_seconds Phase duration",
+        "# TYPE phase_seconds histogram",
+        'phase_seconds_bucket{phase="collect",le="0.1"} 1',
+        'phase_seconds_bucket{phase="collect",le="1.0"} 2',
+        'phase_seconds_bucket{phase="collect",le="+Inf"} 3',
+        'phase_seconds_sum{phase="collect"} 5.55',
+        'phase_seconds_count{phase="collect"} 3',
+    ]
+
+
+def test_counter_renders_escaped_labels():
+    counter = Counter("cycles_total", "Cycles", ["namespace", "outcome"])
+    counter.inc(namespace="demo", outcome="acted")
+    counter.inc(2, namespace='a"b', outcome="error")
+    
+    assert counter.render()[2:] == [
+        'cycles_total{namespace="a\\"b",outcome="error"} 2.0',
+        'cycles_total{namespace="demo",outcome="acted"} 1.0',
+    ]
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 95) == 0.0
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile(range(1, 101), 95) == 95
+
+
+def test_registry_is_served_over_http():
+    registry = MetricsRegistry()
+    registry.counter("engine_cycles_total", "Cycles").inc()
+    server = registry.serve(0, host="127.0.0.1")
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"] == "text/plain; version=0.0.4"
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert "engine_cycles_total 1.0" in body
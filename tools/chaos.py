@@ -13,6 +13,7 @@ import time
 sys.path.append(str(Path(__file__).parent.parent))
 
 from tools.k8s_client import k8s_client
+from tools.owner_index import owner_index
 from mcp_server.config import K8S_NAMESPACE
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,12 @@ class ChaosEngine:
         self.namespace = namespace
         self.active_simulations = []
     
+    def _deployment_pods(self, deployment: str) -> List[Dict]:
+        """Current pods owned by deployment (refreshes the owner index)"""
+        pods = k8s_client.get_pods(self.namespace)
+        owned = set(owner_index.pods_for_deployment(self.namespace, deployment))
+        return [p for p in pods if p["name"] in owned]
+    
     def simulate_cpu_spike(self, deployment: str = "nginx-demo", duration: int = 300) -> Dict:
         """
         Simulate CPU spike by deploying stress container
@@ -86,8 +93,7 @@ class ChaosEngine:
         Crash a random pod from deployment
         """
         try:
-            pods = k8s_client.get_pods(self.namespace)
-            deployment_pods = [p for p in pods if deployment in p["name"]]
+            deployment_pods = self._deployment_pods(deployment)
             
             if not deployment_pods:
                 return {
@@ -134,8 +140,7 @@ class ChaosEngine:
         Delete multiple pods at once (cascade failure)
         """
         try:
-            pods = k8s_client.get_pods(self.namespace)
-            deployment_pods = [p for p in pods if deployment in p["name"]]
+            deployment_pods = self._deployment_pods(deployment)
             
             if not deployment_pods:
                 return {
@@ -0,0 +1,70 @@
+"""
+Failure Signatures - Classifies crash logs by known root causes
+All signatures are compiled into one alternation, so a log is scanned once
+no matter how many signatures exist
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+# (root cause, pattern), most specific first: when a log matches several
+# signatures the earliest one in this list is reported as the root cause.
+# Unrecoverable causes only match fatal context (an error prefix, a config
+# file, the entrypoint), so warnings about optional files or deprecated
+# options do not suppress healing
+SIGNATURES: Tuple[Tuple[str, str], ...] = (
+    ("oom", r"OOMKilled|OutOfMemoryError|out of memory|Cannot allocate memory|"
+            r"JavaScript heap out of memory|MemoryError"),
+    ("missing_secret", r"secrets? \"?[\w.-]+\"? not found|couldn't find key [\w.-]+ in Secret|"
+                       r"(?:environment )?variable [\w.]+ (?:is )?(?:not set|missing|required)|"
+                       r"missing required (?:env(?:ironment)? var(?:iable)?|secret|credential)s?"),
+    ("bad_config", r"invalid config(?:uration)?|config(?:uration)? (?:error|is invalid)|"
+                   r"failed to (?:load|parse|read) config|yaml: (?:line \d+|unmarshal)|"
+                   r"flag provided but not defined|"
+                   r"(?:error|fatal|panic)\b[^\n]*unknown (?:flag|option|field)|"
+                   r"(?:error|fatal|panic|failed)\b[^\n]*\.(?:ya?ml|json|toml|ini|conf|properties)\b[^\n]*: no such file or directory|"
+                   r"exec [^\n]*: no such file or directory"),
+    ("permission_denied", r"permission denied|EACCES|operation not permitted"),
+    ("connection_refused", r"connection refused|ECONNREFUSED|no route to host|"
+                           r"could not connect to|connection timed out|"
+                           r"dial tcp [^:]+:\d+: (?:connect|i/o timeout)"),
+)
+
+# Root causes a restart cannot fix; remediation is escalated instead
+UNRECOVERABLE = frozenset({"missing_secret", "bad_config", "permission_denied"})
+
+_RANK = {name: rank for rank, (name, _) in enumerate(SIGNATURES)}
+
+FAILURE_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in SIGNATURES),
+    re.IGNORECASE
+)
+
+
+def classify(log: str) -> Dict:
+    """
+    Scan a log once and report the root cause, per-signature match counts
+    and the first line that matched the root cause
+    """
+    counts: Dict[str, int] = {}
+    first: Dict[str, int] = {}
+    for match in FAILURE_PATTERN.finditer(log or ""):
+        name = match.lastgroup
+        counts[name] = counts.get(name, 0) + 1
+        first.setdefault(name, match.start())
+
+    if not counts:
+        return {"root_cause": "unknown", "matches": {}, "evidence": None}
+
+    root_cause = min(counts, key=_RANK.__getitem__)
+    start = log.rfind("\n", 0, first[root_cause]) + 1
+    end = log.find("\n", first[root_cause])
+    evidence = log[start:end if end != -1 else len(log)].strip()[:200]
+    return {"root_cause": root_cause, "matches": counts, "evidence": evidence}
+
+
+def dominant_cause(causes: List[str]) -> Optional[str]:
+    """Most frequent known root cause among pods (ties go to the more specific one)"""
+    known = [cause for cause in causes if cause in _RANK]
+    if not known:
+        return None
+    return min(set(known), key=lambda cause: (-known.count(cause), _RANK[cause]))
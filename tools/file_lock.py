@@ -0,0 +1,59 @@
+"""
+File Lock - Cross-process exclusive lock on a sidecar file
+The engine and the API server run as separate processes and share state
+files under LOG_DIR; thread locks only serialize within one process
+"""
+import logging
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Re-entrant lock held both across threads (RLock) and across processes
+    (flock on `path`). On platforms without fcntl only the thread lock is taken.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+    
+    def acquire(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1 or fcntl is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except OSError as e:
+            logger.error(f"Could not lock {self.path}: {e}")
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+    
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
@@ -1,28 +1,88 @@
 """
 Kubernetes client wrapper for managing cluster resources
 """
+import sys
+import time
 import subprocess
 import json
 import logging
+from pathlib import Path
 from typing import List, Dict, Optional
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import external_call_seconds
+from tools.owner_index import owner_index, controller_owner
 
 logger = logging.getLogger(__name__)
 
+# Kubernetes memory quantity suffixes
+MEMORY_UNITS = {
+    "Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3, "Ti": 1024 ** 4,
+    "k": 1000, "K": 1000, "M": 1000 ** 2, "G": 1000 ** 3, "T": 1000 ** 4
+}
+
+
+def parse_memory(value: Optional[str]) -> Optional[int]:
+    """Parse a memory quantity (e.g. 256Mi, 1G, 134217728) into bytes"""
+    if not value:
+        return None
+    value = str(value).strip()
+    for suffix in ("Ki", "Mi", "Gi", "Ti", "k", "K", "M", "G", "T"):
+        if value.endswith(suffix):
+            try:
+                return int(float(value[:-len(suffix)]) * MEMORY_UNITS[suffix])
+            except ValueError:
+                return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+def format_memory(num_bytes: int) -> str:
+    """Memory quantity in whole Mi, rounded up (e.g. 384Mi)"""
+    return f"{-(-int(num_bytes) // MEMORY_UNITS['Mi'])}Mi"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse a Kubernetes RFC 3339 timestamp (e.g. 2024-01-01T10:00:00Z) into epoch seconds"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
 
 class K8sClient:
     def __init__(self, namespace: str = "demo"):
         self.namespace = namespace
     
-    def _run_command(self, cmd: List[str]) -> Dict:
+    @staticmethod
+    def _operation_name(cmd: List[str]) -> str:
+        """Low-cardinality label for a kubectl command (e.g. 'get pods', 'scale')"""
+        if len(cmd) < 2:
+            return "unknown"
+        if cmd[1] in ("get", "delete", "rollout") and len(cmd) > 2:
+            return f"{cmd[1]} {cmd[2]}"
+        return cmd[1]
+    
+    def _run_command(self, cmd: List[str], input: Optional[str] = None, timeout: float = 5) -> Dict:
         """Execute kubectl command and return output"""
+        start = time.perf_counter()
+        success = False
         try:
             result = subprocess.run(
                 cmd,
+                input=input,
                 capture_output=True,
                 text=True,
                 check=True,
-                timeout=5  # Add 5 second timeout to prevent hanging
+                timeout=timeout  # 5 second default to prevent hanging
             )
+            success = True
             return {"success": True, "output": result.stdout, "error": None}
         except subprocess.TimeoutExpired:
             logger.error(f"Command timed out: {' '.join(cmd)}")
@@ -30,6 +90,13 @@ class K8sClient:
         except subprocess.CalledProcessError as e:
             logger.error(f"Command failed: {' '.join(cmd)} - {e.stderr}")
             return {"success": False, "output": None, "error": e.stderr}
+        finally:
+            external_call_seconds.observe(
+                time.perf_counter() - start,
+                backend="kubectl",
+                operation=self._operation_name(cmd),
+                success=str(success).lower()
+            )
     
     def get_pods(self, namespace: Optional[str] = None) -> List[Dict]:
         """Get all pods in namespace"""
@@ -41,18 +108,58 @@ class K8sClient:
             data = json.loads(result["output"])
             pods = []
             for item in data.get("items", []):
+                owner_kind, owner_name = controller_owner(item["metadata"])
                 pod_info = {
                     "name": item["metadata"]["name"],
                     "status": item["status"]["phase"],
                     "ready": self._get_ready_status(item),
                     "restarts": self._get_restart_count(item),
                     "age": item["metadata"]["creationTimestamp"],
+                    "created_at": parse_timestamp(item["metadata"].get("creationTimestamp")),
+                    "conditions": self._get_conditions(item),
+                    "waiting_reason": self._get_container_reason(item, "state", "waiting"),
+                    "last_termination_reason": self._get_container_reason(item, "lastState", "terminated"),
+                    **self._get_oom_termination(item),
                     "node": item["spec"].get("nodeName", ""),
+                    "owner_kind": owner_kind,
+                    "owner_name": owner_name,
                 }
                 pods.append(pod_info)
+            self._index_owners(ns, pods)
             return pods
         return []
     
+    def _index_owners(self, namespace: str, pods: List[Dict]):
+        """
+        Sync the owner index with a pod listing (ReplicaSets are only listed
+        when a pod belongs to one not seen before) and tag each pod with
+        its deployment
+        """
+        owner_index.update_pods(namespace, pods)
+        if owner_index.unresolved_replicasets(namespace):
+            owner_index.update_replicasets(namespace, self.get_replicasets(namespace))
+        for pod in pods:
+            pod["deployment"] = owner_index.deployment_for_pod(namespace, pod["name"])
+    
+    def get_replicasets(self, namespace: Optional[str] = None) -> List[Dict]:
+        """Get ReplicaSets with their owning controller"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "get", "replicasets", "-n", ns, "-o", "json"]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            data = json.loads(result["output"])
+            replicasets = []
+            for item in data.get("items", []):
+                owner_kind, owner_name = controller_owner(item["metadata"])
+                replicasets.append({
+                    "name": item["metadata"]["name"],
+                    "owner_kind": owner_kind,
+                    "owner_name": owner_name,
+                })
+            return replicasets
+        return []
+    
     def _get_ready_status(self, pod: Dict) -> str:
         """Extract ready status from pod"""
         try:
@@ -64,6 +171,46 @@ class K8sClient:
             pass
         return "Unknown"
     
+    def _get_conditions(self, pod: Dict) -> Dict[str, Dict]:
+        """Pod conditions by type: status, reason and lastTransitionTime as epoch seconds"""
+        return {
+            c["type"]: {
+                "status": c.get("status"),
+                "reason": c.get("reason"),
+                "since": parse_timestamp(c.get("lastTransitionTime"))
+            }
+            for c in pod["status"].get("conditions", [])
+            if "type" in c
+        }
+    
+    def _get_container_reason(self, pod: Dict, state_key: str, state: str) -> Optional[str]:
+        """
+        First reason found in containerStatuses[].<state_key>.<state>, e.g. the
+        CrashLoopBackOff of state.waiting (phase stays Running/Pending meanwhile)
+        """
+        for cs in pod["status"].get("containerStatuses", []):
+            reason = (cs.get(state_key) or {}).get(state, {}).get("reason")
+            if reason:
+                return reason
+        return None
+    
+    def _get_oom_termination(self, pod: Dict) -> Dict:
+        """
+        Container whose last termination was OOMKilled, when that happened
+        (lastState keeps the reason indefinitely), whether it is ready now and
+        why it is waiting, if it is
+        """
+        for cs in pod["status"].get("containerStatuses", []):
+            terminated = (cs.get("lastState") or {}).get("terminated", {})
+            if terminated.get("reason") == "OOMKilled":
+                return {
+                    "oom_container": cs.get("name"),
+                    "oom_finished_at": parse_timestamp(terminated.get("finishedAt")),
+                    "oom_container_ready": cs.get("ready"),
+                    "oom_container_waiting": (cs.get("state") or {}).get("waiting", {}).get("reason")
+                }
+        return {"oom_container": None, "oom_finished_at": None, "oom_container_ready": None, "oom_container_waiting": None}
+    
     def _get_restart_count(self, pod: Dict) -> int:
         """Get total restart count for pod"""
         try:
@@ -72,8 +219,12 @@ class K8sClient:
         except:
             return 0
     
-    def get_deployments(self, namespace: Optional[str] = None) -> List[Dict]:
-        """Get all deployments in namespace"""
+    def get_deployments(self, namespace: Optional[str] = None, strict: bool = False) -> Optional[List[Dict]]:
+        """
+        Get all deployments in namespace. A failed listing is an empty list,
+        or None with strict=True (for callers that must tell "no deployments"
+        from "could not list")
+        """
         ns = namespace or self.namespace
         cmd = ["kubectl", "get", "deployments", "-n", ns, "-o", "json"]
         result = self._run_command(cmd)
@@ -90,7 +241,54 @@ class K8sClient:
                 }
                 deployments.append(deployment_info)
             return deployments
-        return []
+        return None if strict else []
+    
+    def get_deployment(self, deployment: str, namespace: Optional[str] = None) -> Optional[Dict]:
+        """Get a single deployment's replica status"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "get", "deployment", deployment, "-n", ns, "-o", "json"]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            item = json.loads(result["output"])
+            return {
+                "name": item["metadata"]["name"],
+                "replicas": item["spec"]["replicas"],
+                "ready_replicas": item["status"].get("readyReplicas", 0),
+                "available_replicas": item["status"].get("availableReplicas", 0),
+                "updated_replicas": item["status"].get("updatedReplicas", 0),
+            }
+        return None
+    
+    def get_container_resources(self, deployment: str, namespace: Optional[str] = None) -> Dict[str, Dict]:
+        """Resource requests and limits per container of a deployment's pod template"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "get", "deployment", deployment, "-n", ns, "-o", "json"]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            item = json.loads(result["output"])
+            containers = item.get("spec", {}).get("template", {}).get("spec", {}).get("containers", [])
+            return {
+                c["name"]: {
+                    "requests": c.get("resources", {}).get("requests", {}),
+                    "limits": c.get("resources", {}).get("limits", {})
+                }
+                for c in containers
+            }
+        return {}
+    
+    def set_memory_limit(self, deployment: str, container: str, limit: str, namespace: Optional[str] = None) -> bool:
+        """Set a container's memory limit (triggers a rollout)"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "set", "resources", f"deployment/{deployment}", "-c", container,
+               f"--limits=memory={limit}", "-n", ns]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            logger.info(f"Set memory limit of {deployment}/{container} in {ns} to {limit}")
+            return True
+        return False
     
     def scale_deployment(self, deployment: str, replicas: int, namespace: Optional[str] = None) -> bool:
         """Scale deployment to specified number of replicas"""
@@ -125,16 +323,69 @@ class K8sClient:
             return True
         return False
     
-    def get_pod_logs(self, pod_name: str, namespace: Optional[str] = None, tail: int = 100) -> str:
-        """Get logs from a pod"""
+    def get_pod_logs(
+        self,
+        pod_name: str,
+        namespace: Optional[str] = None,
+        tail: int = 100,
+        previous: bool = False,
+        limit_bytes: Optional[int] = None,
+        timeout: float = 5
+    ) -> str:
+        """
+        Get logs from a pod; previous=True reads the last terminated container
+        (what a crashlooping pod printed before it died)
+        """
         ns = namespace or self.namespace
         cmd = ["kubectl", "logs", pod_name, "-n", ns, "--tail", str(tail)]
-        result = self._run_command(cmd)
+        if previous:
+            cmd.append("--previous")
+        if limit_bytes:
+            cmd.append(f"--limit-bytes={limit_bytes}")
+        result = self._run_command(cmd, timeout=timeout)
         
         if result["success"]:
             return result["output"]
         return ""
     
+    def get_namespaces(self, label_selector: Optional[str] = None) -> List[str]:
+        """Get namespace names, optionally filtered by a label selector"""
+        cmd = ["kubectl", "get", "namespaces", "-o", "json"]
+        if label_selector:
+            cmd += ["-l", label_selector]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            data = json.loads(result["output"])
+            return [item["metadata"]["name"] for item in data.get("items", [])]
+        return []
+    
+    def get_leases(self, namespace: Optional[str] = None, label_selector: Optional[str] = None) -> Optional[List[Dict]]:
+        """Get raw coordination.k8s.io Lease objects in namespace (None if kubectl failed)"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "get", "leases.coordination.k8s.io", "-n", ns, "-o", "json"]
+        if label_selector:
+            cmd += ["-l", label_selector]
+        result = self._run_command(cmd)
+        
+        if result["success"]:
+            data = json.loads(result["output"])
+            return data.get("items", [])
+        return None
+    
+    def apply_manifest(self, manifest: Dict) -> bool:
+        """Create or update an object from a manifest dict (kubectl apply -f -)"""
+        cmd = ["kubectl", "apply", "-f", "-"]
+        result = self._run_command(cmd, input=json.dumps(manifest))
+        return result["success"]
+    
+    def delete_lease(self, name: str, namespace: Optional[str] = None) -> bool:
+        """Delete a Lease object"""
+        ns = namespace or self.namespace
+        cmd = ["kubectl", "delete", "leases.coordination.k8s.io", name, "-n", ns, "--ignore-not-found=true"]
+        result = self._run_command(cmd)
+        return result["success"]
+    
     def get_nodes(self) -> List[Dict]:
         """Get all nodes in cluster"""
         cmd = ["kubectl", "get", "nodes", "-o", "json"]
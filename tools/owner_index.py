@@ -0,0 +1,157 @@
+"""
+Owner Index - Maps pods to the workloads that own them via ownerReferences
+Pod -> ReplicaSet -> Deployment (and StatefulSet/DaemonSet/Job owners directly)
+"""
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def controller_owner(metadata: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """(kind, name) of the controlling ownerReference in an object's metadata"""
+    refs = metadata.get("ownerReferences") or []
+    ref = next((r for r in refs if r.get("controller")), refs[0] if refs else None)
+    if not ref:
+        return None, None
+    return ref.get("kind"), ref.get("name")
+
+
+class OwnerIndex:
+    """
+    Per-namespace maps kept in sync with pod and ReplicaSet listings:
+      pods:        pod name -> (owner kind, owner name)
+      replicasets: ReplicaSet name -> owning Deployment (None if standalone)
+      members:     (workload kind, workload name) -> pod names
+    Updates only touch entries that changed, and every lookup is a dict access.
+    """
+    
+    def __init__(self):
+        self._pods: Dict[str, Dict[str, Tuple[Optional[str], Optional[str]]]] = {}
+        self._replicasets: Dict[str, Dict[str, Optional[str]]] = {}
+        self._members: Dict[str, Dict[Tuple[str, str], Set[str]]] = {}
+        self._lock = threading.Lock()
+    
+    def _workload(self, namespace: str, owner: Tuple[Optional[str], Optional[str]]) -> Optional[Tuple[str, str]]:
+        """Top-level workload for a direct owner (caller holds the lock)"""
+        kind, name = owner
+        if not kind:
+            return None
+        if kind == "ReplicaSet":
+            deployment = self._replicasets.get(namespace, {}).get(name)
+            if deployment:
+                return "Deployment", deployment
+        return kind, name
+    
+    def _link(self, namespace: str, pod: str, owner: Tuple[Optional[str], Optional[str]]):
+        workload = self._workload(namespace, owner)
+        if workload:
+            self._members.setdefault(namespace, {}).setdefault(workload, set()).add(pod)
+    
+    def _unlink(self, namespace: str, pod: str, owner: Tuple[Optional[str], Optional[str]]):
+        workload = self._workload(namespace, owner)
+        members = self._members.get(namespace, {}).get(workload)
+        if members is not None:
+            members.discard(pod)
+            if not members:
+                del self._members[namespace][workload]
+    
+    def upsert_pod(self, namespace: str, pod: str, owner_kind: Optional[str], owner_name: Optional[str]):
+        """Add or update one pod"""
+        owner = (owner_kind, owner_name)
+        with self._lock:
+            pods = self._pods.setdefault(namespace, {})
+            previous = pods.get(pod)
+            if previous == owner:
+                return
+            if previous is not None:
+                self._unlink(namespace, pod, previous)
+            pods[pod] = owner
+            self._link(namespace, pod, owner)
+    
+    def remove_pod(self, namespace: str, pod: str):
+        """Forget a deleted pod"""
+        with self._lock:
+            previous = self._pods.get(namespace, {}).pop(pod, None)
+            if previous is not None:
+                self._unlink(namespace, pod, previous)
+    
+    def update_pods(self, namespace: str, pods: Iterable[Dict]):
+        """
+        Sync with a full pod listing (dicts with name, owner_kind, owner_name);
+        pods missing from the listing are removed
+        """
+        seen = set()
+        for pod in pods:
+            seen.add(pod["name"])
+            self.upsert_pod(namespace, pod["name"], pod.get("owner_kind"), pod.get("owner_name"))
+        for name in set(self._pods.get(namespace, {})) - seen:
+            self.remove_pod(namespace, name)
+    
+    def update_replicasets(self, namespace: str, replicasets: Iterable[Dict]):
+        """
+        Sync ReplicaSet -> Deployment links (dicts with name, owner_kind, owner_name)
+        and re-home pods whose workload changed as a result
+        """
+        links = {
+            rs["name"]: rs.get("owner_name") if rs.get("owner_kind") == "Deployment" else None
+            for rs in replicasets
+        }
+        with self._lock:
+            pods = self._pods.get(namespace, {})
+            affected = [(pod, owner) for pod, owner in pods.items() if owner[0] == "ReplicaSet"]
+            for pod, owner in affected:
+                self._unlink(namespace, pod, owner)
+            self._replicasets[namespace] = links
+            for pod, owner in affected:
+                self._link(namespace, pod, owner)
+    
+    def unresolved_replicasets(self, namespace: str) -> Set[str]:
+        """ReplicaSets owning pods whose Deployment link is not known yet"""
+        known = self._replicasets.get(namespace, {})
+        return {
+            name for kind, name in self._pods.get(namespace, {}).values()
+            if kind == "ReplicaSet" and name not in known
+        }
+    
+    def owner_of(self, namespace: str, pod: str) -> Tuple[Optional[str], Optional[str]]:
+        """Direct controlling owner (kind, name) of pod; (None, None) if unknown or standalone"""
+        return self._pods.get(namespace, {}).get(pod, (None, None))
+    
+    def workload_for_pod(self, namespace: str, pod: str) -> Optional[Tuple[str, str]]:
+        """(kind, name) of the top-level workload owning pod, e.g. ("Deployment", "web")"""
+        owner = self._pods.get(namespace, {}).get(pod)
+        if owner is None:
+            return None
+        return self._workload(namespace, owner)
+    
+    def deployment_for_pod(self, namespace: str, pod: str) -> Optional[str]:
+        """Owning Deployment name, or None if pod is not owned by one (or unknown)"""
+        workload = self.workload_for_pod(namespace, pod)
+        if workload and workload[0] == "Deployment":
+            return workload[1]
+        return None
+    
+    def pods_for_workload(self, namespace: str, kind: str, name: str) -> List[str]:
+        """Pods currently owned by a workload"""
+        return sorted(self._members.get(namespace, {}).get((kind, name), ()))
+    
+    def pods_for_deployment(self, namespace: str, deployment: str) -> List[str]:
+        """Pods currently owned by a Deployment"""
+        return self.pods_for_workload(namespace, "Deployment", deployment)
+    
+    def get_status(self) -> Dict:
+        """Index sizes per namespace"""
+        return {
+            namespace: {
+                "pods": len(pods),
+                "replicasets": len(self._replicasets.get(namespace, {})),
+                "workloads": len(self._members.get(namespace, {}))
+            }
+            for namespace, pods in self._pods.items()
+        }
+
+
+# Create singleton instance
+owner_index = OwnerIndex()
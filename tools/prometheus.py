@@ -1,11 +1,20 @@
 """
 Prometheus client wrapper for querying metrics
 """
+import sys
+import math
+import time
 import requests
 import logging
+from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import external_call_seconds
+from tools.owner_index import owner_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,8 +27,10 @@ class PrometheusClient:
         self.query_timeout = (0.5, 1.0)  # (connect, read) seconds
         self.health_timeout = (0.5, 1.0)
     
-    def _query(self, query: str) -> Optional[Dict]:
+    def _query(self, query: str, operation: str = "query") -> Optional[Dict]:
         """Execute Prometheus query"""
+        start = time.perf_counter()
+        success = False
         try:
             response = requests.get(
                 self.query_url,
@@ -30,6 +41,7 @@ class PrometheusClient:
             data = response.json()
             
             if data.get("status") == "success":
+                success = True
                 return data.get("data", {})
             else:
                 logger.error(f"Query failed: {data}")
@@ -37,6 +49,13 @@ class PrometheusClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Prometheus query error: {e}")
             return None
+        finally:
+            external_call_seconds.observe(
+                time.perf_counter() - start,
+                backend="prometheus",
+                operation=operation,
+                success=str(success).lower()
+            )
     
     def _extract_value(self, result: Optional[Dict]) -> float:
         """Extract numeric value from query result"""
@@ -54,36 +73,109 @@ class PrometheusClient:
         except (ValueError, IndexError, TypeError):
             return 0.0
     
+    def _extract_by_label(self, result: Optional[Dict], label: str) -> Dict[str, float]:
+        """Extract {label value: numeric value} from a grouped query result"""
+        values = {}
+        if not result:
+            return values
+        
+        for item in result.get("result", []):
+            key = item.get("metric", {}).get(label)
+            try:
+                value = float(item.get("value", [None, "0"])[1])
+            except (ValueError, IndexError, TypeError):
+                continue
+            if key and math.isfinite(value):
+                values[key] = value
+        return values
+    
+    def _pod_selector(self, namespace: str, deployment: str) -> str:
+        """
+        PromQL pod matcher for a deployment's pods, taken from the owner
+        index (falls back to the Deployment pod naming pattern before the
+        index has seen the namespace)
+        """
+        pods = owner_index.pods_for_deployment(namespace, deployment)
+        if pods:
+            return f'pod=~"{"|".join(pods)}"'
+        return f'pod=~"{deployment}-[a-z0-9]+-[a-z0-9]+"'
+    
     def get_cpu_usage(self, namespace: str = "demo", deployment: str = None) -> float:
         """Get CPU usage percentage for namespace or deployment"""
         if deployment:
-            query = f'sum(rate(container_cpu_usage_seconds_total{{namespace="{namespace}", pod=~"{deployment}.*"}}[5m])) * 100'
+            query = f'sum(rate(container_cpu_usage_seconds_total{{namespace="{namespace}", {self._pod_selector(namespace, deployment)}}}[5m])) * 100'
         else:
             query = f'sum(rate(container_cpu_usage_seconds_total{{namespace="{namespace}"}}[5m])) * 100'
         
-        result = self._query(query)
+        result = self._query(query, "cpu_usage")
         return self._extract_value(result)
     
     def get_memory_usage(self, namespace: str = "demo", deployment: str = None) -> float:
         """Get memory usage percentage for namespace or deployment"""
         if deployment:
-            query = f'sum(container_memory_usage_bytes{{namespace="{namespace}", pod=~"{deployment}.*"}}) / sum(container_spec_memory_limit_bytes{{namespace="{namespace}", pod=~"{deployment}.*"}}) * 100'
+            selector = self._pod_selector(namespace, deployment)
+            query = f'sum(container_memory_usage_bytes{{namespace="{namespace}", {selector}}}) / sum(container_spec_memory_limit_bytes{{namespace="{namespace}", {selector}}}) * 100'
         else:
             query = f'sum(container_memory_usage_bytes{{namespace="{namespace}"}}) / sum(container_spec_memory_limit_bytes{{namespace="{namespace}"}}) * 100'
         
-        result = self._query(query)
+        result = self._query(query, "memory_usage")
         return self._extract_value(result)
     
+    def get_peak_memory(self, namespace: str, deployment: str, container: str, window: str = "1h") -> float:
+        """Highest working-set bytes of one container across a deployment's pods over window"""
+        selector = self._pod_selector(namespace, deployment)
+        query = (f'max(max_over_time(container_memory_working_set_bytes'
+                 f'{{namespace="{namespace}", {selector}, container="{container}"}}[{window}]))')
+        result = self._query(query, "peak_memory")
+        return self._extract_value(result)
+    
+    def get_deployment_utilization(self, namespace: str = "demo") -> Dict[str, Dict[str, float]]:
+        """
+        Per-deployment utilization: CPU as % of CPU requests, memory as % of
+        memory limits. Usage and capacity are fetched per pod and summed per
+        deployment through the owner index (pods it does not know are skipped).
+        """
+        containers = f'namespace="{namespace}", container!="", container!="POD"'
+        queries = {
+            "cpu": (
+                f'sum by (pod) (rate(container_cpu_usage_seconds_total{{{containers}}}[5m]))',
+                f'sum by (pod) (kube_pod_container_resource_requests{{namespace="{namespace}", resource="cpu"}})'
+            ),
+            "memory": (
+                f'sum by (pod) (container_memory_working_set_bytes{{{containers}}})',
+                f'sum by (pod) (kube_pod_container_resource_limits{{namespace="{namespace}", resource="memory"}})'
+            )
+        }
+        
+        utilization: Dict[str, Dict[str, float]] = {}
+        for resource, (usage_query, capacity_query) in queries.items():
+            usage = self._extract_by_label(self._query(usage_query, f"deployment_{resource}"), "pod")
+            capacity = self._extract_by_label(self._query(capacity_query, f"deployment_{resource}_capacity"), "pod")
+            
+            totals: Dict[str, List[float]] = {}
+            for pod, pod_capacity in capacity.items():
+                deployment = owner_index.deployment_for_pod(namespace, pod)
+                if deployment is None:
+                    continue
+                total = totals.setdefault(deployment, [0.0, 0.0])
+                total[0] += usage.get(pod, 0.0)
+                total[1] += pod_capacity
+            
+            for deployment, (used, available) in totals.items():
+                if available > 0:
+                    utilization.setdefault(deployment, {})[resource] = round(used / available * 100, 2)
+        return utilization
+    
     def get_pod_count(self, namespace: str = "demo") -> int:
         """Get number of running pods in namespace"""
         query = f'count(kube_pod_info{{namespace="{namespace}"}})'
-        result = self._query(query)
+        result = self._query(query, "pod_count")
         return int(self._extract_value(result))
     
     def get_pod_status(self, namespace: str = "demo") -> Dict[str, int]:
         """Get pod status counts"""
         query = f'sum by (phase) (kube_pod_status_phase{{namespace="{namespace}"}})'
-        result = self._query(query)
+        result = self._query(query, "pod_status")
         
         if not result:
             return {"running": 0, "pending": 0, "failed": 0, "succeeded": 0}
@@ -99,19 +191,19 @@ class PrometheusClient:
     def get_container_restarts(self, namespace: str = "demo") -> int:
         """Get total container restart count"""
         query = f'sum(kube_pod_container_status_restarts_total{{namespace="{namespace}"}})'
-        result = self._query(query)
+        result = self._query(query, "container_restarts")
         return int(self._extract_value(result))
     
     def get_node_cpu_usage(self) -> float:
         """Get overall node CPU usage"""
         query = 'sum(rate(node_cpu_seconds_total{mode!="idle"}[5m])) / sum(rate(node_cpu_seconds_total[5m])) * 100'
-        result = self._query(query)
+        result = self._query(query, "node_cpu")
         return self._extract_value(result)
     
     def get_node_memory_usage(self) -> float:
         """Get overall node memory usage"""
         query = '(1 - sum(node_memory_MemAvailable_bytes) / sum(node_memory_MemTotal_bytes)) * 100'
-        result = self._query(query)
+        result = self._query(query, "node_memory")
         return self._extract_value(result)
     
     def get_all_metrics(self, namespace: str = "demo") -> Dict:
@@ -141,11 +233,21 @@ class PrometheusClient:
     
     def is_healthy(self) -> bool:
         """Check if Prometheus is accessible"""
+        start = time.perf_counter()
+        healthy = False
         try:
             response = requests.get(f"{self.base_url}/-/healthy", timeout=self.health_timeout)
-            return response.status_code == 200
+            healthy = response.status_code == 200
+            return healthy
         except:
             return False
+        finally:
+            external_call_seconds.observe(
+                time.perf_counter() - start,
+                backend="prometheus",
+                operation="health",
+                success=str(healthy).lower()
+            )
 
 
 # Create singleton instance
@@ -0,0 +1,234 @@
+"""
+Telemetry - In-process latency histograms and counters
+Rendered in Prometheus text exposition format
+"""
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds (kubectl calls are ~50ms-5s, cycles up to a minute)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format a label set like {phase="collect",le="0.5"}"""
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_float(value: float) -> str:
+    """Format a sample value the way Prometheus expects"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of a sequence (q in 0-100)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by label values
+    """
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, **labels) -> None:
+        """Record a single observation (seconds)"""
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [0] * len(self.buckets) + [0.0, 0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def render(self) -> List[str]:
+        """Render this histogram as exposition lines"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_float(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_float(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter keyed by label values
+    """
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increment the counter"""
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def render(self) -> List[str]:
+        """Render this counter as exposition lines"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            snapshot = dict(self._values)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_float(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds all metrics of the process and renders them together
+    """
+    
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+            return self._metrics[name]
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, documentation, labelnames)
+            return self._metrics[name]
+    
+    def get(self, name: str) -> Optional[object]:
+        """Look up a registered metric by name"""
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Render every registered metric in Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """
+        Serve render() at /metrics from a daemon thread, for processes
+        without the API server (the standalone decision engine)
+        """
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # scraped every few seconds
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="sentinelops-metrics", daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+# Create singleton registry and the metrics shared across modules
+metrics_registry = MetricsRegistry()
+
+cycle_phase_seconds = metrics_registry.histogram(
+    "sentinelops_cycle_phase_seconds",
+    "Duration of each decision cycle phase",
+    ["namespace", "phase"]
+)
+cycle_seconds = metrics_registry.histogram(
+    "sentinelops_cycle_seconds",
+    "Total duration of a decision cycle",
+    ["namespace", "outcome"]
+)
+cycles_total = metrics_registry.counter(
+    "sentinelops_cycles_total",
+    "Decision cycles run, by outcome",
+    ["namespace", "outcome"]
+)
+action_seconds = metrics_registry.histogram(
+    "sentinelops_action_seconds",
+    "Duration of remediation actions, by action type",
+    ["action", "success"]
+)
+external_call_seconds = metrics_registry.histogram(
+    "sentinelops_external_call_seconds",
+    "Duration of calls to kubectl and Prometheus",
+    ["backend", "operation", "success"]
+)